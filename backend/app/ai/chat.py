@@ -1,26 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from groq import Groq
-import os
+import asyncio
+import contextlib
 import json
-from dotenv import load_dotenv
+import time
+from .llm import llm, LLMError
+from .response_cache import response_cache
+from .structured import complete_structured
+from .context import build_chat_context, context_stats
 
-load_dotenv()
+# Bump when the score-insights prompt changes so cached analyses are not reused
+SCORE_INSIGHTS_PROMPT_VERSION = "1"
 
 router = APIRouter(tags=["AI Chat"])
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    print("⚠ GROQ_API_KEY missing in .env")
-client = Groq(api_key=GROQ_API_KEY)
-
 
 class ChatRequest(BaseModel):
     message: str
     resume_text: str | None = None
+    session_id: str = "default"
 
 class ScoreInsightsRequest(BaseModel):
     resume_text: str
+    use_cache: bool = True       # False: skip the response cache entirely
+    refresh_cache: bool = False  # True: ignore any cached result and replace it
 
 
 class ScoreInsightsResponse(BaseModel):
@@ -30,22 +34,61 @@ class ScoreInsightsResponse(BaseModel):
     improvements: list[str]
 
 
-from ..database import save_message, get_history, clear_history
+from ..database import save_message, get_history, iter_history, clear_history
 
 @router.get("/history")
-def get_chat_history():
-    return get_history()
+def get_chat_history(
+    session_id: str = "default",
+    before_id: int | None = None,
+    after_id: int | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    stream: bool = False,
+):
+    """
+    One page of chat history for a session, oldest first.
+    - no cursor: the latest `limit` messages
+    - before_id: the `limit` messages just before that id (scroll back)
+    - after_id: the `limit` messages just after that id (catch up)
+    stream=true returns every message after `after_id` as NDJSON instead.
+    """
+    if stream:
+        def rows():
+            for row in iter_history(session_id, after_id=after_id):
+                yield json.dumps(row) + "\n"
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    return get_history(session_id, before_id=before_id, after_id=after_id, limit=limit)
 
 @router.delete("/history")
-def clear_chat_history():
-    clear_history()
+def clear_chat_history(session_id: str = "default"):
+    clear_history(session_id)
     return {"status": "cleared"}
 
-@router.post("/chat")
-async def ai_chat(payload: ChatRequest):
+CHAT_SYSTEM_PROMPT = (
+    "You are TrueFit AI — a friendly, human-like career assistant. "
+    "You talk naturally, like ChatGPT. "
+    "GUIDELINES:\n"
+    "1. If the user asks about THEIR resume/skills (e.g. 'rate me', 'projects', 'what to improve'), use the provided RESUME CONTEXT.\n"
+    "2. If the user asks GENERAL questions (e.g. 'future of AI', 'react vs vue', 'how to become X'), answer generally based on your knowledge. DO NOT mention their resume unless they ask to compare.\n"
+    "3. Keep answers concise and helpful."
+)
+
+CHAT_FALLBACK = (
+    "Right now the external AI engine is not responding properly (API error). "
+    "Please check that your GROQ_API_KEY is valid and that your account has access "
+    "to model `llama-3.3-70b-versatile`.\n\n"
+    "For now, here’s a generic suggestion:\n"
+    "- Focus on 1 role (e.g., frontend, backend, data).\n"
+    "- List your current skills and compare with job descriptions.\n"
+    "- Start building 2–3 projects that match the role requirements.\n"
+)
+
+
+def start_chat(payload: ChatRequest):
     """
-    Fully conversational AI chat using Groq (Llama 3.3 70B).
-    If Groq fails, returns a friendly fallback message instead of 500.
+    Validate the request, build the model messages and store the user message.
+    Blocks on SQLite (history reads, committed writes): async handlers run it
+    with asyncio.to_thread so concurrent requests can share a group commit.
     """
     user_msg = payload.message.strip()
     resume_ctx = (payload.resume_text or "").strip()
@@ -53,69 +96,103 @@ async def ai_chat(payload: ChatRequest):
     if not user_msg:
         raise HTTPException(status_code=400, detail="Message is required")
 
+    # Prior turns + relevant resume sections, within the token budget
+    messages = build_chat_context(payload.session_id, CHAT_SYSTEM_PROMPT, user_msg, resume_ctx)
+
     # Save user message
-    save_message("user", user_msg)
-
-    # Build the actual text we send to the model
-    if resume_ctx:
-        user_content = (
-            f"{user_msg}\n\n"
-            f"---\nRESUME CONTEXT (Use ONLY if the user asks about their resume/profile):\n{resume_ctx}\n"
-            "If the question is general (e.g., 'trending skills', 'roadmap'), ANSWER GENERALLY. Do NOT force the resume context unless relevant."
-        )
-    else:
-        user_content = user_msg
+    save_message("user", user_msg, session_id=payload.session_id)
+
+    return messages
+
+
+@router.post("/chat")
+async def ai_chat(payload: ChatRequest):
+    """
+    Fully conversational AI chat using Groq (Llama 3.3 70B).
+    If Groq fails, returns a friendly fallback message instead of 500.
+    """
+    messages = await asyncio.to_thread(start_chat, payload)
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are TrueFit AI — a friendly, human-like career assistant. "
-                        "You talk naturally, like ChatGPT. "
-                        "GUIDELINES:\n"
-                        "1. If the user asks about THEIR resume/skills (e.g. 'rate me', 'projects', 'what to improve'), use the provided RESUME CONTEXT.\n"
-                        "2. If the user asks GENERAL questions (e.g. 'future of AI', 'react vs vue', 'how to become X'), answer generally based on your knowledge. DO NOT mention their resume unless they ask to compare.\n"
-                        "3. Keep answers concise and helpful."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": user_content,
-                },
-            ],
-            temperature=0.6,
-        )
+        reply_text = await llm.complete(messages=messages, temperature=0.6)
 
-        reply_text = completion.choices[0].message.content
-        
         # Save AI reply
-        save_message("ai", reply_text)
-        
+        await asyncio.to_thread(save_message, "ai", reply_text, session_id=payload.session_id)
+
         return {"reply": reply_text}
 
     except Exception as e:
         # Log real error in backend, but DON'T crash the API
         print("Groq AI error:", repr(e))
 
-        fallback = (
-            "Right now the external AI engine is not responding properly (API error). "
-            "Please check that your GROQ_API_KEY is valid and that your account has access "
-            "to model `llama-3.3-70b-versatile`.\n\n"
-            "For now, here’s a generic suggestion:\n"
-            "- Focus on 1 role (e.g., frontend, backend, data).\n"
-            "- List your current skills and compare with job descriptions.\n"
-            "- Start building 2–3 projects that match the role requirements.\n"
-        )
-        
         # Save fallback reply
-        save_message("ai", fallback)
-        
+        await asyncio.to_thread(save_message, "ai", CHAT_FALLBACK, session_id=payload.session_id)
+
         # Still HTTP 200, so frontend never breaks
-        return {"reply": fallback}
-    
+        return {"reply": CHAT_FALLBACK}
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def ai_chat_stream(payload: ChatRequest):
+    """
+    Same as /chat, but relays the reply as Server-Sent Events while the
+    model generates it:
+    - event: token  data: {"delta": "..."}
+    - event: done   data: {"reply": "...", "ttft_ms": ...}
+    The full reply is saved once generation ends. If the client disconnects
+    mid-stream, the upstream request is closed and the partial reply that
+    was already delivered is saved.
+    """
+    messages = await asyncio.to_thread(start_chat, payload)
+
+    async def events():
+        parts = []
+        finished = False
+        start = time.perf_counter()
+        ttft_ms = None
+        try:
+            try:
+                # aclosing: on disconnect the upstream stream and its pooled
+                # connection are released now, not when the generator is collected
+                async with contextlib.aclosing(llm.stream(messages=messages, temperature=0.6)) as stream:
+                    async for delta in stream:
+                        if ttft_ms is None:
+                            ttft_ms = round((time.perf_counter() - start) * 1000, 1)
+                        parts.append(delta)
+                        yield sse("token", {"delta": delta})
+            except LLMError as e:
+                print("Groq AI stream error:", repr(e))
+                if not parts:
+                    parts.append(CHAT_FALLBACK)
+                    yield sse("token", {"delta": CHAT_FALLBACK})
+            finished = True
+            yield sse("done", {"reply": "".join(parts), "ttft_ms": ttft_ms})
+        finally:
+            # Runs on normal completion and on client disconnect (cancellation)
+            if parts:
+                reply = "".join(parts)
+                if finished:
+                    await asyncio.to_thread(save_message, "ai", reply, session_id=payload.session_id)
+                else:
+                    # Client gone: queue the write without waiting for it
+                    save_message("ai", reply, session_id=payload.session_id, wait=False)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/llm-stats")
+def llm_stats():
+    """Gateway counters (incl. time-to-first-token) and chat prompt sizes."""
+    return {**llm.snapshot(), "context": dict(context_stats)}
+
 @router.post("/score-insights", response_model=ScoreInsightsResponse)
 async def score_insights(payload: ScoreInsightsRequest):
     """
@@ -129,6 +206,14 @@ async def score_insights(payload: ScoreInsightsRequest):
     if not resume_text:
         raise HTTPException(status_code=400, detail="resume_text is required")
 
+    cache_key = response_cache.make_key("score-insights", SCORE_INSIGHTS_PROMPT_VERSION, llm.model, resume_text)
+    if payload.use_cache and not payload.refresh_cache:
+        cached = await response_cache.aget(cache_key)
+        if cached:
+            return ScoreInsightsResponse(**cached)
+    else:
+        response_cache.record_bypass()
+
     prompt = f"""
 You are an expert ATS (Applicant Tracking System) scanner and career coach.
 
@@ -164,28 +249,21 @@ Return ONLY JSON. No extra text, no explanations.
 """
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
+        result = await complete_structured(
+            [
                 {
                     "role": "system",
                     "content": "You are a precise ATS scanner. Always follow the requested JSON format exactly."
                 },
                 {"role": "user", "content": prompt},
             ],
+            ScoreInsightsResponse,
+            kind="score-insights",
             temperature=0.4,
         )
-
-        raw = completion.choices[0].message.content.strip()
-        data = json.loads(raw)
-
-        # Basic safety defaults if something is missing
-        return ScoreInsightsResponse(
-            ats_score=int(data.get("ats_score", 50)),
-            strengths=data.get("strengths", []),
-            drawbacks=data.get("drawbacks", []),
-            improvements=data.get("improvements", []),
-        )
+        if payload.use_cache:
+            await response_cache.aput(cache_key, "score-insights", result.model_dump())
+        return result
 
     except Exception as e:
         print("Groq score-insights error:", repr(e))
@@ -203,3 +281,8 @@ Return ONLY JSON. No extra text, no explanations.
             ],
         )
 
+@router.delete("/cache")
+def clear_analysis_cache():
+    """Drop every cached score-insights / job-match analysis."""
+    response_cache.clear()
+    return {"status": "cleared"}
@@ -0,0 +1,177 @@
+# app/ai/context.py
+
+import math
+import os
+import re
+
+from ..database import get_history, get_chat_summary, save_chat_summary
+from ..utils.extract import extract_resume_sections
+
+# Token budgets (estimated tokens, see estimate_tokens)
+CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "3000"))
+RESUME_TOKENS = int(os.getenv("CHAT_RESUME_TOKENS", "1200"))
+SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", "400"))
+HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", "20"))
+
+# Per summarized turn, keep roughly the first sentence
+SUMMARY_LINE_CHARS = 160
+
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Question words that point at a resume section
+SECTION_HINTS = {
+    "summary": ["summary", "objective", "profile", "about", "introduce"],
+    "skills": ["skill", "stack", "tech", "tool", "learn", "language", "framework"],
+    "experience": ["experience", "work", "job", "intern", "role", "career", "company"],
+    "projects": ["project", "portfolio", "built", "build"],
+    "education": ["education", "degree", "college", "university", "gpa", "course"],
+    "certifications": ["certif", "course", "license"],
+    "achievements": ["achievement", "award", "accomplish"],
+}
+# Questions about the resume as a whole get every section (within budget)
+WHOLE_RESUME_HINTS = ["my resume", "my cv", "rate me", "my profile", "review my", "improve my", "about me"]
+
+context_stats = {
+    "requests": 0,
+    "prompt_tokens_last": 0,
+    "prompt_tokens_total": 0,
+    "prompt_tokens_max": 0,
+    "history_turns_last": 0,
+    "resume_tokens_last": 0,
+    "summary_tokens_last": 0,
+    "summary_updates": 0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; good enough for budgeting
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def truncate_to_tokens(text: str, tokens: int, keep="head") -> str:
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + " …" if keep == "head" else "… " + text[-limit:].lstrip()
+
+
+def select_resume_context(resume_text: str, question: str, budget=RESUME_TOKENS) -> str:
+    """
+    Only the resume sections relevant to the question, best match first,
+    within the token budget. General questions get no resume context.
+    """
+    if not resume_text:
+        return ""
+
+    q = question.lower()
+    sections = extract_resume_sections(resume_text)
+    whole = any(h in q for h in WHOLE_RESUME_HINTS)
+    if not sections:
+        return truncate_to_tokens(resume_text, budget) if whole else ""
+
+    q_words = {w for w in WORD_RE.findall(q) if len(w) > 3}
+    ranked = []
+    for order, (name, content) in enumerate(sections.items()):
+        score = 3 * sum(h in q for h in SECTION_HINTS.get(name, [name]))
+        score += len(q_words & set(WORD_RE.findall(content.lower())))
+        if score or whole:
+            ranked.append((-score, order, name, content.strip()))
+    ranked.sort()
+
+    parts = []
+    remaining = budget
+    for _, _, name, content in ranked:
+        block = f"{name.upper()}:\n{content}"
+        if estimate_tokens(block) > remaining:
+            if remaining > 50:
+                parts.append(truncate_to_tokens(block, remaining))
+            break
+        parts.append(block)
+        remaining -= estimate_tokens(block)
+    return "\n\n".join(parts)
+
+
+def compress_turn(message: dict) -> str:
+    text = " ".join(message["message"].split())
+    first = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    who = "User" if message["role"] == "user" else "Assistant"
+    return f"- {who}: {first[:SUMMARY_LINE_CHARS]}"
+
+
+def rolling_summary(session_id: str, cutoff_id: int) -> str:
+    """
+    Compressed summary of every message in the session with id < cutoff_id.
+    The summary is cached per session and only extended with turns that
+    aged out of the recent window since it was last built.
+    """
+    cached = get_chat_summary(session_id)
+    upto_id, summary = cached if cached else (0, "")
+    if upto_id >= cutoff_id - 1:
+        return summary
+
+    aged_out = get_history(session_id, after_id=upto_id, before_id=cutoff_id, limit=1000)
+    if not aged_out:
+        return summary
+
+    lines = [summary] if summary else []
+    lines += [compress_turn(m) for m in aged_out]
+    # Oldest lines fall off first once the summary outgrows its budget
+    summary = truncate_to_tokens("\n".join(lines), SUMMARY_TOKENS, keep="tail")
+    save_chat_summary(session_id, aged_out[-1]["id"], summary)
+    context_stats["summary_updates"] += 1
+    return summary
+
+
+def build_chat_context(session_id: str, system_prompt: str, user_msg: str, resume_text: str,
+                       budget=CONTEXT_TOKENS):
+    """
+    Model messages for one chat turn: system prompt, a rolling summary of
+    older turns, as many recent turns as fit the budget, and the question
+    with only the relevant resume sections attached.
+    """
+    resume_ctx = select_resume_context(resume_text, user_msg)
+    if resume_ctx:
+        user_content = (
+            f"{user_msg}\n\n"
+            f"---\nRESUME CONTEXT (Use ONLY if the user asks about their resume/profile):\n{resume_ctx}\n"
+            "If the question is general (e.g., 'trending skills', 'roadmap'), ANSWER GENERALLY. Do NOT force the resume context unless relevant."
+        )
+    else:
+        user_content = user_msg
+
+    history = get_history(session_id, limit=HISTORY_WINDOW)
+    available = budget - estimate_tokens(system_prompt) - estimate_tokens(user_content)
+    if history:
+        available -= SUMMARY_TOKENS  # room for the rolling summary of older turns
+
+    recent = []
+    for message in reversed(history):
+        cost = estimate_tokens(message["message"])
+        if cost > available:
+            break
+        recent.insert(0, message)
+        available -= cost
+
+    summary = ""
+    if history:
+        cutoff = recent[0]["id"] if recent else history[-1]["id"] + 1
+        summary = rolling_summary(session_id, cutoff)
+
+    messages = [{"role": "system", "content": system_prompt}]
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    messages += [
+        {"role": "user" if m["role"] == "user" else "assistant", "content": m["message"]}
+        for m in recent
+    ]
+    messages.append({"role": "user", "content": user_content})
+
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+    context_stats["requests"] += 1
+    context_stats["prompt_tokens_last"] = prompt_tokens
+    context_stats["prompt_tokens_total"] += prompt_tokens
+    context_stats["prompt_tokens_max"] = max(context_stats["prompt_tokens_max"], prompt_tokens)
+    context_stats["history_turns_last"] = len(recent)
+    context_stats["resume_tokens_last"] = estimate_tokens(resume_ctx)
+    context_stats["summary_tokens_last"] = estimate_tokens(summary)
+    return messages
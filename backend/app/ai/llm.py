@@ -0,0 +1,182 @@
+# app/ai/llm.py
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+
+from app.utils.metrics import record, span
+
+load_dotenv()
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+if not GROQ_API_KEY:
+    print("⚠ GROQ_API_KEY missing in .env")
+
+# Any OpenAI-compatible endpoint works (point it at a local stub for tests)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMGateway:
+    """
+    Shared async client for chat completions.
+
+    - one pooled httpx.AsyncClient (keep-alive connections to the provider)
+    - a global semaphore capping in-flight upstream calls
+    - a per-request timeout
+    - identical in-flight requests are coalesced into one upstream call
+    """
+
+    def __init__(self, base_url=LLM_BASE_URL, api_key=GROQ_API_KEY, model=LLM_MODEL,
+                 max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.stats = {
+            "requests": 0, "upstream_calls": 0, "coalesced": 0, "errors": 0,
+            "streams": 0, "streams_cancelled": 0,
+            "ttft_samples": 0, "ttft_ms_total": 0.0, "ttft_ms_last": None,
+        }
+        self._client = None
+        self._errors = ()
+        self._semaphore = None
+        self._loop = None
+        self._inflight = {}
+
+    def configure(self, **options):
+        for name, value in options.items():
+            setattr(self, name, value)
+        self.base_url = self.base_url.rstrip("/")
+        self._client = None
+        self._loop = None
+
+    def _ensure_client(self):
+        # Clients and semaphores belong to one event loop; rebuild them if the
+        # loop changed (e.g. separate asyncio.run() calls in scripts).
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Imported on first use: routers that only reference the gateway
+            # don't pay for the HTTP stack at startup
+            import httpx
+            self._errors = (httpx.HTTPError, KeyError, IndexError, ValueError)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self._inflight = {}
+        return self._client
+
+    def request_body(self, messages, model=None, temperature=0.6, **extra):
+        return {"model": model or self.model, "messages": messages, "temperature": temperature, **extra}
+
+    @staticmethod
+    def request_key(body):
+        return hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def complete(self, messages, model=None, temperature=0.6) -> str:
+        """Return the assistant message content for a chat completion."""
+        self._ensure_client()
+        self.stats["requests"] += 1
+        body = self.request_body(messages, model, temperature)
+        key = self.request_key(body)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self._call(body))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller giving up must not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _call(self, body):
+        client = self._ensure_client()
+        async with self._semaphore:
+            self.stats["upstream_calls"] += 1
+            try:
+                with span("llm"):
+                    res = await client.post("/chat/completions", json=body)
+                res.raise_for_status()
+                return res.json()["choices"][0]["message"]["content"]
+            except self._errors as e:
+                self.stats["errors"] += 1
+                raise LLMError(repr(e)) from e
+
+    async def stream(self, messages, model=None, temperature=0.6):
+        """
+        Yield content deltas as the provider streams them (SSE). Streams are
+        never coalesced; closing the generator closes the upstream response.
+        """
+        client = self._ensure_client()
+        body = self.request_body(messages, model, temperature, stream=True)
+        self.stats["requests"] += 1
+        self.stats["streams"] += 1
+        start = time.perf_counter()
+        first = True
+        completed = failed = False
+        async with self._semaphore:
+            self.stats["upstream_calls"] += 1
+            try:
+                async with client.stream("POST", "/chat/completions", json=body) as res:
+                    res.raise_for_status()
+                    async for line in res.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                        if not delta:
+                            continue
+                        if first:
+                            first = False
+                            ttft = (time.perf_counter() - start) * 1000
+                            self.stats["ttft_samples"] += 1
+                            self.stats["ttft_ms_total"] += ttft
+                            self.stats["ttft_ms_last"] = round(ttft, 1)
+                            record("llm_ttft", ttft / 1000)
+                        yield delta
+                completed = True
+            except self._errors as e:
+                failed = True
+                self.stats["errors"] += 1
+                raise LLMError(repr(e)) from e
+            finally:
+                # Consumer stopped early (client disconnect → generator closed)
+                if not completed and not failed:
+                    self.stats["streams_cancelled"] += 1
+                record("llm_stream", time.perf_counter() - start)
+
+    def snapshot(self):
+        samples = self.stats["ttft_samples"]
+        return {
+            **self.stats,
+            "ttft_ms_avg": round(self.stats["ttft_ms_total"] / samples, 1) if samples else None,
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+llm = LLMGateway()
@@ -0,0 +1,124 @@
+# app/ai/response_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace differences must not cause a cache miss."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache for structured LLM analyses (survives restarts).
+    Entries expire after `ttl` seconds; beyond `max_entries` the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, db_path, ttl=7 * 24 * 3600, max_entries=10_000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "bypassed": 0}
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_responses (
+                        key TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)")
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(kind: str, prompt_version: str, model: str, *inputs: str) -> str:
+        parts = [kind, prompt_version, model, *(normalize_text(i) for i in inputs)]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
+
+    def get(self, key: str):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._count("expired")
+                row = None
+            if row:
+                conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+        self._count("hits" if row else "misses")
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, kind: str, response: dict):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, kind, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(response), now, now),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._count("evictions", excess)
+
+    # Async handlers use these: get/put open SQLite and may wait on disk
+    async def aget(self, key: str):
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, kind: str, response: dict):
+        await asyncio.to_thread(self.put, key, kind, response)
+
+    def record_bypass(self):
+        """A request chose to skip or refresh the cache."""
+        self._count("bypassed")
+
+    def invalidate(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_responses")
+
+    def snapshot(self):
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        with self._lock:
+            return {**self.stats, "entries": entries}
+
+
+response_cache = ResponseCache(
+    db_path=os.getenv("LLM_CACHE_DB", "llm_cache.db"),
+    ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+)
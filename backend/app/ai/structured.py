@@ -0,0 +1,305 @@
+# app/ai/structured.py
+
+import ast
+import json
+import re
+import time
+import typing
+
+from app.utils.metrics import record, registry
+
+from .llm import llm
+
+FENCE_RE = re.compile(r"```[a-zA-Z]*\s*(.*?)```", re.S)
+STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"', re.S)
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+UNQUOTED_KEY_RE = re.compile(r'([{,]\s*)([A-Za-z_][\w ]*?)\s*:(?!//)')
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‘": "'", "’": "'"})
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+# ---------- Extraction and repair ----------
+
+def extract_json_object(raw: str) -> str:
+    """
+    The JSON object inside a completion: code fences and any prose before or
+    after it are dropped. A truncated object is returned up to the end of
+    the text (repair_json closes it).
+    """
+    text = (raw or "").strip().lstrip("﻿")
+    for block in FENCE_RE.findall(text):
+        if "{" in block:
+            text = block
+            break
+    start = text.find("{")
+    if start < 0:
+        raise StructuredOutputError("no JSON object in the reply")
+
+    depth, in_string, escaped = 0, None, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == in_string:
+                in_string = None
+        elif ch in "\"'":
+            # Apostrophes in unquoted prose must not open a string
+            if ch == '"' or text[i - 1] in "{[,: \n\t":
+                in_string = ch
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def _strip_comments(text):
+    out, in_string, escaped, i = [], False, False, 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif text.startswith("//", i):
+            i = text.find("\n", i)
+            if i < 0:
+                break
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _close_truncated(text):
+    """Close an object cut off mid-reply: open string, dangling key or comma, open brackets."""
+    stack, in_string, escaped = [], False, False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    if not stack and not in_string:
+        return text
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    # A key without its value, or a trailing comma, can't be completed
+    text = re.sub(r',?\s*"[^"]*"\s*:\s*$', "", text)
+    text = text.rstrip().rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def _outside_strings(text, fn):
+    """Apply fn to the parts of text that are not inside JSON strings."""
+    out, last = [], 0
+    for m in STRING_RE.finditer(text):
+        out.append(fn(text[last:m.start()]))
+        out.append(m.group())
+        last = m.end()
+    out.append(fn(text[last:]))
+    return "".join(out)
+
+
+def _fix_structure(segment):
+    segment = UNQUOTED_KEY_RE.sub(lambda m: f'{m.group(1)}"{m.group(2).strip()}":', segment)
+    return TRAILING_COMMA_RE.sub(r"\1", segment)
+
+
+def repair_json(text: str, smart_quotes=False) -> str:
+    """
+    Fix the usual completion defects: comments, unquoted keys, trailing
+    commas, truncation; with smart_quotes also “curly” quote delimiters
+    (off by default, since curly quotes inside string values are fine).
+    """
+    if smart_quotes:
+        text = text.translate(SMART_QUOTES)
+    text = _close_truncated(_strip_comments(text))
+    return _outside_strings(text, _fix_structure)
+
+
+def parse_json_object(raw: str):
+    """(dict, repaired) from a completion; StructuredOutputError if nothing usable is in it."""
+    candidate = extract_json_object(raw)
+    try:
+        data = json.loads(candidate, strict=False)
+        repaired = candidate != (raw or "").strip()
+    except ValueError:
+        repaired = True
+        data = None
+        for smart_quotes in (False, True):
+            try:
+                data = json.loads(repair_json(candidate, smart_quotes), strict=False)
+                break
+            except ValueError:
+                continue
+        if data is None:
+            # Python-style dicts: single quotes, True/False/None
+            try:
+                data = ast.literal_eval(candidate)
+            except (ValueError, SyntaxError, MemoryError, RecursionError) as e:
+                raise StructuredOutputError(f"invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise StructuredOutputError("reply is not a JSON object")
+    return data, repaired
+
+
+# ---------- Validation and coercion ----------
+
+def _norm_key(key) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(key).lower()).strip("_")
+
+
+def _to_int(value, field):
+    if isinstance(value, bool):
+        raise StructuredOutputError(f"{field} is not a number")
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = str(value)
+        found = NUMBER_RE.findall(text)
+        if not found:
+            raise StructuredOutputError(f"{field} is not a number")
+        number = float(found[0])
+        # "8.5/10" → 85 for a 0–100 score
+        if field.endswith("score") and len(found) > 1 and "/" in text and float(found[1]) > 0:
+            number = number / float(found[1]) * 100
+    if field.endswith("score"):
+        number = min(max(number, 0), 100)
+    return int(round(number))
+
+
+def _to_str_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        lines = [BULLET_RE.sub("", line).strip() for line in value.splitlines()]
+        lines = [line for line in lines if line]
+        if len(lines) == 1 and ";" in lines[0]:
+            lines = [part.strip() for part in lines[0].split(";") if part.strip()]
+        return lines
+    if isinstance(value, dict):
+        value = list(value.values())
+    items = []
+    for item in value if isinstance(value, (list, tuple)) else [value]:
+        if isinstance(item, dict):
+            # {"skill": "Docker"} / {"text": "..."}: keep the first text value
+            item = next((v for v in item.values() if isinstance(v, str)), None)
+        if item is not None and str(item).strip():
+            items.append(str(item).strip())
+    return items
+
+
+def validate_output(data: dict, model):
+    """
+    Build `model` from a parsed reply: keys matched loosely ("Match Score",
+    "score" → match_score), scores coerced to 0–100 ints, list fields
+    accept strings, bullets and dicts. Only the model's required fields are
+    taken from the reply; a missing number is an error, a missing list [].
+    """
+    keys = {_norm_key(k): v for k, v in data.items()}
+    values = {}
+    for name, field in model.model_fields.items():
+        if not field.is_required():
+            continue
+        if name in keys:
+            value = keys[name]
+        else:
+            # "score" for "match_score", "ats_match_score" for "match_score", ...
+            close = [k for k in keys if name.endswith("_" + k) or k.endswith("_" + name)]
+            value = keys[close[0]] if len(close) == 1 else None
+        origin = typing.get_origin(field.annotation) or field.annotation
+        if origin is int:
+            if value is None:
+                raise StructuredOutputError(f"{name} is missing")
+            values[name] = _to_int(value, name)
+        elif origin is list:
+            values[name] = _to_str_list(value)
+        else:
+            values[name] = value
+    return model(**values)
+
+
+# ---------- Completion with repair and one targeted retry ----------
+
+def _retry_prompt(model, error):
+    fields = ", ".join(f'"{name}"' for name, f in model.model_fields.items() if f.is_required())
+    return (
+        f"Your previous reply could not be used ({error}). Reply again with ONLY the JSON object "
+        f"with the keys {fields} — no code fences, no text before or after it."
+    )
+
+
+async def complete_structured(messages, model, kind: str, temperature=0.3):
+    """
+    Call the LLM and return a validated `model`. Replies that need
+    extracting or repairing are fixed locally; only when that fails is the
+    model asked once more, with the error, at temperature 0. Raises
+    StructuredOutputError if the retry is unusable too.
+
+    Metrics: llm_structured_total{kind, outcome=clean|repaired|retried|failed}
+    and llm_repair_saved_seconds{kind} (the call time a repair saved by not
+    retrying).
+    """
+    start = time.perf_counter()
+    raw = await llm.complete(messages=messages, temperature=temperature)
+    call_seconds = time.perf_counter() - start
+
+    try:
+        t = time.perf_counter()
+        data, repaired = parse_json_object(raw)
+        result = validate_output(data, model)
+        record("structured_parse", time.perf_counter() - t)
+    except StructuredOutputError as e:
+        error = e
+    else:
+        if repaired:
+            registry.observe("llm_repair_saved_seconds", call_seconds, kind=kind)
+        registry.inc("llm_structured_total", kind=kind, outcome="repaired" if repaired else "clean")
+        return result
+
+    print(f"{kind}: unusable LLM reply ({error}), retrying once")
+    retry_messages = messages + [
+        {"role": "assistant", "content": raw},
+        {"role": "user", "content": _retry_prompt(model, error)},
+    ]
+    raw = await llm.complete(messages=retry_messages, temperature=0)
+    try:
+        data, _ = parse_json_object(raw)
+        result = validate_output(data, model)
+    except StructuredOutputError:
+        registry.inc("llm_structured_total", kind=kind, outcome="failed")
+        raise
+    registry.inc("llm_structured_total", kind=kind, outcome="retried")
+    return result
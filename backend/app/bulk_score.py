@@ -0,0 +1,231 @@
+"""
+Offline bulk scoring of a resume archive.
+
+Run from backend/:
+
+    python -m app.bulk_score ARCHIVE_DIR -o scores.jsonl [--workers 8] [--format parquet]
+
+Walks ARCHIVE_DIR for resume files (PDF, DOCX, DOC, RTF, HTML, text), parses and scores them in a process
+pool (same extraction, section, ATS and skill code as the API) and appends
+one JSON object per file to the output. Each task takes BATCH_SIZE files
+and scores all their sections in one vectorized pass (score_resumes). The output doubles as the
+checkpoint: re-running the same command skips files already in it, so an
+interrupted run picks up where it stopped. Set TEXT_CACHE_DB to reuse
+parsed text when re-scoring the same archive after a rules change.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO
+from pathlib import Path
+
+from .utils.ats_score import score_resumes
+from .utils.extract import document_kind, extract_document_text, extract_resume_sections, extract_skills
+from .utils.ingest import sniff_kind
+from .utils.text_cache import text_cache
+
+STAGES = ["read", "parse", "sections", "score", "skills"]
+# Files per worker task, scored together
+BATCH_SIZE = 32
+# Recycle workers now and then (every this many files) so parser memory can't creep up over a long run
+FILES_PER_WORKER = 500
+PROGRESS_EVERY = 500
+
+
+def find_documents(root: Path):
+    """Resume files under root, relative paths in a stable order."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if document_kind(name):
+                found.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return found
+
+
+def score_documents(root: str, rel_paths: list):
+    """Worker: a batch of files → (result records, per-stage seconds summed over the batch)."""
+    timings = dict.fromkeys(STAGES, 0.0)
+    records, parsed = [], []
+    for rel_path in rel_paths:
+        record = {"path": rel_path}
+        records.append(record)
+        try:
+            t = time.perf_counter()
+            data = Path(root, rel_path).read_bytes()
+            timings["read"] += time.perf_counter() - t
+            t = time.perf_counter()
+
+            kind = sniff_kind(data[:2048], rel_path, lambda: BytesIO(data))
+            if kind is None:
+                raise ValueError("unsupported file type")
+            text = extract_document_text(kind, data)
+            timings["parse"] += time.perf_counter() - t
+            t = time.perf_counter()
+
+            sections = extract_resume_sections(text)
+            timings["sections"] += time.perf_counter() - t
+            t = time.perf_counter()
+
+            skills = extract_skills(text)
+            timings["skills"] += time.perf_counter() - t
+
+            record.update(sha256=text_cache.key_for(data), chars=len(text), skills=skills)
+            parsed.append((record, sections))
+        except Exception as e:
+            record["error"] = repr(e)
+
+    t = time.perf_counter()
+    try:
+        for (record, _), ats in zip(parsed, score_resumes([sections for _, sections in parsed])):
+            record.update(ats)
+    except Exception as e:
+        for record, _ in parsed:
+            record["error"] = repr(e)
+    timings["score"] = time.perf_counter() - t
+    return records, timings
+
+
+def load_checkpoint(out_path: Path, retry_errors: bool):
+    """
+    Paths already in the output. A torn last line (killed mid-write) is cut
+    off; with retry_errors, failed files are dropped so they run again.
+    """
+    done = set()
+    if not out_path.exists():
+        return done
+    kept = []
+    with open(out_path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if retry_errors and "error" in record:
+                continue
+            done.add(record["path"])
+            kept.append(line)
+    with open(out_path, "wb") as f:
+        f.writelines(kept)
+    return done
+
+
+class Progress:
+    def __init__(self, total, skipped):
+        self.total = total
+        self.skipped = skipped
+        self.done = 0
+        self.errors = 0
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.start = time.perf_counter()
+
+    def add(self, records, timings):
+        self.done += len(records)
+        self.errors += sum("error" in record for record in records)
+        for stage, seconds in timings.items():
+            self.stage_seconds[stage] += seconds
+
+    def line(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        return (f"{self.skipped + self.done}/{self.total} files, {self.errors} errors, "
+                f"{rate:.1f} docs/s overall")
+
+    def report(self, workers):
+        print(self.line())
+        # Per-stage docs/s of one worker; the pool runs `workers` of these at once
+        for stage in STAGES:
+            seconds = self.stage_seconds[stage]
+            rate = self.done / seconds if seconds else float("inf")
+            print(f"  {stage:<9} {seconds:8.2f}s  {rate:10.1f} docs/s per worker "
+                  f"(~{rate * workers:.1f} with {workers} workers)")
+
+
+def run(root: Path, out_path: Path, workers: int, retry_errors=False, limit=None):
+    documents = find_documents(root)
+    done = load_checkpoint(out_path, retry_errors)
+    todo = [p for p in documents if p not in done]
+    progress = Progress(len(documents), len(documents) - len(todo))
+    if limit is not None:
+        todo = todo[:limit]
+    print(f"{len(documents)} documents, {len(done)} already scored, {len(todo)} to go")
+    if not todo:
+        return progress
+
+    # spawn: same as the API's parse pool; each worker loads the taxonomy once
+    ctx = multiprocessing.get_context("spawn")
+    # Small runs still spread over every worker
+    batch_size = max(1, min(BATCH_SIZE, len(todo) // workers))
+    queue = (todo[i:i + batch_size] for i in range(0, len(todo), batch_size))
+    tasks_per_child = max(1, FILES_PER_WORKER // batch_size)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, max_tasks_per_child=tasks_per_child) as pool, \
+            open(out_path, "a", encoding="utf-8") as out:
+        # At most 2 batches per worker in flight: memory stays flat on any archive size
+        pending = set()
+        for batch in queue:
+            pending.add(pool.submit(score_documents, str(root), batch))
+            if len(pending) >= workers * 2:
+                break
+        next_report = PROGRESS_EVERY
+        try:
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    records, timings = future.result()
+                    out.writelines(json.dumps(record) + "\n" for record in records)
+                    progress.add(records, timings)
+                    if progress.done >= next_report:
+                        next_report += PROGRESS_EVERY
+                        out.flush()
+                        print(progress.line(), flush=True)
+                    batch = next(queue, None)
+                    if batch is not None:
+                        pending.add(pool.submit(score_documents, str(root), batch))
+        except KeyboardInterrupt:
+            for future in pending:
+                future.cancel()
+            print("\ninterrupted; re-run the same command to resume")
+            raise
+    return progress
+
+
+def to_parquet(jsonl_path: Path, parquet_path: Path):
+    try:
+        import pyarrow.json as pa_json
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet output needs pyarrow (pip install pyarrow); the JSONL results are in " + str(jsonl_path))
+    pq.write_table(pa_json.read_json(jsonl_path), parquet_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every resume file under a directory.")
+    parser.add_argument("archive", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=Path("scores.jsonl"))
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--retry-errors", action="store_true", help="re-run files that failed last time")
+    parser.add_argument("--limit", type=int, help="score at most this many new files")
+    args = parser.parse_args(argv)
+
+    if not args.archive.is_dir():
+        parser.error(f"{args.archive} is not a directory")
+
+    # Parquet can't be appended to, so the JSONL file is the checkpoint either way
+    jsonl_path = args.output.with_suffix(".jsonl") if args.format == "parquet" else args.output
+    try:
+        progress = run(args.archive, jsonl_path, args.workers, args.retry_errors, args.limit)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    progress.report(args.workers)
+    if args.format == "parquet":
+        to_parquet(jsonl_path, args.output)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
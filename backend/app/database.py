@@ -1,15 +1,62 @@
+import os
+import queue
 import sqlite3
 import datetime
+import threading
+from collections import OrderedDict, deque
 from pathlib import Path
 
+from app.utils.metrics import registry, timed
+
 # Use a local SQLite file in the app directory or user workspace
-DB_PATH = Path("chat_history.db")
+DB_PATH = Path(os.getenv("CHAT_DB_PATH", "chat_history.db"))
 
-def get_db_connection():
-    conn = sqlite3.connect(str(DB_PATH))
+# Group commit: the writer thread commits up to WRITE_BATCH_MAX queued
+# writes in one transaction, waiting at most WRITE_BATCH_WAIT seconds for
+# more to arrive once it has one.
+WRITE_BATCH_MAX = int(os.getenv("DB_WRITE_BATCH_MAX", "256"))
+WRITE_BATCH_WAIT = float(os.getenv("DB_WRITE_BATCH_WAIT_MS", "2")) / 1000
+WRITE_TIMEOUT = 10
+
+# Newest activities kept in memory per user, for up to ACTIVITY_BUFFER_USERS users
+ACTIVITY_BUFFER_SIZE = int(os.getenv("ACTIVITY_BUFFER_SIZE", "50"))
+ACTIVITY_BUFFER_USERS = int(os.getenv("ACTIVITY_BUFFER_USERS", "1024"))
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",      # readers never block the writer
+    "PRAGMA synchronous=NORMAL",    # safe with WAL, one fsync per checkpoint
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",     # ~16 MB page cache per connection
+]
+
+_local = threading.local()
+
+
+def open_db_connection():
+    conn = sqlite3.connect(str(DB_PATH), timeout=5, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+
+def get_db_connection():
+    """One connection per thread, reused across calls."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = open_db_connection()
+    return conn
+
+
+def close_db_connection():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+@timed("db.init_db")
 def init_db():
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -17,11 +64,16 @@ def init_db():
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS chats (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL DEFAULT 'default',
             role TEXT NOT NULL,
             message TEXT NOT NULL,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    # Older databases predate per-session history
+    columns = [row["name"] for row in cursor.execute("PRAGMA table_info(chats)")]
+    if "session_id" not in columns:
+        cursor.execute("ALTER TABLE chats ADD COLUMN session_id TEXT NOT NULL DEFAULT 'default'")
     # Activity table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS activities (
@@ -31,54 +83,251 @@ def init_db():
             title TEXT NOT NULL,
             detail TEXT,
             route TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            user_id TEXT NOT NULL DEFAULT 'default'
         )
     """)
+    columns = [row["name"] for row in cursor.execute("PRAGMA table_info(activities)")]
+    if "user_id" not in columns:
+        cursor.execute("ALTER TABLE activities ADD COLUMN user_id TEXT NOT NULL DEFAULT 'default'")
+    # Rolling summary of each session's older turns (see ai/context.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chat_summaries (
+            session_id TEXT PRIMARY KEY,
+            upto_id INTEGER NOT NULL,
+            summary TEXT NOT NULL
+        )
+    """)
+    # Chat history is read per session and activities per user, both in id
+    # order (keyset pagination)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chats_session_id ON chats(session_id, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_activities_user_id ON activities(user_id, id)")
     conn.commit()
-    conn.close()
 
-# Initialize on import (safe for this scale)
-init_db()
 
-def save_message(role: str, message: str):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO chats (role, message) VALUES (?, ?)", (role, message))
-    conn.commit()
-    conn.close()
+class WriteQueue:
+    """
+    Single writer thread. Callers enqueue (sql, params) and, by default, wait
+    until the batch containing their write is committed, so concurrent
+    requests share one transaction instead of fighting over the write lock.
+    Waiting blocks the calling thread: async code submits with wait=False or
+    goes through asyncio.to_thread.
+    """
 
-def get_history():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT role, message, timestamp FROM chats ORDER BY id ASC")
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
 
-def clear_history():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM chats")
-    conn.commit()
-    conn.close()
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
 
-def log_activity(type: str, tag: str, title: str, detail: str, route: str):
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    def submit(self, sql, params, wait=True, on_commit=None):
+        """on_commit(rowid) runs on the writer thread once the write is committed."""
+        self._ensure_started()
+        done = threading.Event()
+        item = {"sql": sql, "params": params, "done": done, "error": None, "on_commit": on_commit, "rowid": None}
+        self._queue.put(item)
+        if wait:
+            if not done.wait(WRITE_TIMEOUT):
+                raise TimeoutError("database write timed out")
+            if item["error"]:
+                raise item["error"]
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        self.submit(None, None, wait=True)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        try:
+            while len(batch) < WRITE_BATCH_MAX:
+                batch.append(self._queue.get(timeout=WRITE_BATCH_WAIT))
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        conn = get_db_connection()
+        while True:
+            batch = self._collect()
+            writes = [item for item in batch if item["sql"]]
+            try:
+                with conn:
+                    for item in writes:
+                        item["rowid"] = conn.execute(item["sql"], item["params"]).lastrowid
+            except Exception as e:
+                # Retry one by one so a single bad row doesn't sink the batch
+                for item in writes:
+                    try:
+                        with conn:
+                            item["rowid"] = conn.execute(item["sql"], item["params"]).lastrowid
+                    except Exception as item_error:
+                        item["error"] = item_error
+                print("DB write batch error:", repr(e))
+            registry.inc("db_write_batches_total")
+            registry.inc("db_writes_total", len(writes))
+            for item in writes:
+                if item["on_commit"] and not item["error"]:
+                    try:
+                        item["on_commit"](item["rowid"])
+                    except Exception as e:
+                        print("DB on_commit error:", repr(e))
+            for item in batch:
+                item["done"].set()
+
+
+write_queue = WriteQueue()
+
+
+DEFAULT_SESSION = "default"
+HISTORY_COLUMNS = "id, role, message, timestamp"
+
+@timed("db.save_message")
+def save_message(role: str, message: str, session_id: str = DEFAULT_SESSION, wait: bool = True):
+    write_queue.submit(
+        "INSERT INTO chats (session_id, role, message) VALUES (?, ?, ?)",
+        (session_id, role, message),
+        wait=wait,
+    )
+
+def _history_query(session_id, before_id=None, after_id=None, limit=None):
+    """
+    Keyset pagination over (session_id, id). Without after_id the newest
+    rows (older than before_id, if given) are selected, so the query walks
+    the index backwards and stops after `limit` rows.
+    """
+    where = ["session_id = ?"]
+    params = [session_id]
+    if before_id is not None:
+        where.append("id < ?")
+        params.append(before_id)
+    if after_id is not None:
+        where.append("id > ?")
+        params.append(after_id)
+    order = "ASC" if after_id is not None else "DESC"
+    sql = f"SELECT {HISTORY_COLUMNS} FROM chats WHERE {' AND '.join(where)} ORDER BY id {order}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params, order == "DESC"
+
+@timed("db.get_history")
+def get_history(session_id: str = DEFAULT_SESSION, before_id=None, after_id=None, limit=50):
+    """One page of a session's messages, oldest first."""
+    sql, params, reverse = _history_query(session_id, before_id, after_id, limit)
+    rows = [dict(row) for row in get_db_connection().execute(sql, params)]
+    return rows[::-1] if reverse else rows
+
+def iter_history(session_id: str = DEFAULT_SESSION, after_id=None, limit=None):
+    """
+    Stream a session's messages oldest first straight from the cursor.
+    Uses its own connection because a streaming response may resume on
+    a different worker thread between rows.
+    """
+    sql, params, _ = _history_query(session_id, after_id=after_id if after_id is not None else 0, limit=limit)
+    conn = open_db_connection()
+    try:
+        for row in conn.execute(sql, params):
+            yield dict(row)
+    finally:
+        conn.close()
+
+@timed("db.clear_history")
+def clear_history(session_id: str = DEFAULT_SESSION):
+    write_queue.submit("DELETE FROM chats WHERE session_id = ?", (session_id,))
+    write_queue.submit("DELETE FROM chat_summaries WHERE session_id = ?", (session_id,))
+
+@timed("db.get_chat_summary")
+def get_chat_summary(session_id: str = DEFAULT_SESSION):
+    """(upto_id, summary) covering every message with id <= upto_id, or None."""
+    row = get_db_connection().execute(
+        "SELECT upto_id, summary FROM chat_summaries WHERE session_id = ?", (session_id,)
+    ).fetchone()
+    return (row["upto_id"], row["summary"]) if row else None
+
+@timed("db.save_chat_summary")
+def save_chat_summary(session_id: str, upto_id: int, summary: str):
+    write_queue.submit(
+        "INSERT OR REPLACE INTO chat_summaries (session_id, upto_id, summary) VALUES (?, ?, ?)",
+        (session_id, upto_id, summary),
+    )
+
+class RecentActivities:
+    """
+    The newest ACTIVITY_BUFFER_SIZE activities of recently active users, so
+    dashboard refreshes don't query SQLite. A user's buffer is loaded from
+    the database on first read and then follows the writer: rows are added
+    once committed, so it never shows an activity the database doesn't have.
+    """
+
+    def __init__(self, size=ACTIVITY_BUFFER_SIZE, max_users=ACTIVITY_BUFFER_USERS):
+        self.size = size
+        self.max_users = max_users
+        self._users = OrderedDict()
+        # Held across a buffer load so a commit can't slip in between the
+        # SELECT and the buffer being registered
+        self._lock = threading.Lock()
+
+    def add(self, user_id, row):
+        with self._lock:
+            buf = self._users.get(user_id)
+            # Not loaded: the first read gets the row from the database
+            if buf is not None and (not buf or buf[0]["id"] < row["id"]):
+                buf.appendleft(row)
+
+    def get(self, user_id, limit):
+        if limit > self.size:
+            registry.inc("activity_reads_total", source="db")
+            return _select_activities(user_id, limit)
+        with self._lock:
+            buf = self._users.get(user_id)
+            if buf is None:
+                registry.inc("activity_reads_total", source="db")
+                buf = self._users[user_id] = deque(_select_activities(user_id, self.size), maxlen=self.size)
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            else:
+                registry.inc("activity_reads_total", source="buffer")
+                self._users.move_to_end(user_id)
+            return [dict(row) for row in list(buf)[:limit]]
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+recent_activities = RecentActivities()
+
+DEFAULT_USER = "default"
+ACTIVITY_INSERT = ("INSERT INTO activities (type, tag, title, detail, route, timestamp, user_id) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+@timed("db.log_activity")
+def log_activity(type: str, tag: str, title: str, detail: str, route: str, wait: bool = True,
+                 user_id: str = DEFAULT_USER):
     # Use UTC ISO format for better compatibility with frontend Date parsing
     timestamp = datetime.datetime.utcnow().isoformat() + "Z"
-    
-    cursor.execute(
-        "INSERT INTO activities (type, tag, title, detail, route, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
-        (type, tag, title, detail, route, timestamp)
+    row = {"type": type, "tag": tag, "title": title, "detail": detail, "route": route,
+           "timestamp": timestamp, "user_id": user_id}
+
+    write_queue.submit(
+        ACTIVITY_INSERT,
+        (type, tag, title, detail, route, timestamp, user_id),
+        wait=wait,
+        on_commit=lambda rowid: recent_activities.add(user_id, {"id": rowid, **row}),
     )
-    conn.commit()
-    conn.close()
 
-def get_recent_activities(limit: int = 10):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM activities ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+def _select_activities(user_id, limit):
+    cursor = get_db_connection().execute(
+        "SELECT * FROM activities WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, limit)
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+@timed("db.get_recent_activities")
+def get_recent_activities(limit: int = 10, user_id: str = DEFAULT_USER):
+    """Newest first, from the in-memory buffer when limit fits in it."""
+    return recent_activities.get(user_id, limit)
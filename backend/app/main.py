@@ -1,20 +1,67 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from typing import List, Optional
+import asyncio
+import json
 from .routers import job
 from app.routers import resume
 from .ai import chat
 
-import pdfplumber
-from docx import Document
-
-from .schemas import JobDescriptionRequest, MatchRequest, MatchResponse, ResumeAnalysis
+from .schemas import (
+    JobDescriptionRequest, MatchRequest, MatchResponse, ResumeAnalysis,
+    BatchMatchRequest, BatchMatchResponse,
+)
 from .utils import extract_skills, compute_match
-from .utils.extract import read_file_text
+from .utils.match import compute_batch, match_level
+from .utils.embeddings import semantic_score
+from .utils.extract import read_file_text_async, read_files_text_async, warm_parsers
+from .utils.ingest import MAX_BATCH_REQUEST_BYTES, UploadLimitMiddleware
+from .utils.parse_pool import parse_executor
+from .utils.skills import get_skill_matcher
+from .utils.text_cache import text_cache
+from .utils.resume_index import resume_index
+from .utils.jobs import job_queue
+from .utils.section_store import section_store
+from .utils import metrics
+from .database import init_db, write_queue
+from .ai.llm import llm
+from .ai.response_cache import response_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the skill trie once, before the first request needs it
+    get_skill_matcher()
+    init_db()
+    # Memory-map the resume corpus index and catch up on newer resumes
+    resume_index.load()
+    job_queue.start()
+    section_store.prune()
+    # Import the document parsers in the background: startup doesn't wait
+    # for them, and they are usually loaded before the first upload
+    # (process-mode workers import their own)
+    if parse_executor.mode != "process":
+        asyncio.get_running_loop().run_in_executor(None, warm_parsers)
+    yield
+    await job_queue.stop()
+    # Activity logging doesn't wait for its writes: commit what is still queued
+    write_queue.flush()
+    parse_executor.shutdown()
+    stats = resume_index.stats()
+    if stats["delta"] or stats["deleted_pending"]:
+        resume_index.compact()
+    await llm.aclose()
+
+
+app = FastAPI(title="Career Compass Backend", lifespan=lifespan)
+app.include_router(resume.router)
 
 
-app = FastAPI(title="Career Compass Backend")
-app.include_router(resume.router)
+# --- Upload size: reject oversized multipart bodies before they are spooled ---
+# (added before CORS so 413 responses still carry the CORS headers)
+app.add_middleware(UploadLimitMiddleware, route_limits={"/api/match/batch/file": MAX_BATCH_REQUEST_BYTES})
 
 
 # --- CORS: allow your React frontend ---
@@ -32,10 +79,42 @@ app.add_middleware(
 )
 
 
+# --- Metrics: request latency per route, opt-in Server-Timing ---
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
+@metrics.registry.register_collector
+def cache_and_pool_metrics():
+    samples = []
+    text = text_cache.snapshot()
+    for event in ("memory_hits", "disk_hits", "misses", "memory_evictions", "disk_evictions"):
+        samples.append(("text_cache_events_total", "counter", {"event": event}, text.get(event)))
+    samples.append(("text_cache_memory_entries", "gauge", {}, text["memory_entries"]))
+    cached = response_cache.snapshot()
+    for event in ("hits", "misses", "expired", "evictions", "bypassed"):
+        samples.append(("llm_cache_events_total", "counter", {"event": event}, cached.get(event)))
+    samples.append(("llm_cache_entries", "gauge", {}, cached["entries"]))
+    gateway = llm.snapshot()
+    for event in ("requests", "upstream_calls", "coalesced", "errors", "streams", "streams_cancelled"):
+        samples.append(("llm_gateway_events_total", "counter", {"event": event}, gateway[event]))
+    samples.append(("parse_pending", "gauge", {}, parse_executor.pending))
+    samples.append(("parse_pool_recycled_total", "counter", {}, parse_executor.recycled))
+    samples.append(("resume_index_documents", "gauge", {}, len(resume_index)))
+    queue = job_queue.snapshot()
+    samples.append(("jobs_queued", "gauge", {}, queue["queued"]))
+    samples.append(("jobs_running", "gauge", {}, queue["running"]))
+    return samples
+
+
 app.include_router(job.router, prefix="/api/job")
 app.include_router(chat.router, prefix="/api/ai")
 from .routers import activity
 app.include_router(activity.router, prefix="/api/activity")
+from .routers import corpus
+app.include_router(corpus.router, prefix="/api/corpus")
+from .routers import jobs
+app.include_router(jobs.router, prefix="/api/jobs")
 
 
 # ---------- Endpoints ----------
@@ -45,13 +124,33 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus text format: stage/request latency histograms, counters, cache gauges."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    """Hit/miss/eviction counters for the parsed-text and LLM response caches."""
+    return {"text": text_cache.snapshot(), "llm": response_cache.snapshot()}
+
+
 
 
 
 @app.post("/api/job/analyze")
 async def analyze_job(req: JobDescriptionRequest):
-    skills = extract_skills(req.text)
-    return {"skills": skills, "raw_text_length": len(req.text)}
+    matches = get_skill_matcher().find(req.text)
+    skills = list(dict.fromkeys(m.skill for m in matches))
+    return {
+        "skills": skills,
+        "matches": [
+            {"skill": m.skill, "text": m.text, "start": m.start, "end": m.end}
+            for m in matches
+        ],
+        "raw_text_length": len(req.text),
+    }
 
 
 @app.post("/api/match", response_model=MatchResponse)
@@ -59,12 +158,11 @@ async def match_resume_job(req: MatchRequest):
     score, matched, missing, summary = compute_match(req.resume_text, req.job_text)
     return MatchResponse(
         score=score,
-        level="Strong Match" if score >= 8 else
-              "Good Match" if score >= 6 else
-              "Average Match" if score >= 4 else "Weak Match",
+        level=match_level(score),
         matched_skills=matched,
         missing_skills=missing,
         summary=summary,
+        semantic_score=semantic_score(req.resume_text, req.job_text),
     )
 
 @app.post("/api/match/file", response_model=MatchResponse)
@@ -76,15 +174,54 @@ async def match_resume_job_file(
     Accepts a job description (text) + resume file (PDF/DOCX),
     extracts text from the resume and computes the match.
     """
-    resume_text = read_file_text(file)
+    resume_text = await read_file_text_async(file)
     score, matched, missing, summary = compute_match(resume_text, job_text)
 
     return MatchResponse(
         score=score,
-        level="Strong Match" if score >= 8 else
-              "Good Match" if score >= 6 else
-              "Average Match" if score >= 4 else "Weak Match",
+        level=match_level(score),
         matched_skills=matched,
         missing_skills=missing,
         summary=summary,
+        semantic_score=semantic_score(resume_text, job_text),
     )
+
+
+def batch_response(job_text: str, resume_texts: list, names=None, top_k=None, stream=False):
+    job_skills, results = compute_batch(job_text, resume_texts)
+    for r in results:
+        r["name"] = names[r["index"]] if names else None
+    if top_k:
+        results = results[:top_k]
+
+    if stream:
+        # NDJSON: a header line with the JD skills, then one ranked result per line
+        def rows():
+            yield json.dumps({"job_skills": job_skills, "count": len(resume_texts)}) + "\n"
+            for r in results:
+                yield json.dumps(r) + "\n"
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    return BatchMatchResponse(job_skills=job_skills, count=len(resume_texts), results=results)
+
+
+@app.post("/api/match/batch", response_model=BatchMatchResponse)
+def match_batch(req: BatchMatchRequest):
+    """
+    Scores one job description against many resume texts in a single pass.
+    Results come back ranked best-first; set stream=true for NDJSON.
+    """
+    return batch_response(req.job_text, req.resume_texts, top_k=req.top_k, stream=req.stream)
+
+
+@app.post("/api/match/batch/file", response_model=BatchMatchResponse)
+async def match_batch_file(
+    job_text: str = Form(...),
+    files: List[UploadFile] = File(...),
+    top_k: Optional[int] = Form(None),
+    stream: bool = Form(False),
+):
+    """Same as /api/match/batch, with resumes uploaded as PDF/DOCX files."""
+    resume_texts = await read_files_text_async(files)
+    names = [f.filename for f in files]
+    return await asyncio.to_thread(batch_response, job_text, resume_texts, names=names, top_k=top_k, stream=stream)
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-from ..database import log_activity, get_recent_activities
+from ..database import DEFAULT_USER, log_activity, get_recent_activities
 
 router = APIRouter()
 
+# Events accepted by one POST /bulk
+MAX_BULK_ACTIVITIES = 500
+
 class ActivityLog(BaseModel):
     type: str # 'score', 'job', 'chat'
     tag: str
     title: str
     detail: str
     route: str
+    user_id: str = DEFAULT_USER
 
 class ActivityResponse(BaseModel):
     id: int
@@ -22,18 +26,33 @@ class ActivityResponse(BaseModel):
     timestamp: str | None
 
 @router.get("/", response_model=List[ActivityResponse])
-def get_activities():
-    """Fetch recent activities (limit 10)"""
-    return get_recent_activities(limit=10)
+def get_activities(user_id: str = DEFAULT_USER, limit: int = 10):
+    """Fetch recent activities (limit 10), served from the in-memory buffer"""
+    return get_recent_activities(limit=max(1, limit), user_id=user_id)
 
-@router.post("/")
-def add_activity(activity: ActivityLog):
-    """Log a new activity from frontend"""
+def _queue(activity: ActivityLog):
+    # Queued for the batching writer; it shows up in GET once committed (milliseconds)
     log_activity(
         type=activity.type,
         tag=activity.tag,
         title=activity.title,
         detail=activity.detail,
-        route=activity.route
+        route=activity.route,
+        user_id=activity.user_id,
+        wait=False,
     )
+
+@router.post("/")
+def add_activity(activity: ActivityLog):
+    """Log a new activity from frontend"""
+    _queue(activity)
     return {"status": "success"}
+
+@router.post("/bulk")
+def add_activities(activities: List[ActivityLog]):
+    """Log several activities in one request (e.g. events buffered by the frontend)"""
+    if len(activities) > MAX_BULK_ACTIVITIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ACTIVITIES} activities per request.")
+    for activity in activities:
+        _queue(activity)
+    return {"status": "success", "count": len(activities)}
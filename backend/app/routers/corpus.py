@@ -0,0 +1,59 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from typing import Optional
+
+from ..schemas import CorpusResumeRequest, CorpusSearchRequest, CorpusSearchResponse
+from ..utils.extract import read_file_text_async
+from ..utils.resume_index import resume_index
+
+router = APIRouter()
+
+
+@router.post("/resumes")
+def add_resume(req: CorpusResumeRequest):
+    """Store a resume and index it; an existing resume_id is replaced."""
+    if not req.text.strip():
+        raise HTTPException(status_code=400, detail="Resume text is empty.")
+    resume_id = resume_index.add(req.text, resume_id=req.resume_id, name=req.name)
+    return {"resume_id": resume_id, "resumes": len(resume_index)}
+
+
+@router.post("/resumes/file")
+async def add_resume_file(
+    file: UploadFile = File(...),
+    resume_id: Optional[str] = Form(None),
+):
+    """Same as /resumes, with the resume uploaded as a PDF/DOCX file."""
+    text = await read_file_text_async(file)
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Could not extract text from the resume.")
+    # Indexing embeds the text and may compact the segment: not on the event loop
+    resume_id = await asyncio.to_thread(resume_index.add, text, resume_id=resume_id, name=file.filename)
+    return {"resume_id": resume_id, "resumes": len(resume_index)}
+
+
+@router.delete("/resumes/{resume_id}")
+def remove_resume(resume_id: str):
+    if not resume_index.remove(resume_id):
+        raise HTTPException(status_code=404, detail="Resume not found.")
+    return {"status": "removed", "resumes": len(resume_index)}
+
+
+@router.post("/search", response_model=CorpusSearchResponse)
+def search_resumes(req: CorpusSearchRequest):
+    """Top-k stored resumes for a job description, best first (BM25 or semantic)."""
+    job_skills, results = resume_index.search(req.job_text, top_k=req.top_k, mode=req.mode)
+    return CorpusSearchResponse(job_skills=job_skills, searched=len(resume_index), results=results)
+
+
+@router.get("/stats")
+def corpus_stats():
+    return resume_index.stats()
+
+
+@router.post("/compact")
+def compact_index():
+    """Merge recent additions and drop deleted resumes from the on-disk segment."""
+    resume_index.compact()
+    return resume_index.stats()
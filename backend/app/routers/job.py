@@ -1,24 +1,74 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
-import json
-from ..ai.chat import client # Re-using the initialized Groq client
-from ..utils.extract import read_file_text
+from typing import Literal, get_args
+import os
+import time
+from ..ai.llm import llm # Shared async LLM gateway
+from ..ai.response_cache import response_cache
+from ..ai.structured import complete_structured
+from ..utils.extract import read_file_text_async
+from ..utils.embeddings import semantic_score
+from ..utils.match import compute_match
+from ..utils.metrics import registry
 
 router = APIRouter()
 
+# Bump when the job-match prompt changes so cached analyses are not reused
+JOB_MATCH_PROMPT_VERSION = "1"
+
+# Hybrid mode: a local score below HYBRID_REJECT_BELOW or above
+# HYBRID_ACCEPT_ABOVE is final; only the band in between goes to the LLM
+HYBRID_REJECT_BELOW = int(os.getenv("HYBRID_REJECT_BELOW", "30"))
+HYBRID_ACCEPT_ABOVE = int(os.getenv("HYBRID_ACCEPT_ABOVE", "75"))
+MatchMode = Literal["llm", "local", "hybrid"]
+MATCH_MODES = get_args(MatchMode)
+
 class JobMatchRequest(BaseModel):
     job_description: str
     resume_text: str
+    use_cache: bool = True       # False: skip the response cache entirely
+    refresh_cache: bool = False  # True: ignore any cached result and replace it
+    use_llm: bool = True         # False: local keyword + embedding scores only (milliseconds)
+    mode: MatchMode | None = None  # overrides use_llm when set
 
 class JobMatchResponse(BaseModel):
     match_score: int
     matched_skills: list[str]
     missing_skills: list[str]
     recommendations: list[str]
+    semantic_score: int | None = None  # local embedding similarity, 0-100
+    source: str = "llm"                # "llm" or "local"
+    tier: str | None = None            # "llm", "local", or hybrid: "clear_reject" | "clear_fit" | "borderline"
+    local_score: int | None = None     # hybrid: the local pre-score the tier was decided on
 
-async def analyze_match_with_ai(jd_text: str, resume_text: str) -> JobMatchResponse:
+def local_match(jd_text: str, resume_text: str) -> JobMatchResponse:
+    """Fast path: keyword skill overlap blended with embedding similarity, no LLM call."""
     if not jd_text or not resume_text:
         raise HTTPException(status_code=400, detail="Job description and resume text are required.")
+    score, matched, missing, _ = compute_match(resume_text, jd_text)
+    semantic = semantic_score(resume_text, jd_text)
+    keyword = score * 10
+    return JobMatchResponse(
+        match_score=int(round((keyword + semantic) / 2)) if matched or missing else semantic,
+        matched_skills=matched,
+        missing_skills=missing,
+        recommendations=[f"Add concrete evidence of {skill} (a project, role or certification)." for skill in missing[:5]],
+        semantic_score=semantic,
+        source="local",
+    )
+
+async def analyze_match_with_ai(jd_text: str, resume_text: str, use_cache: bool = True,
+                                refresh_cache: bool = False) -> JobMatchResponse:
+    if not jd_text or not resume_text:
+        raise HTTPException(status_code=400, detail="Job description and resume text are required.")
+
+    cache_key = response_cache.make_key("job-match", JOB_MATCH_PROMPT_VERSION, llm.model, jd_text, resume_text)
+    if use_cache and not refresh_cache:
+        cached = await response_cache.aget(cache_key)
+        if cached:
+            return JobMatchResponse(**cached)
+    else:
+        response_cache.record_bypass()
 
     prompt = f"""
 You are an expert ATS (Applicant Tracking System) and hiring manager.
@@ -53,48 +103,92 @@ Return ONLY JSON. No extra text.
 """
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
+        # Fenced / chatty / slightly broken JSON is repaired locally; only an
+        # unusable reply costs a second call
+        result = await complete_structured(
+            [
                 {
                     "role": "system",
                     "content": "You are a precise ATS scanner. Always follow the requested JSON format exactly."
                 },
                 {"role": "user", "content": prompt},
             ],
+            JobMatchResponse,
+            kind="job-match",
             temperature=0.3,
         )
-
-        raw = completion.choices[0].message.content.strip()
-        data = json.loads(raw)
-
-        return JobMatchResponse(
-            match_score=int(data.get("match_score", 0)),
-            matched_skills=data.get("matched_skills", []),
-            missing_skills=data.get("missing_skills", []),
-            recommendations=data.get("recommendations", [])
-        )
+        if use_cache:
+            await response_cache.aput(cache_key, "job-match", result.model_dump())
+        return result
 
     except Exception as e:
         print("Groq job-match error:", repr(e))
-        return JobMatchResponse(
-            match_score=0,
-            matched_skills=[],
-            missing_skills=[],
-            recommendations=["AI analysis failed. Please try again later."]
-        )
+        # Fall back to the local scores rather than a zero
+        result = local_match(jd_text, resume_text)
+        result.recommendations.append("AI analysis failed. Please try again later for detailed advice.")
+        return result
+
+def hybrid_tier(local: JobMatchResponse) -> str:
+    """Which tier decides a hybrid match, from the local pre-score."""
+    if not (local.matched_skills or local.missing_skills):
+        # No known skills in the JD: the local score is embedding-only, let the LLM decide
+        return "borderline"
+    if local.match_score < HYBRID_REJECT_BELOW:
+        return "clear_reject"
+    if local.match_score > HYBRID_ACCEPT_ABOVE:
+        return "clear_fit"
+    return "borderline"
+
+async def match(jd_text: str, resume_text: str, use_llm: bool = True, use_cache: bool = True,
+                refresh_cache: bool = False, mode: MatchMode | None = None) -> JobMatchResponse:
+    mode = mode or ("llm" if use_llm else "local")
+    if mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(MATCH_MODES)}.")
+    start = time.perf_counter()
+
+    local = None
+    if mode == "llm":
+        tier = "llm"
+    elif mode == "local":
+        tier = "local"
+    else:
+        local = local_match(jd_text, resume_text)
+        tier = hybrid_tier(local)
+
+    if tier in ("llm", "borderline"):
+        result = await analyze_match_with_ai(jd_text, resume_text, use_cache=use_cache, refresh_cache=refresh_cache)
+        if result.semantic_score is None:
+            result.semantic_score = local.semantic_score if local else semantic_score(resume_text, jd_text)
+    else:
+        result = local or local_match(jd_text, resume_text)
+
+    result.tier = tier
+    result.local_score = local.match_score if local else None
+    registry.inc("job_match_total", mode=mode, tier=tier)
+    registry.observe("job_match_duration_seconds", time.perf_counter() - start, tier=tier)
+    return result
 
 @router.post("/match", response_model=JobMatchResponse)
 async def match_job(data: JobMatchRequest):
-    return await analyze_match_with_ai(data.job_description.strip(), data.resume_text.strip())
+    return await match(
+        data.job_description.strip(), data.resume_text.strip(), use_llm=data.use_llm,
+        use_cache=data.use_cache, refresh_cache=data.refresh_cache, mode=data.mode,
+    )
 
 @router.post("/match-file", response_model=JobMatchResponse)
 async def match_job_file(
     job_description: str = Form(...),
-    resume_file: UploadFile = File(...)
+    resume_file: UploadFile = File(...),
+    use_cache: bool = Form(True),
+    refresh_cache: bool = Form(False),
+    use_llm: bool = Form(True),
+    mode: MatchMode | None = Form(None),
 ):
-    resume_text = read_file_text(resume_file)
-    return await analyze_match_with_ai(job_description.strip(), resume_text.strip())
+    resume_text = await read_file_text_async(resume_file)
+    return await match(
+        job_description.strip(), resume_text.strip(), use_llm=use_llm,
+        use_cache=use_cache, refresh_cache=refresh_cache, mode=mode,
+    )
 
 # Gap analysis is now effectively covered by the detailed match response, 
 # but keeping a stub or redirecting if frontend specifically calls it.
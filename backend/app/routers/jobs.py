@@ -0,0 +1,96 @@
+import os
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import JSONResponse
+
+from ..schemas import JobStatusResponse, JobSubmittedResponse
+from ..utils.extract import extract_document_text_async, iter_document_pages
+from ..utils.ingest import receive_upload
+from ..utils.jobs import job_queue
+from .job import MatchMode, match
+from .resume import analyze_pages
+
+router = APIRouter()
+
+
+# ---------- Job handlers (the same pipelines as the synchronous endpoints) ----------
+
+@job_queue.handler("resume.analyze")
+async def run_resume_analysis(payload):
+    pages = iter_document_pages(payload["kind"], payload["source"], payload["key"])
+    return await analyze_pages(pages, payload["resume_id"])
+
+
+@job_queue.handler("job.match_file")
+async def run_job_match(payload):
+    resume_text = await extract_document_text_async(payload["kind"], payload["source"], payload["key"])
+    result = await match(
+        payload["job_description"], resume_text.strip(), use_llm=payload["use_llm"],
+        use_cache=payload["use_cache"], refresh_cache=payload["refresh_cache"], mode=payload["mode"],
+    )
+    return result.model_dump()
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+async def submit_upload(job_kind: str, file: UploadFile, **params):
+    """Spool the upload (size limit, type sniffing), keep it for the worker and queue the job."""
+    async with receive_upload(file) as upload:
+        source = upload.detach()
+        # Large uploads live in a spool file until the job has run
+        cleanup = (lambda: _remove(source)) if isinstance(source, str) else None
+        payload = {"kind": upload.kind, "source": source, "key": upload.key, **params}
+        try:
+            job_id = await job_queue.submit(job_kind, payload, cleanup)
+        except Exception:
+            if cleanup:
+                cleanup()
+            raise
+    status_url = f"/api/jobs/{job_id}"
+    body = JobSubmittedResponse(job_id=job_id, status="queued", status_url=status_url)
+    return JSONResponse(body.model_dump(), status_code=202, headers={"Location": status_url})
+
+
+@router.post("/resume/analyze", status_code=202, response_model=JobSubmittedResponse)
+async def submit_resume_analysis(file: UploadFile = File(...), resume_id: str | None = Form(None)):
+    """Background version of /api/resume/analyze; poll the returned status_url for the result."""
+    return await submit_upload("resume.analyze", file, resume_id=resume_id)
+
+
+@router.post("/job/match-file", status_code=202, response_model=JobSubmittedResponse)
+async def submit_job_match(
+    job_description: str = Form(...),
+    resume_file: UploadFile = File(...),
+    use_cache: bool = Form(True),
+    refresh_cache: bool = Form(False),
+    use_llm: bool = Form(True),
+    mode: MatchMode | None = Form(None),  # validated here, not when the job runs
+):
+    """Background version of /api/job/match-file."""
+    return await submit_upload(
+        "job.match_file", resume_file, job_description=job_description.strip(),
+        use_llm=use_llm, use_cache=use_cache, refresh_cache=refresh_cache, mode=mode,
+    )
+
+
+@router.get("/stats")
+def job_stats():
+    return job_queue.snapshot()
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def job_status(job_id: str, wait: float = 0):
+    """
+    Status and, once done, the result. wait=N holds the request up to N
+    seconds (max 60) until the job finishes, so clients can long-poll
+    instead of polling in a tight loop.
+    """
+    job = await job_queue.wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
@@ -1,28 +1,117 @@
-from fastapi import APIRouter, UploadFile, File
-from app.utils.utils import extract_text_from_file
-from app.utils.extract import extract_resume_sections
-from app.utils.ats_score import calculate_ats_score
+import asyncio
+
+from fastapi import APIRouter, UploadFile, File, Form
+from app.utils.utils import iter_text_from_file
+from app.utils.extract import SectionSplitter, extract_skills
+from app.utils.ats_score import calculate_section_score, summarize_section_scores
+from app.utils.metrics import registry, span, timed_iter
+from app.utils.section_store import chunk_key, section_store
 
 
 router = APIRouter(prefix="/api/resume", tags=["Resume"])
 
 
 @router.post("/analyze")
-async def analyze_resume(file: UploadFile = File(...)):
-    # 1️⃣ Extract text
-    resume_text = await extract_text_from_file(file)
+async def analyze_resume(file: UploadFile = File(...), resume_id: str | None = Form(None)):
+    """
+    resume_id names a resume lineage: re-uploads with the same id only
+    re-score the sections that changed since the previous upload.
+    """
+    return await analyze_pages(iter_text_from_file(file), resume_id)
 
-    if not resume_text:
-        return {"error": "Could not extract text from resume"}
 
-    # 2️⃣ Extract resume sections
-    sections = extract_resume_sections(resume_text)
+class SectionDiff:
+    """
+    Section results reused from the previous upload of a lineage. Each
+    section is keyed by a hash of its content; only new keys are scored,
+    the rest come from the store.
+    Create with `await SectionDiff.load(...)` under the lineage lock.
+    """
+
+    def __init__(self, resume_id, revision, previous):
+        self.resume_id = resume_id
+        self.revision, self.previous = revision, previous
+        self.chunks = {}     # this upload's sections, in document order
+        self.rescored = 0
+
+    @classmethod
+    async def load(cls, resume_id):
+        return cls(resume_id, *await asyncio.to_thread(section_store.get, resume_id))
+
+    def score(self, name, content):
+        key = chunk_key(name, content)
+        chunk = self.previous.get(key)
+        if chunk is None:
+            chunk = {"section": name, "score": calculate_section_score(name, content)}
+            self.rescored += 1
+        self.chunks[key] = chunk
+        # Copies: the response formatting below appends to the issue lists
+        score, issues, improvements = chunk["score"]
+        return score, list(issues), list(improvements)
+
+    async def save(self):
+        """Store this upload as the lineage's next revision; returns the changes against the previous one."""
+        registry.inc("resume_sections_total", len(self.chunks) - self.rescored, outcome="reused")
+        registry.inc("resume_sections_total", self.rescored, outcome="rescored")
+        while not await asyncio.to_thread(section_store.put, self.resume_id, self.revision, self.chunks):
+            # Another process wrote a revision since we read ours: report
+            # the changes against that one instead
+            self.revision, self.previous = await asyncio.to_thread(section_store.get, self.resume_id, True)
+
+        changed = list(dict.fromkeys(
+            c["section"] for key, c in self.chunks.items() if c["section"] and key not in self.previous))
+        before = {c["section"] for c in self.previous.values() if c["section"]}
+        now = [c["section"] for c in self.chunks.values() if c["section"]]
+        return {
+            "resume_id": self.resume_id,
+            "revision": self.revision + 1,
+            "changed_sections": changed,
+            "added_sections": [name for name in changed if name not in before],
+            "removed_sections": sorted(before - set(now)),
+            "unchanged_sections": [name for name in dict.fromkeys(now) if name not in changed],
+        }
+
+
+async def analyze_pages(page_iter, resume_id: str | None = None):
+    """The analyze pipeline over an async iterator of page texts (upload or background job)."""
+    if not resume_id:
+        return await _analyze_pages(page_iter, None)
+    # Uploads of one lineage run one at a time, each on top of the last revision
+    async with section_store.lineage_lock(resume_id):
+        return await _analyze_pages(page_iter, await SectionDiff.load(resume_id))
+
+
+async def _analyze_pages(page_iter, diff):
+    # 1️⃣ Extract text page by page, 2️⃣ split sections and 3️⃣ score each
+    # section as soon as the next heading closes it
+    pages = []
+    splitter = SectionSplitter()
+    score_section = diff.score if diff else calculate_section_score
+    scored = {}
+    async for page in timed_iter("extract", page_iter):
+        pages.append(page)
+        with span("sections"):
+            closed = list(splitter.feed(page))
+        with span("ats_score"):
+            for name, content in closed:
+                scored[name] = score_section(name, content)
+    with span("sections"):
+        closed = list(splitter.close())
+    with span("ats_score"):
+        for name, content in closed:
+            scored[name] = score_section(name, content)
+
+    resume_text = "\n".join(pages)
+    if not resume_text.strip():
+        return {"error": "Could not extract text from resume"}
 
-    # 3️⃣ Calculate ATS score (section-wise)
-    ats_result = calculate_ats_score(sections)
+    sections = splitter.sections
+    with span("ats_score"):
+        ats_result = summarize_section_scores(scored)
 
-    # 4️⃣ Extract raw content for sidebar context
-    from app.utils.extract import extract_skills
+    # 4️⃣ Extract raw content for sidebar context. Skills always come from
+    # the whole text: phrases can span lines and headings, so per-section
+    # results would not add up to the same list
     raw_skills = extract_skills(resume_text)
     raw_summary = sections.get("summary", "") or sections.get("profile", "") or "No summary detected."
     raw_projects = sections.get("projects", "") or "No projects detected."
@@ -44,7 +133,7 @@ async def analyze_resume(file: UploadFile = File(...)):
             "improvements": improvements
         }
 
-    return {
+    result = {
         "overall_score": ats_result["overall_score"],
         "sections": formatted_sections,
         "extracted_data": {
@@ -53,4 +142,7 @@ async def analyze_resume(file: UploadFile = File(...)):
             "projects": raw_projects.strip()
         }
     }
+    if diff:
+        result["changes"] = await diff.save()
+    return result
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 
 class JobDescriptionRequest(BaseModel):
@@ -17,8 +17,77 @@ class MatchResponse(BaseModel):
     matched_skills: List[str]
     missing_skills: List[str]
     summary: str
+    semantic_score: Optional[int] = None  # local embedding similarity, 0-100
 
 
 class ResumeAnalysis(BaseModel):
     skills: List[str]
     summary: str
+
+
+class BatchMatchRequest(BaseModel):
+    job_text: str
+    resume_texts: List[str]
+    top_k: Optional[int] = None
+    stream: bool = False
+
+
+class BatchMatchResult(BaseModel):
+    index: int
+    name: Optional[str] = None
+    score: float
+    level: str
+    matched_skills: List[str]
+    missing_skills: List[str]
+    summary: str
+
+
+class BatchMatchResponse(BaseModel):
+    job_skills: List[str]
+    count: int
+    results: List[BatchMatchResult]
+
+
+class CorpusResumeRequest(BaseModel):
+    text: str
+    resume_id: Optional[str] = None
+    name: Optional[str] = None
+
+
+class CorpusSearchRequest(BaseModel):
+    job_text: str
+    top_k: int = Field(10, ge=1, le=100)
+    mode: Literal["bm25", "semantic"] = "bm25"  # semantic: embedding similarity
+
+
+class CorpusSearchResult(BaseModel):
+    resume_id: str
+    name: Optional[str] = None
+    score: float
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class CorpusSearchResponse(BaseModel):
+    job_skills: List[str]
+    searched: int
+    results: List[CorpusSearchResult]
+
+
+class JobSubmittedResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+
+class JobStatusResponse(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued | running | done | failed
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    wait_ms: Optional[float] = None
+    run_ms: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
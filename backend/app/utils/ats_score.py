@@ -1,82 +1,200 @@
+import math
 import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from app.utils.metrics import timed
+
+DIGIT_RE = re.compile(r"\d")
+
+
+# ---------- Rule table ----------
+
+@dataclass(frozen=True)
+class Rule:
+    """Award `points` when feature >= threshold, otherwise report issue/improvement."""
+    feature: str
+    threshold: float
+    points: int
+    issue: str
+    improvement: str
+
+
+# Feature extractors, computed once per section and only if its rules use them
+FEATURES = {
+    "words": lambda content: len(content.split()),
+    "items": lambda content: content.count(",") + 1,   # comma-separated entries
+    "has_number": lambda content: 1 if DIGIT_RE.search(content) else 0,
+}
+
+# section -> (points every present section gets, rules)
+SECTION_RULES = {
+    "summary": (20, [
+        Rule("words", 40, 60, "Summary is too short.", "Increase summary length to 3–4 strong lines."),
+        Rule("has_number", 1, 20, "Lack of quantifiable results.", "Add measurable impact (years, %, results)."),
+    ]),
+    "skills": (30, [
+        Rule("items", 8, 70, "Too few skills listed.", "Add more relevant technical skills."),
+    ]),
+    "experience": (10, [
+        Rule("words", 80, 60, "Experience descriptions are brief.", "Explain responsibilities in more detail."),
+        Rule("has_number", 1, 30, "Achievements are not quantified.", "Quantify achievements with numbers."),
+    ]),
+    "education": (100, [
+        Rule("words", 20, 0, "Education details may be incomplete.", "Add degree, institution, and year clearly."),
+    ]),
+    "projects": (30, [
+        Rule("words", 60, 70, "Project descriptions lack depth.", "Describe project impact and technologies used."),
+    ]),
+}
+# Any other section: flat 60 and always flagged as generic
+DEFAULT_RULES = (60, [
+    Rule("words", math.inf, 0, "Section content is generic.", "Expand this section with clearer details."),
+])
+
+MAX_SCORE = 100
+STRENGTH_SCORE = 75
+
+
+class RuleEngine:
+    """
+    The rule table compiled into arrays: one row per section type, one
+    column per rule slot. Scoring n sections is a feature matrix lookup,
+    a comparison and a sum, all in NumPy.
+    """
+
+    def __init__(self, section_rules=SECTION_RULES, default_rules=DEFAULT_RULES):
+        self.section_index = {name: i for i, name in enumerate(section_rules)}
+        self.default_index = len(section_rules)
+        table = list(section_rules.values()) + [default_rules]
+
+        used = sorted({rule.feature for _, rules in table for rule in rules})
+        self.features = [(name, FEATURES[name]) for name in used]
+        feature_col = {name: i for i, name in enumerate(used)}
+
+        width = max(len(rules) for _, rules in table)
+        shape = (len(table), width)
+        self.base = np.array([base for base, _ in table], dtype=np.int64)
+        self.feature = np.zeros(shape, dtype=np.intp)
+        self.threshold = np.full(shape, -np.inf)          # empty slots always pass
+        self.points = np.zeros(shape, dtype=np.int64)
+        self.rules = [rules for _, rules in table]
+        self.uses = np.zeros((len(table), len(used)), dtype=bool)
+        for row, (_, rules) in enumerate(table):
+            for col, rule in enumerate(rules):
+                self.feature[row, col] = feature_col[rule.feature]
+                self.threshold[row, col] = rule.threshold
+                self.points[row, col] = rule.points
+                self.uses[row, feature_col[rule.feature]] = rule.threshold != math.inf
+
+    def feature_matrix(self, contents, rows):
+        """One column per feature; a value is only computed where the section's rules use it."""
+        values = np.zeros((len(contents), len(self.features)), dtype=np.float64)
+        needed = self.uses[rows]
+        for col, (_, extract) in enumerate(self.features):
+            idx = np.flatnonzero(needed[:, col])
+            values[idx, col] = [extract(contents[i]) for i in idx.tolist()]
+        return values
+
+    def score_one(self, section, content):
+        """Single section, no arrays: only the features its rules use are computed."""
+        row = self.section_index.get(section, self.default_index)
+        values = {}
+        score = int(self.base[row])
+        failed = 0
+        for bit, rule in enumerate(self.rules[row]):
+            if rule.threshold != math.inf and rule.feature not in values:
+                values[rule.feature] = FEATURES[rule.feature](content)
+            if values.get(rule.feature, 0) >= rule.threshold:
+                score += rule.points
+            else:
+                failed |= 1 << bit
+        return min(score, MAX_SCORE), row, failed
+
+    def score(self, names, contents):
+        """
+        Scores and failed-rule codes for parallel lists of section names and
+        contents: failed[i] is a bitmask over the rules of row rows[i].
+        """
+        rows = np.array([self.section_index.get(n, self.default_index) for n in names], dtype=np.intp)
+        values = self.feature_matrix(contents, rows)
+        per_rule = np.take_along_axis(values, self.feature[rows], axis=1)
+        passed = per_rule >= self.threshold[rows]
+        scores = self.base[rows] + (passed * self.points[rows]).sum(axis=1)
+        failed = (~passed) @ (1 << np.arange(passed.shape[1]))
+        return np.minimum(scores, MAX_SCORE), failed, rows
+
+    @lru_cache(maxsize=None)
+    def findings(self, row, failed):
+        """(issues, improvements) for a row's failed-rule bitmask; a handful of combinations."""
+        rules = [rule for bit, rule in enumerate(self.rules[row]) if failed >> bit & 1]
+        return tuple(r.issue for r in rules), tuple(r.improvement for r in rules)
+
+
+ENGINE = RuleEngine()
 
-def word_count(text):
-    return len(text.split())
-
-def has_numbers(text):
-    return bool(re.search(r"\d", text))
 
 def calculate_section_score(section, content):
-    score = 0
-    issues = []
-    improvements = []
-
-    wc = word_count(content)
-
-    if section == "summary":
-        if wc >= 40:
-            score += 60
-        else:
-            issues.append("Summary is too short.")
-            improvements.append("Increase summary length to 3–4 strong lines.")
-
-        if has_numbers(content):
-            score += 20
-        else:
-            issues.append("Lack of quantifiable results.")
-            improvements.append("Add measurable impact (years, %, results).")
-
-        score += 20  # basic presence bonus
-
-    elif section == "skills":
-        skill_count = len(content.split(","))
-        if skill_count >= 8:
-            score += 70
-        else:
-            issues.append("Too few skills listed.")
-            improvements.append("Add more relevant technical skills.")
-
-        score += 30
-
-    elif section == "experience":
-        if wc >= 80:
-            score += 60
-        else:
-            issues.append("Experience descriptions are brief.")
-            improvements.append("Explain responsibilities in more detail.")
-
-        if has_numbers(content):
-            score += 30
-        else:
-            issues.append("Achievements are not quantified.")
-            improvements.append("Quantify achievements with numbers.")
-
-        score += 10
-
-    elif section == "education":
-        score += 80
-        if wc < 20:
-            issues.append("Education details may be incomplete.")
-            improvements.append("Add degree, institution, and year clearly.")
-        score += 20
-
-    elif section == "projects":
-        if wc >= 60:
-            score += 70
-        else:
-            issues.append("Project descriptions lack depth.")
-            improvements.append("Describe project impact and technologies used.")
-
-        score += 30
-
-    else:
-        score = 60
-        issues.append("Section content is generic.")
-        improvements.append("Expand this section with clearer details.")
-
-    return min(score, 100), issues, improvements
+    score, row, failed = ENGINE.score_one(section, content)
+    issues, improvements = ENGINE.findings(row, failed)
+    return score, list(issues), list(improvements)
 
+@timed("ats_score")
 def calculate_ats_score(sections: dict):
+    scored = {
+        section: calculate_section_score(section, content)
+        for section, content in sections.items()
+    }
+    return summarize_section_scores(scored)
+
+@timed("ats_score")
+def score_resumes(resumes: list):
+    """
+    ATS results for many resumes ({section: content} dicts) with every
+    section of every resume scored in one vectorized pass.
+    """
+    names, contents, counts = [], [], []
+    for sections in resumes:
+        names += sections.keys()
+        contents += sections.values()
+        counts.append(len(sections))
+
+    scores, failed, rows = ENGINE.score(names, contents)
+    owners = np.repeat(np.arange(len(resumes)), counts)
+    totals = np.bincount(owners, weights=scores, minlength=len(resumes))
+    overall = np.round(totals / np.maximum(counts, 1)).astype(int).tolist()
+    scores, failed, rows = scores.tolist(), failed.tolist(), rows.tolist()
+
+    results = []
+    k = 0
+    for i, count in enumerate(counts):
+        section_scores, strengths, gaps, issues_map = {}, [], {}, {}
+        for name, score, row, mask in zip(names[k:k + count], scores[k:k + count],
+                                          rows[k:k + count], failed[k:k + count]):
+            section_scores[name] = score
+            if score >= STRENGTH_SCORE:
+                strengths.append(name.capitalize())
+            if mask:
+                issues, improvements = ENGINE.findings(row, mask)
+                gaps[name] = list(improvements)
+                issues_map[name] = list(issues)
+        k += count
+        results.append({
+            "overall_score": overall[i],
+            "section_scores": section_scores,
+            "strengths": strengths,
+            "gaps": gaps,
+            "issues": issues_map,
+        })
+    return results
+
+def summarize_section_scores(scored: dict):
+    """
+    Aggregate per-section (score, issues, improvements) results. Lets callers
+    score sections one at a time (e.g. while the PDF is still being parsed).
+    """
     section_scores = {}
     strengths = []
     gaps = {}   # improvements
@@ -85,13 +203,12 @@ def calculate_ats_score(sections: dict):
     total = 0
     count = 0
 
-    for section, content in sections.items():
-        score, issues, improvements = calculate_section_score(section, content)
+    for section, (score, issues, improvements) in scored.items():
         section_scores[section] = score
         total += score
         count += 1
 
-        if score >= 75:
+        if score >= STRENGTH_SCORE:
             strengths.append(section.capitalize())
         if improvements:
             gaps[section] = improvements
@@ -0,0 +1,79 @@
+# app/utils/embeddings.py
+
+import os
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from .extract import extract_skills
+from .skills import STOPWORDS, tokenize
+
+# Hashed feature embeddings: CPU-only, no model download, deterministic
+# across processes (crc32, not Python's salted hash()).
+EMBED_DIM = int(os.getenv("EMBED_DIM", "512"))
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "1024"))
+# Cosine similarity treated as a perfect semantic match (100) when scaling
+SEMANTIC_FULL_MATCH = float(os.getenv("SEMANTIC_FULL_MATCH", "0.4"))
+
+# Feature weights: canonical skills carry most of the meaning, word pairs
+# capture phrases ("machine learning"), character 4-grams tie together
+# inflections ("developed" / "developer" / "development").
+SKILL_WEIGHT = 3.0
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+CHARGRAM_WEIGHT = 0.25
+
+@lru_cache(maxsize=65536)
+def _slot(feature: str):
+    """(dimension, sign) for a feature; the sign bit keeps collisions unbiased."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % EMBED_DIM, 1.0 if h & 0x80000000 else -1.0
+
+
+def features(text: str, skills=None) -> dict:
+    words = [tok for tok, _, _ in tokenize(text) if len(tok) > 1 and tok not in STOPWORDS]
+    feats = {}
+
+    def bump(feature, weight):
+        feats[feature] = feats.get(feature, 0.0) + weight
+
+    for i, word in enumerate(words):
+        bump("w:" + word, WORD_WEIGHT)
+        if i:
+            bump(f"b:{words[i - 1]} {word}", BIGRAM_WEIGHT)
+        if len(word) > 4:
+            for j in range(len(word) - 3):
+                bump("c:" + word[j:j + 4], CHARGRAM_WEIGHT)
+    for skill in (skills if skills is not None else extract_skills(text)):
+        feats["s:" + skill] = SKILL_WEIGHT
+    return feats
+
+
+def embed(text: str, skills=None) -> np.ndarray:
+    """L2-normalised float32 vector of sublinear-tf hashed features."""
+    vec = np.zeros(EMBED_DIM, dtype=np.float32)
+    for feature, weight in features(text, skills).items():
+        dim, sign = _slot(feature)
+        vec[dim] += sign * (1.0 + np.log(weight) if weight > 1 else weight)
+    norm = np.linalg.norm(vec)
+    if norm:
+        vec /= norm
+    return vec
+
+
+@lru_cache(maxsize=EMBED_CACHE_SIZE)
+def cached_embedding(text: str) -> np.ndarray:
+    vec = embed(text)
+    vec.flags.writeable = False
+    return vec
+
+
+def similarity(a: str, b: str) -> float:
+    return float(cached_embedding(a) @ cached_embedding(b))
+
+
+def semantic_score(resume_text: str, job_text: str) -> int:
+    """Local semantic match score (0–100) from embedding cosine similarity."""
+    cos = similarity(resume_text, job_text)
+    return int(round(min(max(cos, 0.0) / SEMANTIC_FULL_MATCH, 1.0) * 100))
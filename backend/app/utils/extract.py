@@ -1,77 +1,186 @@
+import asyncio
+import os
 import re
-from fastapi import UploadFile, HTTPException
-import pdfplumber
-from docx import Document
-from app.utils.resume_sections import normalize_section_name
-
-
-SECTION_KEYWORDS = {
-    "summary": [
-        "summary", "professional summary", "career objective",
-        "objective", "profile", "about me", "professional statement"
-    ],
-    "skills": [
-        "skills", "technical skills", "key skills", "expertise"
-    ],
-    "experience": [
-        "experience", "work experience", "employment",
-        "professional experience"
-    ],
-    "projects": [
-        "projects", "academic projects", "personal projects"
-    ],
-    "education": [
-        "education", "qualification", "qualifications",
-        "academic background"
-    ],
-    "certifications": [
-        "certifications", "courses", "training"
-    ],
-    "achievements": [
-        "achievements", "awards", "accomplishments"
-    ]
-}
+from io import BytesIO
+from fastapi import UploadFile
+from app.utils.resume_sections import SectionSegmenter, section_text, segment_sections
+from app.utils.skills import get_skill_matcher
+from app.utils.text_cache import text_cache
+from app.utils.parse_pool import parse_executor
+from app.utils.ingest import receive_upload, receive_upload_sync
+from app.utils.text_formats import decode_text, doc_to_text, html_to_text, rtf_to_text
+from app.utils.metrics import timed
+
+# Pages per parallel parse task when streaming long PDFs
+PAGES_PER_CHUNK = 4
 
 
+@timed("skills")
 def extract_skills(text: str):
-    text = text.lower()
+    # Single pass over the text with the taxonomy trie (see utils/skills.py)
+    return get_skill_matcher().extract(text)
+
+# Extension → kind; only used to pick files (e.g. bulk scoring). Uploads are sniffed.
+EXTENSION_KINDS = {
+    ".pdf": "pdf", ".docx": "docx", ".doc": "doc", ".rtf": "rtf",
+    ".txt": "txt", ".text": "txt", ".md": "txt", ".html": "html", ".htm": "html",
+}
 
-    skills = [
-        "python", "java", "javascript", "react", "node", "express", "fastapi",
-        "django", "flask", "html", "css", "sql", "mongodb", "docker", "aws",
-        "machine learning", "deep learning", "tensorflow", "pytorch", "api"
-    ]
+def document_kind(filename: str):
+    return EXTENSION_KINDS.get(os.path.splitext((filename or "").lower())[1])
 
-    found = [s for s in skills if s in text]
-    return found
+def _open_source(source):
+    """Parsers take upload bytes or a path to a spooled upload."""
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
 
-def read_file_text(file: UploadFile) -> str:
-    if file.filename.endswith(".pdf"):
-        with pdfplumber.open(file.file) as pdf:
-            pages_text = [p.extract_text() or "" for p in pdf.pages]
+def _read_source(source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+# pdfplumber and python-docx are imported where they are used: together they
+# take longer to import than the rest of the app, and most processes
+# (API workers before their first upload, bulk-score parents) never need them.
+def warm_parsers():
+    import pdfplumber  # noqa: F401
+    import docx  # noqa: F401
+
+def parse_document(kind: str, source, max_pages: int | None = None) -> str:
+    if kind == "pdf":
+        import pdfplumber
+        with pdfplumber.open(_open_source(source)) as pdf:
+            pages_text = [p.extract_text() or "" for p in pdf.pages[:max_pages]]
         return "\n".join(pages_text)
-    elif file.filename.endswith(".docx"):
-        doc = Document(file.file)
+    if kind == "docx":
+        from docx import Document
+        doc = Document(_open_source(source))
         return "\n".join([p.text for p in doc.paragraphs])
-    else:
-        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported.")
+    if kind == "doc":
+        return doc_to_text(source)
+    if kind == "rtf":
+        return rtf_to_text(_read_source(source))
+    if kind == "html":
+        return html_to_text(_read_source(source))
+    return decode_text(_read_source(source))
 
-def extract_resume_sections(resume_text: str):
-    sections = {}
-    current_section = None
+def parse_pdf_pages(source, start: int, stop: int):
+    """Text of pages [start, stop) plus the document's total page count."""
+    import pdfplumber
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return len(pdf.pages), [p.extract_text() or "" for p in pdf.pages[start:stop]]
+
+async def iter_document_pages(kind: str, source, key: str | None = None):
+    """
+    Yield the document text page by page as soon as each page is parsed.
+    Long PDFs are split into PAGES_PER_CHUNK chunks parsed in parallel by the
+    parse executor; the assembled text is cached once the last page is in.
+    key is the text-cache key (sha256 of the bytes) when source is a path.
+    """
+    key = key or text_cache.key_for(source)
+    text = await text_cache.aget(key)
+    if text is not None:
+        yield text
+        return
+
+    if kind != "pdf":
+        text = await parse_executor.run(parse_document, kind, source, parse_executor.max_pages)
+        await text_cache.aput(key, text)
+        yield text
+        return
+
+    max_pages = parse_executor.max_pages
+    first_stop = min(PAGES_PER_CHUNK, max_pages)
+    total, pages = await parse_executor.run(parse_pdf_pages, source, 0, first_stop)
+    for page in pages:
+        yield page
+
+    total = min(total, max_pages)
+    chunks = [(source, i, min(i + PAGES_PER_CHUNK, total)) for i in range(first_stop, total, PAGES_PER_CHUNK)]
+    async for _, chunk_pages in parse_executor.run_ordered(parse_pdf_pages, chunks):
+        pages.extend(chunk_pages)
+        for page in chunk_pages:
+            yield page
 
-    for line in resume_text.splitlines():
-        line_clean = line.strip()
+    await text_cache.aput(key, "\n".join(pages))
 
-        if not line_clean:
-            continue
+@timed("extract")
+def extract_document_text(kind: str, source, key: str | None = None) -> str:
+    """Single extraction path for all uploads; re-uploads of the same bytes skip parsing."""
+    key = key or text_cache.key_for(source)
+    text = text_cache.get(key)
+    if text is None:
+        text = parse_document(kind, source, parse_executor.max_pages)
+        text_cache.put(key, text)
+    return text
 
-        normalized = normalize_section_name(line_clean)
+@timed("extract")
+async def extract_document_text_async(kind: str, source, key: str | None = None) -> str:
+    """Same as extract_document_text, but cache misses are parsed in the parse executor."""
+    key = key or text_cache.key_for(source)
+    text = await text_cache.aget(key)
+    if text is None:
+        text = await parse_executor.run(parse_document, kind, source, parse_executor.max_pages)
+        await text_cache.aput(key, text)
+    return text
 
-        if normalized:
-            current_section = normalized
-            sections[current_section] = ""
-        elif current_section:
-            sections[current_section] += line_clean + " "
+def read_file_text(file: UploadFile) -> str:
+    with receive_upload_sync(file) as upload:
+        return extract_document_text(upload.kind, upload.source, upload.key)
+
+async def read_file_text_async(file: UploadFile) -> str:
+    """read_file_text for async handlers: parsing never blocks the event loop."""
+    async with receive_upload(file) as upload:
+        return await extract_document_text_async(upload.kind, upload.source, upload.key)
+
+async def read_files_text_async(files: list[UploadFile]) -> list[str]:
+    """read_file_text_async over many files, in parallel but using at most one parse slot per worker."""
+    limit = asyncio.Semaphore(max(1, parse_executor.workers))
+
+    async def read(file):
+        async with limit:
+            return await read_file_text_async(file)
+
+    return await asyncio.gather(*(read(f) for f in files))
+
+class SectionSplitter:
+    """
+    segment_sections fed page by page: each section comes back as soon as
+    the next heading closes it, with the same content as section_text on
+    the joined pages.
+    """
 
-    return sections
+    def __init__(self):
+        self.sections = {}
+        self.current = None
+        self._segmenter = SectionSegmenter()
+        self._lines = []
+
+    def feed(self, text: str):
+        """Consume text; yields (section, content) for every section it closes."""
+        for section, start, end in self._segmenter.scan(text):
+            if start is None:
+                if self.current:
+                    yield self.current, self._close(self.current)
+                self.current = section
+                self.sections[section] = ""
+                self._lines = []
+            elif section:
+                self._lines.append(text[start:end])
+
+    def _close(self, name):
+        content = "".join(line + " " for line in self._lines)
+        self.sections[name] = content
+        return content
+
+    def close(self):
+        """End of document: yields the last open section, if any."""
+        if self.current:
+            yield self.current, self._close(self.current)
+            self.current = None
+
+
+@timed("sections")
+def extract_resume_sections(resume_text: str):
+    spans = segment_sections(resume_text)
+    return {name: section_text(resume_text, s) for name, s in spans.items()}
@@ -0,0 +1,225 @@
+# app/utils/ingest.py
+
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from contextlib import asynccontextmanager, contextmanager
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+# Uploads larger than this are rejected with 413 while they are being read
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "5")) * 1024 * 1024)
+# Smaller uploads stay in memory; larger ones are spooled to a temp file
+SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_KB", "1024")) * 1024
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None
+CHUNK_BYTES = 64 * 1024
+# Whole multipart request: one file plus its form fields (job description, ...)
+MAX_REQUEST_BYTES = MAX_UPLOAD_BYTES + int(os.getenv("MAX_FORM_FIELDS_KB", "256")) * 1024
+# Multi-file endpoints (batch matching)
+MAX_BATCH_REQUEST_BYTES = int(float(os.getenv("MAX_BATCH_UPLOAD_MB", "50")) * 1024 * 1024)
+
+SUPPORTED = "PDF, DOCX, DOC, RTF, HTML, TXT"
+
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"   # legacy Office (.doc)
+ZIP_MAGIC = b"PK\x03\x04"                          # .docx (and other zips)
+HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+
+
+def too_large(limit, what="File"):
+    return HTTPException(status_code=413, detail=f"{what} is too large (limit {limit / (1024 * 1024):g} MB).")
+
+
+def looks_like_text(head: bytes) -> bool:
+    if head.startswith((b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")):
+        return True
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is fine
+        if e.start < len(head) - 3:
+            sample = head.decode("latin-1")
+            printable = sum(ch.isprintable() or ch in "\r\n\t" for ch in sample)
+            return printable / max(len(sample), 1) > 0.95
+    return True
+
+
+def sniff_kind(head: bytes, filename: str = "", open_zip=None):
+    """
+    Real document type from the leading bytes; the file name only breaks
+    ties. open_zip() returns a file object for checking a zip's contents.
+    """
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        if open_zip is not None:
+            try:
+                with zipfile.ZipFile(open_zip()) as zf:
+                    return "docx" if "word/document.xml" in zf.namelist() else None
+            except zipfile.BadZipFile:
+                return None
+        return "docx" if (filename or "").lower().endswith(".docx") else None
+    if head.startswith(OLE2_MAGIC):
+        return "doc"
+    if head.lstrip().startswith(b"{\\rtf"):
+        return "rtf"
+    if looks_like_text(head):
+        lowered = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+        if lowered.startswith(HTML_MARKERS) or any(m in lowered for m in HTML_MARKERS[1:]):
+            return "html"
+        return "txt"
+    return None
+
+
+class Spool:
+    """
+    Receives an upload chunk by chunk: enforces the size limit, hashes the
+    bytes for the text cache and keeps them in memory up to SPOOL_BYTES,
+    then in a named temp file (so parse workers can open it by path).
+    """
+
+    def __init__(self, filename: str, limit=MAX_UPLOAD_BYTES):
+        self.filename = filename or ""
+        self.limit = limit
+        self.size = 0
+        self.kind = None
+        self.key = None
+        self._hash = hashlib.sha256()
+        self._buffer = io.BytesIO()
+        self._file = None
+        self._detached = False
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.limit:
+            raise too_large(self.limit)
+        self._hash.update(chunk)
+        if self._file is None and self.size > SPOOL_BYTES:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload-", dir=UPLOAD_TMP_DIR, delete=False)
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+        (self._file or self._buffer).write(chunk)
+
+    def finish(self):
+        self.key = self._hash.hexdigest()
+        if self._file is not None:
+            self._file.flush()
+        head = self.head()
+        self.kind = sniff_kind(head, self.filename, self._open)
+        if self.kind is None:
+            raise HTTPException(status_code=415, detail=f"Unsupported file type. Supported: {SUPPORTED}.")
+        return self
+
+    def head(self, n=2048) -> bytes:
+        if self._file is None:
+            return self._buffer.getvalue()[:n]
+        with open(self._file.name, "rb") as f:
+            return f.read(n)
+
+    def _open(self):
+        return open(self._file.name, "rb") if self._file is not None else io.BytesIO(self._buffer.getvalue())
+
+    @property
+    def source(self):
+        """What the parsers take: the bytes of small uploads, or the spool file's path."""
+        return self._file.name if self._file is not None else self._buffer.getvalue()
+
+    def detach(self):
+        """
+        Keep the upload beyond the request (background jobs): returns
+        source, and a spool file is no longer deleted on close — the
+        caller removes it when done.
+        """
+        self._detached = True
+        return self.source
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            if not self._detached:
+                try:
+                    os.unlink(self._file.name)
+                except OSError:
+                    pass
+            self._file = None
+        self._buffer = None
+
+
+def _check_declared_size(file: UploadFile, limit):
+    # Starlette knows the size once the multipart body is in; fail before reading it
+    size = getattr(file, "size", None)
+    if size is not None and size > limit:
+        raise too_large(limit)
+
+
+@asynccontextmanager
+async def receive_upload(file: UploadFile, limit=MAX_UPLOAD_BYTES):
+    """Spool an upload with the size limit and format sniffing; cleans up on exit."""
+    _check_declared_size(file, limit)
+    spool = Spool(file.filename, limit)
+    try:
+        while chunk := await file.read(CHUNK_BYTES):
+            spool.write(chunk)
+        yield spool.finish()
+    finally:
+        spool.close()
+
+
+@contextmanager
+def receive_upload_sync(file: UploadFile, limit=MAX_UPLOAD_BYTES):
+    """receive_upload for sync handlers (reads file.file directly)."""
+    _check_declared_size(file, limit)
+    spool = Spool(file.filename, limit)
+    try:
+        while chunk := file.file.read(CHUNK_BYTES):
+            spool.write(chunk)
+        yield spool.finish()
+    finally:
+        spool.close()
+
+
+class UploadLimitMiddleware:
+    """
+    Caps multipart request bodies before Starlette's form parser receives
+    and spools them: a Content-Length over the limit is answered with 413
+    straight away, and a body that streams past it (chunked, or a lying
+    header) is cut off with 413. route_limits overrides the limit per path.
+    """
+
+    def __init__(self, app, limit=MAX_REQUEST_BYTES, route_limits=None):
+        self.app = app
+        self.limit = limit
+        self.route_limits = route_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/"):
+            return await self.app(scope, receive, send)
+
+        limit = self.route_limits.get(scope["path"].rstrip("/"), self.limit)
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            error = too_large(limit, "Upload")
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Re-raised by FastAPI's body parsing, rendered as a 413
+                    raise too_large(limit, "Upload")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
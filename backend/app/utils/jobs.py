@@ -0,0 +1,246 @@
+# app/utils/jobs.py
+
+import asyncio
+import contextvars
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+
+from app.utils.metrics import record, registry
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Submissions beyond this many waiting jobs are rejected with 503
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "64"))
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "300"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL_HOURS", "24")) * 3600
+# Upper bound for GET /api/jobs/{id}?wait=...
+MAX_WAIT_SECONDS = 60
+
+FINISHED = ("done", "failed")
+
+
+class JobStore:
+    """SQLite result store: one row per job, results kept JOB_RESULT_TTL after they finish."""
+
+    def __init__(self, db_path, ttl=JOB_RESULT_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        started_at REAL,
+                        finished_at REAL,
+                        result TEXT,
+                        error TEXT
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs(finished_at)")
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id, kind):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, created_at) VALUES (?, ?, 'queued', ?)",
+                (job_id, kind, time.time()),
+            )
+
+    def mark_running(self, job_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                (status, time.time(), json.dumps(result) if result is not None else None, error, job_id),
+            )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        started, finished = job["started_at"], job["finished_at"]
+        job["wait_ms"] = round((started - job["created_at"]) * 1000, 1) if started else None
+        job["run_ms"] = round((finished - started) * 1000, 1) if started and finished else None
+        return job
+
+    def fail_unfinished(self, reason):
+        """Jobs queued or running when the server stopped can't be resumed (their uploads are gone)."""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE status IN ('queued', 'running')",
+                (time.time(), reason),
+            ).rowcount
+
+    def prune(self):
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM jobs WHERE finished_at < ?", (time.time() - self.ttl,)).rowcount
+
+
+class JobQueue:
+    """
+    Background jobs for analyses that can outlive an HTTP timeout.
+
+    submit() stores the job and returns its id at once; JOB_WORKERS asyncio
+    tasks run the registered handlers (heavy parsing still goes through the
+    parse executor, LLM calls through the gateway) and write the result to
+    the store. A full queue rejects new jobs with 503 + Retry-After.
+    Store reads and writes run in asyncio.to_thread, off the event loop.
+    """
+
+    def __init__(self, store, workers=JOB_WORKERS, max_queued=JOB_QUEUE_SIZE, timeout=JOB_TIMEOUT):
+        self.store = store
+        self.workers = workers
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.handlers = {}
+        self.running = 0
+        self._queue = None
+        self._loop = None
+        self._tasks = []
+        self._waiters = {}
+
+    def handler(self, kind):
+        """Register an async fn(payload) -> JSON-able result for a job kind."""
+        def decorate(fn):
+            self.handlers[kind] = fn
+            return fn
+        return decorate
+
+    def start(self):
+        """Start the workers on the running loop; unfinished jobs from a previous run are failed."""
+        interrupted = self.store.fail_unfinished("Interrupted by a server restart; please resubmit.")
+        if interrupted:
+            print(f"Marked {interrupted} interrupted job(s) as failed")
+        self.store.prune()
+        self._ensure_started()
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._loop is loop:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._loop = loop
+        self._waiters = {}
+        # Fresh context: workers must not inherit the submitting request's spans
+        self._tasks = [
+            contextvars.Context().run(loop.create_task, self._worker())
+            for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, _, cleanup, _ = self._queue.get_nowait()
+                if cleanup:
+                    cleanup()
+        self._queue = None
+
+    def _reject(self, kind):
+        registry.inc("jobs_rejected_total", kind=kind)
+        return HTTPException(status_code=503, detail="Too many queued jobs, please retry shortly.",
+                             headers={"Retry-After": "5"})
+
+    async def submit(self, kind, payload, cleanup=None) -> str:
+        """Queue a job; cleanup() runs once it has finished (e.g. removing a spooled upload)."""
+        if kind not in self.handlers:
+            raise ValueError(f"unknown job kind {kind!r}")
+        self._ensure_started()
+        if self._queue.full():
+            raise self._reject(kind)
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.create, job_id, kind)
+        if self._queue.full():
+            # Filled up by other submissions while the row was being written
+            await asyncio.to_thread(self.store.finish, job_id, "failed", None, "Queue full.")
+            raise self._reject(kind)
+        self._queue.put_nowait((job_id, kind, payload, cleanup, time.perf_counter()))
+        registry.inc("jobs_submitted_total", kind=kind)
+        return job_id
+
+    async def _worker(self):
+        while True:
+            job_id, kind, payload, cleanup, queued_at = await self._queue.get()
+            record("job.wait", time.perf_counter() - queued_at)
+            await asyncio.to_thread(self.store.mark_running, job_id)
+            self.running += 1
+            start = time.perf_counter()
+            status, result, error = "done", None, None
+            try:
+                result = await asyncio.wait_for(self.handlers[kind](payload), self.timeout)
+            except asyncio.TimeoutError:
+                status, error = "failed", f"Job took longer than {self.timeout:g}s."
+            except HTTPException as e:
+                status, error = "failed", e.detail
+            except Exception as e:
+                print(f"Job {kind} error:", repr(e))
+                status, error = "failed", "Analysis failed."
+            finally:
+                self.running -= 1
+                if cleanup:
+                    cleanup()
+            record("job.run", time.perf_counter() - start)
+            registry.inc("jobs_total", kind=kind, status=status)
+            await asyncio.to_thread(self.store.finish, job_id, status, result, error)
+            event = self._waiters.pop(job_id, None)
+            if event is not None:
+                event.set()
+
+    async def wait(self, job_id, timeout):
+        """The job once it has finished, or as it stands after `timeout` seconds (long polling)."""
+        if timeout <= 0 or self._queue is None:
+            return await asyncio.to_thread(self.store.get, job_id)
+        # Registered before reading, so a job finishing meanwhile still sets it
+        event = self._waiters.setdefault(job_id, asyncio.Event())
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] in FINISHED:
+            # Release anyone sharing the event in case the worker popped nothing
+            event = self._waiters.pop(job_id, None)
+            if event is not None:
+                event.set()
+            return job
+        try:
+            await asyncio.wait_for(event.wait(), min(timeout, MAX_WAIT_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def snapshot(self):
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+        }
+
+
+job_queue = JobQueue(JobStore(JOBS_DB_PATH))
@@ -1,7 +1,72 @@
-def compute_match(jd_skills, resume_skills):
-    matched = [s for s in jd_skills if s.lower() in resume_skills]
-    missing = [s for s in jd_skills if s.lower() not in resume_skills]
+import numpy as np
 
-    score = round((len(matched) / len(jd_skills)) * 10, 1) if jd_skills else 0
+from .extract import extract_skills
 
-    return score, matched, missing
\ No newline at end of file
+
+def match_level(score):
+    return ("Strong Match" if score >= 8 else
+            "Good Match" if score >= 6 else
+            "Average Match" if score >= 4 else "Weak Match")
+
+
+def skill_matrix(jd_skills, resume_skill_lists):
+    """
+    One row per resume, one column per JD skill: True where the resume has it.
+    Resume skills outside the JD are irrelevant to the score and are dropped.
+    """
+    column = {s: i for i, s in enumerate(jd_skills)}
+    matrix = np.zeros((len(resume_skill_lists), len(jd_skills)), dtype=bool)
+    for row, skills in enumerate(resume_skill_lists):
+        cols = [column[s] for s in skills if s in column]
+        matrix[row, cols] = True
+    return matrix
+
+
+def score_matrix(matrix):
+    """Scores (0–10, one decimal) for every row of a skill matrix in one pass."""
+    if matrix.shape[1] == 0:
+        return np.zeros(matrix.shape[0])
+    return np.round(matrix.sum(axis=1) / matrix.shape[1] * 10, 1)
+
+
+def match_summary(score, matched, missing):
+    total = len(matched) + len(missing)
+    if not total:
+        return "No recognizable skills found in the job description."
+    summary = f"Matched {len(matched)} of {total} required skills ({match_level(score)})."
+    if missing:
+        summary += " Missing: " + ", ".join(missing) + "."
+    return summary
+
+
+def compute_batch(job_text, resume_texts):
+    """
+    Score many resumes against one job description.
+    JD skills are extracted once; returns (jd_skills, results) where results
+    are ranked best-first and keep the resume's original index.
+    """
+    jd_skills = extract_skills(job_text)
+    matrix = skill_matrix(jd_skills, [extract_skills(t) for t in resume_texts])
+    scores = score_matrix(matrix)
+
+    results = []
+    for idx in np.argsort(-scores, kind="stable"):
+        row = matrix[idx]
+        matched = [s for s, hit in zip(jd_skills, row) if hit]
+        missing = [s for s, hit in zip(jd_skills, row) if not hit]
+        score = float(scores[idx])
+        results.append({
+            "index": int(idx),
+            "score": score,
+            "level": match_level(score),
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "summary": match_summary(score, matched, missing),
+        })
+    return jd_skills, results
+
+
+def compute_match(resume_text, job_text):
+    _, results = compute_batch(job_text, [resume_text])
+    r = results[0]
+    return r["score"], r["matched_skills"], r["missing_skills"], r["summary"]
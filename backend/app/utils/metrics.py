@@ -0,0 +1,294 @@
+# app/utils/metrics.py
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+# METRICS_ENABLED=0 turns every timer into a no-op (decorators return the
+# undecorated function, spans a shared nullcontext)
+ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+# Clients may ask for a Server-Timing header with "X-Server-Timing: 1"
+SERVER_TIMING_ALLOWED = os.getenv("SERVER_TIMING_ALLOWED", "1") != "0"
+
+# Seconds; covers cache hits (sub-ms) up to slow LLM calls
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_NOOP = nullcontext()
+# Per-request span list, only set when the request asked for Server-Timing
+_request_spans = ContextVar("request_spans", default=None)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Histograms and counters keyed by (metric name, sorted label pairs)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.collectors = []   # callables returning [(name, type, labels, value)]
+
+    def histogram(self, name, **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            return hist
+
+    def observe(self, name, value, **labels):
+        hist = self.histogram(name, **labels)
+        with self._lock:
+            hist.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def register_collector(self, fn):
+        self.collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        typed = set()
+
+        def type_line(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            histograms = sorted(
+                (key, list(h.counts), h.sum, h.count) for key, h in self.histograms.items()
+            )
+            counters = sorted(self.counters.items())
+
+        for (name, labels), counts, total, count in histograms:
+            type_line(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(list(BUCKETS) + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        for (name, labels), value in counters:
+            type_line(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+
+        for collect in self.collectors:
+            try:
+                samples = collect()
+            except Exception as e:
+                print("metrics collector error:", repr(e))
+                continue
+            for name, kind, labels, value in samples:
+                if value is None:
+                    continue
+                type_line(name, kind)
+                lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs, **extra):
+    items = list(pairs) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+registry = Registry()
+# stage → its app_stage_duration_seconds histogram, so hot paths skip the label lookup
+_stage_histograms = {}
+
+
+def record(stage, seconds):
+    hist = _stage_histograms.get(stage)
+    if hist is None:
+        hist = _stage_histograms[stage] = registry.histogram("app_stage_duration_seconds", stage=stage)
+    with registry._lock:
+        hist.observe(seconds)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((stage, seconds))
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.start)
+
+
+def span(stage):
+    """with span("sections"): ... — times the block into the stage histogram."""
+    return _Span(stage) if ENABLED else _NOOP
+
+
+def timed(stage):
+    """Decorator form of span for sync and async functions."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(stage, time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+async def timed_iter(stage, aiterable):
+    """Re-yield an async iterable, timing each wait for the next item (not the consumer)."""
+    if not ENABLED:
+        async for item in aiterable:
+            yield item
+        return
+    iterator = aiterable.__aiter__()
+    waited = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                waited += time.perf_counter() - start
+            yield item
+    finally:
+        record(stage, waited)
+
+
+def start_request_spans():
+    """Collect this request's spans for a Server-Timing header; returns the reset token."""
+    return _request_spans.set([])
+
+
+def finish_request_spans(token):
+    spans = _request_spans.get() or []
+    _request_spans.reset(token)
+    return spans
+
+
+def server_timing_header(spans, total=None) -> str:
+    """Server-Timing value: one entry per stage, durations summed, in first-seen order."""
+    totals, counts = {}, {}
+    for stage, seconds in spans:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+        counts[stage] = counts.get(stage, 0) + 1
+    parts = [
+        f'{stage.replace(".", "-")};dur={seconds * 1000:.1f}' + (f';desc="x{counts[stage]}"' if counts[stage] > 1 else "")
+        for stage, seconds in totals.items()
+    ]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request latency per route template and method, request
+    counts by status, and the Server-Timing header for requests that send
+    "X-Server-Timing: 1". Streaming responses are timed up to their first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = None
+        if SERVER_TIMING_ALLOWED and (b"x-server-timing", b"1") in scope["headers"]:
+            token = start_request_spans()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - start
+                _observe_request(scope, status, elapsed)
+                if token is not None:
+                    header = server_timing_header(_request_spans.get() or [], elapsed)
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if status == 500:
+                _observe_request(scope, 500, time.perf_counter() - start)
+            raise
+        finally:
+            if token is not None:
+                _request_spans.reset(token)
+
+
+def _observe_request(scope, status, elapsed):
+    path = _route_template(scope)
+    registry.observe("http_request_duration_seconds", elapsed, route=path, method=scope["method"])
+    registry.inc("http_requests_total", route=path, method=scope["method"], status=status)
+
+
+def _route_template(scope):
+    """
+    The matched route as a template (/api/jobs/{job_id}). Built from the
+    request path, since routes of included routers don't carry the prefix.
+    """
+    if scope.get("route") is None:
+        # Unmatched paths share one label so scanners can't blow up cardinality
+        return "unmatched"
+    path = scope["path"]
+    for name, value in (scope.get("path_params") or {}).items():
+        head, sep, tail = path.rpartition(str(value))
+        if sep:
+            path = f"{head}{{{name}}}{tail}"
+    return path
@@ -0,0 +1,166 @@
+# app/utils/parse_pool.py
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+
+class ParseExecutor:
+    """
+    Runs document parsing off the event loop.
+
+    mode:
+    - "process": worker processes (default; CPU-bound parsing can't hold the GIL
+      of the server process)
+    - "thread":  a thread pool of the same size
+    - "inline":  parse on the event loop (old behaviour, useful for comparison)
+
+    At most max_pending documents may be parsing or waiting at once; beyond
+    that uploads are rejected with 503 instead of piling up. Each document
+    gets `timeout` seconds before the request fails with 504. A document
+    keeps its pending slot until its parse has really stopped: in process
+    mode a timeout recycles the pool (its workers are terminated), a
+    thread can't be stopped so its slot is held until it returns.
+    """
+
+    def __init__(self, mode="process", workers=2, max_pending=16, timeout=30.0, max_pages=50):
+        self._pool = None
+        self.configure(mode, workers, max_pending, timeout, max_pages)
+
+    def configure(self, mode="process", workers=2, max_pending=16, timeout=30.0, max_pages=50):
+        self.shutdown()
+        self.mode = mode
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.pending = 0
+        self.recycled = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.mode == "process":
+                # spawn: forking a server that already runs threads is not safe
+                ctx = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+        return self._pool
+
+    def _acquire(self):
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Parser is busy, please retry shortly.")
+        self.pending += 1
+
+    def _release_when_done(self, futures):
+        """Free one pending slot once every future has finished (or was cancelled before it started)."""
+        loop = asyncio.get_running_loop()
+        remaining = [len(futures)]
+
+        def release():
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                self.pending -= 1
+
+        def done(_):
+            # Called from a pool thread once the parse is over
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                pass  # loop already closed at shutdown
+
+        for future in futures:
+            future.add_done_callback(done)
+
+    def _submit(self, fn, arg_list):
+        self._acquire()
+        pool = self._get_pool()
+        futures = []
+        try:
+            for args in arg_list:
+                futures.append(pool.submit(fn, *args))
+        except BrokenProcessPool:
+            self._discard(pool)
+            for future in futures:
+                future.cancel()
+            self.pending -= 1
+            raise HTTPException(status_code=503, detail="Parser restarted, please retry shortly.")
+        self._release_when_done(futures)
+        return pool, futures
+
+    def _timed_out(self, pool, futures):
+        """A hung parse must not keep its worker: terminate the process pool and start a fresh one lazily."""
+        if self.mode == "process" and self._pool is pool and not all(f.done() for f in futures):
+            self._discard(pool, terminate=True)
+            self.recycled += 1
+
+    def _discard(self, pool, terminate=False):
+        if self._pool is pool:
+            self._pool = None
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        if terminate:
+            # Futures still running on these workers fail with BrokenProcessPool
+            for process in processes:
+                process.terminate()
+
+    async def run(self, fn, *args):
+        if self.mode == "inline":
+            return fn(*args)
+
+        pool, futures = self._submit(fn, [args])
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(futures[0]), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._timed_out(pool, futures)
+            raise HTTPException(status_code=504, detail="Document took too long to parse.")
+        except BrokenProcessPool:
+            # Another document's timeout recycled the pool under this one
+            self._discard(pool)
+            raise HTTPException(status_code=503, detail="Parser restarted, please retry shortly.")
+
+    async def run_ordered(self, fn, arg_list):
+        """
+        Run fn(*args) for every args tuple in parallel and yield the results
+        in order, so callers can start on the first chunk while later ones
+        are still parsing. The whole batch counts as one pending document.
+        """
+        if self.mode == "inline":
+            for args in arg_list:
+                yield fn(*args)
+            return
+
+        pool, futures = self._submit(fn, arg_list)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        try:
+            for future in futures:
+                yield await asyncio.wait_for(asyncio.wrap_future(future), timeout=max(0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            self._timed_out(pool, futures)
+            raise HTTPException(status_code=504, detail="Document took too long to parse.")
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise HTTPException(status_code=503, detail="Parser restarted, please retry shortly.")
+        finally:
+            # Chunks not started yet are dropped; running ones keep the slot until they return
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+parse_executor = ParseExecutor(
+    mode=os.getenv("PARSE_EXECUTOR", "process"),
+    workers=int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_pending=int(os.getenv("PARSE_MAX_PENDING", "16")),
+    timeout=float(os.getenv("PARSE_TIMEOUT", "30")),
+    max_pages=int(os.getenv("PARSE_MAX_PAGES", "50")),
+)
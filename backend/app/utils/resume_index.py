@@ -0,0 +1,367 @@
+# app/utils/resume_index.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from .embeddings import EMBED_DIM, embed
+from .extract import extract_skills, extract_resume_sections
+from .skills import STOPWORDS, tokenize
+
+INDEX_DIR = Path(os.getenv("RESUME_INDEX_DIR", "resume_index"))
+# Merge the in-memory delta into the on-disk segment once it holds this many resumes
+COMPACT_AT = int(os.getenv("RESUME_INDEX_COMPACT_AT", "5000"))
+
+# BM25 parameters; skills count SKILL_BOOST times so they dominate plain words
+K1 = 1.2
+B = 0.75
+SKILL_BOOST = 3
+
+def document_terms(text: str, skills=None) -> Counter:
+    """
+    Index terms for a resume or a JD: every word from the detected sections
+    (whole text when no headings are found) plus "skill:<name>" terms.
+    """
+    sections = extract_resume_sections(text)
+    body = " ".join(sections.values()) if sections else text
+    terms = Counter(
+        tok for tok, _, _ in tokenize(body)
+        if len(tok) > 1 and tok not in STOPWORDS
+    )
+    for skill in (skills if skills is not None else extract_skills(text)):
+        terms["skill:" + skill] += SKILL_BOOST
+    return terms
+
+
+class ResumeIndex:
+    """
+    BM25 inverted index over stored resumes.
+
+    - base segment: CSR postings saved as .npy files and memory-mapped on load
+      (term_offsets[t]:term_offsets[t+1] slices postings_docs / postings_tf)
+    - delta: resumes added since the last compaction, kept in dicts
+    - deletions: tombstones until the next compaction drops them
+    - vectors: one hashed embedding per position (vectors.npy, memory-mapped,
+      plus a delta list) for brute-force semantic search
+    Resume text and skills live in a SQLite store, which is the source of
+    truth: on load, anything newer than the base segment is re-indexed.
+    """
+
+    def __init__(self, directory=INDEX_DIR):
+        self.dir = Path(directory)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.doc_ids = []            # position -> resume id
+        self.positions = {}          # resume id -> position
+        self.vocab = {}              # term -> base term id
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.postings_docs = np.zeros(0, dtype=np.int32)
+        self.postings_tf = np.zeros(0, dtype=np.float32)
+        self.base_size = 0
+        self.doc_len = []            # per position (base + delta)
+        self.delta = {}              # term -> {position: tf}
+        self.deleted = set()         # positions
+        self.vectors = np.zeros((0, EMBED_DIM), dtype=np.float32)
+        self.delta_vectors = []
+        self._norm = None            # cached BM25 length normalisation per position
+
+    # ---------- resume store ----------
+
+    @contextmanager
+    def _store(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.dir / "resumes.db"), timeout=5)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_store(self):
+        with self._store() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    text TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    added_at REAL NOT NULL
+                )
+            """)
+
+    # ---------- load / save ----------
+
+    def load(self):
+        """Memory-map the base segment and re-index resumes stored after it."""
+        with self._lock:
+            self._reset()
+            self._init_store()
+            meta_path = self.dir / "meta.json"
+            built_at = 0.0
+            vectors_path = self.dir / "vectors.npy"
+            meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+            vectors = np.load(vectors_path, mmap_mode="r") if meta and vectors_path.exists() else None
+            # A segment is only usable with one embedding row per document of
+            # the current EMBED_DIM (older segments have no vectors.npy at all)
+            if vectors is not None and vectors.shape == (len(meta["doc_ids"]), EMBED_DIM):
+                self.vectors = vectors
+                built_at = meta["built_at"]
+                self.doc_ids = list(meta["doc_ids"])
+                self.vocab = meta["vocab"]
+                self.term_offsets = np.load(self.dir / "term_offsets.npy", mmap_mode="r")
+                self.postings_docs = np.load(self.dir / "postings_docs.npy", mmap_mode="r")
+                self.postings_tf = np.load(self.dir / "postings_tf.npy", mmap_mode="r")
+                self.doc_len = list(np.load(self.dir / "doc_len.npy"))
+                self.base_size = len(self.doc_ids)
+                self.positions = {rid: i for i, rid in enumerate(self.doc_ids)}
+            else:
+                # No segment, one without vectors or with another EMBED_DIM: rebuild from the store
+                self.vectors = np.zeros((0, EMBED_DIM), dtype=np.float32)
+
+            with self._store() as conn:
+                stored = {row["id"] for row in conn.execute("SELECT id FROM resumes")}
+                for rid in set(self.positions) - stored:
+                    self.deleted.add(self.positions.pop(rid))
+                # Added or replaced since the base segment was written
+                for row in conn.execute(
+                    "SELECT id, text, skills FROM resumes WHERE added_at > ? ORDER BY added_at", (built_at,)
+                ):
+                    if row["id"] in self.positions:
+                        self.deleted.add(self.positions.pop(row["id"]))
+                    skills = json.loads(row["skills"])
+                    self._index(row["id"], document_terms(row["text"], skills), embed(row["text"], skills))
+        return self
+
+    def compact(self):
+        """Merge base + delta minus deletions into a new on-disk segment."""
+        with self._lock:
+            built_at = time.time()
+            # Every posting as (term, position, tf)
+            base_terms = np.repeat(
+                np.arange(len(self.vocab), dtype=np.int64), np.diff(np.asarray(self.term_offsets))
+            )
+            vocab = dict(self.vocab)
+            d_terms, d_docs, d_tfs = [], [], []
+            for term, postings in self.delta.items():
+                tid = vocab.setdefault(term, len(vocab))
+                d_terms += [tid] * len(postings)
+                d_docs += postings.keys()
+                d_tfs += postings.values()
+            terms = np.concatenate([base_terms, np.asarray(d_terms, dtype=np.int64)])
+            docs = np.concatenate([np.asarray(self.postings_docs, dtype=np.int64), np.asarray(d_docs, dtype=np.int64)])
+            tfs = np.concatenate([np.asarray(self.postings_tf), np.asarray(d_tfs, dtype=np.float32)])
+
+            # Drop deleted documents and renumber the survivors
+            alive = np.ones(len(self.doc_ids), dtype=bool)
+            alive[list(self.deleted)] = False
+            new_pos = np.cumsum(alive) - 1
+            keep = alive[docs]
+            terms, docs, tfs = terms[keep], new_pos[docs[keep]], tfs[keep]
+
+            # Drop terms with no postings left and renumber them
+            used = np.bincount(terms, minlength=len(vocab)) > 0
+            term_map = np.cumsum(used) - 1
+            inverse = [None] * len(vocab)
+            for term, tid in vocab.items():
+                inverse[tid] = term
+            new_vocab = {inverse[t]: int(term_map[t]) for t in np.flatnonzero(used)}
+            terms = term_map[terms]
+
+            order = np.lexsort((docs, terms))
+            terms, docs, tfs = terms[order], docs[order], tfs[order]
+            offsets = np.zeros(len(new_vocab) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(terms, minlength=len(new_vocab)), out=offsets[1:])
+
+            doc_ids = [rid for rid, a in zip(self.doc_ids, alive) if a]
+            doc_len = np.asarray(self.doc_len, dtype=np.float32)[alive]
+            vectors = np.concatenate([
+                np.asarray(self.vectors)[alive[:self.base_size]],
+                np.asarray(self.delta_vectors, dtype=np.float32).reshape(-1, EMBED_DIM)[alive[self.base_size:]],
+            ])
+
+            self.dir.mkdir(parents=True, exist_ok=True)
+            # Write new files first, then swap them in by rename
+            for name, arr in [("term_offsets", offsets), ("postings_docs", docs.astype(np.int32)),
+                              ("postings_tf", tfs.astype(np.float32)), ("doc_len", doc_len),
+                              ("vectors", vectors)]:
+                np.save(self.dir / f"{name}.tmp.npy", arr)
+            (self.dir / "meta.tmp.json").write_text(json.dumps({"doc_ids": doc_ids, "vocab": new_vocab, "built_at": built_at}))
+            for name in ["term_offsets", "postings_docs", "postings_tf", "doc_len", "vectors"]:
+                os.replace(self.dir / f"{name}.tmp.npy", self.dir / f"{name}.npy")
+            os.replace(self.dir / "meta.tmp.json", self.dir / "meta.json")
+            return self.load()
+
+    # ---------- add / remove ----------
+
+    def _index(self, resume_id, terms: Counter, vector):
+        pos = len(self.doc_ids)
+        self.doc_ids.append(resume_id)
+        self.delta_vectors.append(vector)
+        self.positions[resume_id] = pos
+        self.doc_len.append(sum(terms.values()))
+        self._norm = None
+        for term, tf in terms.items():
+            self.delta.setdefault(term, {})[pos] = tf
+
+    def add(self, text: str, resume_id=None, name=None):
+        resume_id = resume_id or uuid.uuid4().hex
+        skills = extract_skills(text)
+        terms = document_terms(text, skills)
+        vector = embed(text, skills)
+        with self._lock:
+            with self._store() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resumes (id, name, text, skills, added_at) VALUES (?, ?, ?, ?, ?)",
+                    (resume_id, name, text, json.dumps(skills), time.time()),
+                )
+            if resume_id in self.positions:
+                self.deleted.add(self.positions.pop(resume_id))
+            self._index(resume_id, terms, vector)
+            if len(self.doc_ids) - self.base_size >= COMPACT_AT:
+                self.compact()
+        return resume_id
+
+    def add_many(self, docs):
+        """
+        Bulk add of (text, resume_id, name) tuples in one store transaction;
+        compacts once at the end instead of every COMPACT_AT resumes.
+        """
+        rows, ids = [], []
+        for text, resume_id, name in docs:
+            resume_id = resume_id or uuid.uuid4().hex
+            skills = extract_skills(text)
+            rows.append((resume_id, name, text, skills, document_terms(text, skills), embed(text, skills)))
+            ids.append(resume_id)
+        with self._lock:
+            now = time.time()
+            with self._store() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO resumes (id, name, text, skills, added_at) VALUES (?, ?, ?, ?, ?)",
+                    [(rid, name, text, json.dumps(skills), now) for rid, name, text, skills, _, _ in rows],
+                )
+            for rid, _, _, _, terms, vector in rows:
+                if rid in self.positions:
+                    self.deleted.add(self.positions.pop(rid))
+                self._index(rid, terms, vector)
+            if len(self.doc_ids) - self.base_size >= COMPACT_AT:
+                self.compact()
+        return ids
+
+    def remove(self, resume_id) -> bool:
+        with self._lock:
+            pos = self.positions.pop(resume_id, None)
+            if pos is None:
+                return False
+            self.deleted.add(pos)
+            with self._store() as conn:
+                conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            return True
+
+    # ---------- search ----------
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _postings(self, term):
+        """(positions, tfs) for a term across base and delta."""
+        parts_docs, parts_tf = [], []
+        tid = self.vocab.get(term)
+        if tid is not None:
+            lo, hi = self.term_offsets[tid], self.term_offsets[tid + 1]
+            parts_docs.append(np.asarray(self.postings_docs[lo:hi]))
+            parts_tf.append(np.asarray(self.postings_tf[lo:hi]))
+        extra = self.delta.get(term)
+        if extra:
+            parts_docs.append(np.fromiter(extra.keys(), dtype=np.int32, count=len(extra)))
+            parts_tf.append(np.fromiter(extra.values(), dtype=np.float32, count=len(extra)))
+        if not parts_docs:
+            return None, None
+        return np.concatenate(parts_docs), np.concatenate(parts_tf)
+
+    def _bm25_scores(self, query: Counter):
+        live = len(self.positions)
+        if self._norm is None:
+            doc_len = np.asarray(self.doc_len, dtype=np.float32)
+            self._norm = K1 * (1 - B + B * doc_len / max(doc_len.mean(), 1e-9))
+        norm = self._norm
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        for term, qtf in query.items():
+            docs, tfs = self._postings(term)
+            if docs is None:
+                continue
+            idf = np.log(1 + (live - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += qtf * idf * tfs * (K1 + 1) / (tfs + norm[docs])
+        return scores
+
+    def _semantic_scores(self, vector):
+        # Brute force: one matrix-vector product over the mmap'd segment + delta
+        parts = [np.asarray(self.vectors) @ vector]
+        if self.delta_vectors:
+            parts.append(np.asarray(self.delta_vectors, dtype=np.float32) @ vector)
+        return np.concatenate(parts)
+
+    def search(self, job_text: str, top_k: int = 10, mode: str = "bm25"):
+        """Top-k resumes for a job description, by BM25 or embedding similarity."""
+        jd_skills = extract_skills(job_text)
+        if mode == "semantic":
+            query = embed(job_text, jd_skills)
+            empty = not query.any()
+        else:
+            query = document_terms(job_text, jd_skills)
+            empty = not query
+        with self._lock:
+            n_docs = len(self.doc_ids)
+            if not self.positions or empty:
+                return jd_skills, []
+            scores = self._semantic_scores(query) if mode == "semantic" else self._bm25_scores(query)
+            if self.deleted:
+                scores[list(self.deleted)] = 0
+            k = min(top_k, n_docs)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            hits = [(self.doc_ids[p], float(scores[p])) for p in top if scores[p] > 0]
+
+        with self._store() as conn:
+            rows = {
+                row["id"]: row for row in conn.execute(
+                    f"SELECT id, name, skills FROM resumes WHERE id IN ({','.join('?' * len(hits))})",
+                    [rid for rid, _ in hits],
+                )
+            } if hits else {}
+        results = []
+        for rid, score in hits:
+            row = rows.get(rid)
+            skills = set(json.loads(row["skills"])) if row else set()
+            results.append({
+                "resume_id": rid,
+                "name": row["name"] if row else None,
+                "score": round(score, 4),
+                "matched_skills": [s for s in jd_skills if s in skills],
+                "missing_skills": [s for s in jd_skills if s not in skills],
+            })
+        return jd_skills, results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "resumes": len(self.positions),
+                "base_segment": self.base_size,
+                "delta": len(self.doc_ids) - self.base_size,
+                "deleted_pending": len(self.deleted),
+                "terms": len(set(self.vocab) | set(self.delta)),
+            }
+
+
+resume_index = ResumeIndex()
@@ -1,5 +1,7 @@
 # app/utils/resume_sections.py
 
+import re
+
 SECTION_SYNONYMS = {
     "summary": [
         "summary",
@@ -13,6 +15,8 @@ SECTION_SYNONYMS = {
     "skills": [
         "skills",
         "technical skills",
+        "key skills",
+        "expertise",
         "tech stack",
         "technologies",
         "tools"
@@ -41,16 +45,140 @@ SECTION_SYNONYMS = {
     "certifications": [
         "certifications",
         "certificates",
-        "licenses"
+        "licenses",
+        "courses",
+        "training"
+    ],
+    "achievements": [
+        "achievements",
+        "awards",
+        "accomplishments"
     ]
 }
 
-def normalize_section_name(heading: str):
-    heading = heading.lower().strip()
+# Every synonym in one alternation, longest first so "work experience" wins
+# over "experience", matched as whole words anywhere in the line.
+_VARIANT_TO_SECTION = {
+    variant: standard
+    for standard, variants in SECTION_SYNONYMS.items()
+    for variant in variants
+}
+HEADING_RE = re.compile(
+    r"\b(?P<name>"
+    + "|".join(re.escape(v) for v in sorted(_VARIANT_TO_SECTION, key=len, reverse=True))
+    + r")\b",
+    re.IGNORECASE,
+)
+LINE_RE = re.compile(r"[^\r\n]+")
+# A heading reads as a label, not a sentence or list
+SENTENCE_PUNCT_RE = re.compile(r"[.,;!?]")
+BULLET_RE = re.compile(r"^[-*•·▪◦►>–—]\s")
+HEADING_DECORATION = " \t:-–—|#*•·▪◦►>"
+
+MAX_HEADING_WORDS = 5
+
+
+def _is_label(text: str) -> bool:
+    return len(text.split()) <= MAX_HEADING_WORDS and not SENTENCE_PUNCT_RE.search(text)
+
+
+def match_heading(line: str):
+    """
+    Decide whether a stripped line is a section heading, using layout cues
+    rather than "a synonym appears somewhere in the line":
+    - a short line (at most MAX_HEADING_WORDS words, no sentence punctuation)
+      containing a synonym as a whole word: "Skills", "Relevant Experience",
+      "Work Experience (2019-2023)", "Skills & Interests"
+    - a short all-caps line that starts with the heading ("SKILLS, TOOLS")
+    - a short label ending in a colon, followed by inline content
+      ("Skills: Python, SQL", "Core Skills: Python")
+    Bullet points only count when the heading opens them ("- Skills").
+
+    Returns (section, inline_content_offset) or None. The offset points at
+    inline content within the line, or is None when there is none.
+    """
+    # Every form is a short label, so long body lines skip the regex
+    region = line
+    if len(line.split(None, MAX_HEADING_WORDS)) > MAX_HEADING_WORDS:
+        region = line.partition(":")[0]
+        if region == line or len(region.split(None, MAX_HEADING_WORDS)) > MAX_HEADING_WORDS:
+            return None
+    m = HEADING_RE.search(region)
+    if not m:
+        return None
+
+    section = _VARIANT_TO_SECTION[m.group("name").lower()]
+    lead = line[:m.start()]
+    at_start = not lead.strip(HEADING_DECORATION)
+    if not at_start and (BULLET_RE.match(line) or not _is_label(lead)):
+        return None
+
+    rest = line[m.end():]
+    if rest.lstrip().startswith(":"):
+        start = m.end() + rest.index(":") + 1
+        start += len(line[start:]) - len(line[start:].lstrip())
+        return section, (start if start < len(line) else None)
+
+    if _is_label(line):
+        return section, None
 
-    for standard, variants in SECTION_SYNONYMS.items():
-        for variant in variants:
-            if variant in heading:
-                return standard
+    if at_start and line.isupper() and len(line.split()) <= MAX_HEADING_WORDS:
+        return section, None
 
     return None
+
+
+def normalize_section_name(heading: str):
+    found = match_heading(heading.strip())
+    return found[0] if found else None
+
+
+class SectionSegmenter:
+    """
+    The segmentation state machine, fed a text or successive pieces of one
+    (e.g. pages) that each end at a line break. scan() yields
+    (section, start, end) for every non-empty line, with the span of its
+    content within the piece: section is None before the first heading, and
+    a heading line yields (section, None, None) before any inline content.
+    """
+
+    def __init__(self):
+        self.current = None
+
+    def scan(self, text: str):
+        for m in LINE_RE.finditer(text):
+            line = m.group()
+            stripped = line.strip()
+            if not stripped:
+                continue
+            start = m.start() + (len(line) - len(line.lstrip()))
+            end = start + len(stripped)
+
+            heading = match_heading(stripped)
+            if heading:
+                self.current, inline = heading
+                yield self.current, None, None
+                if inline is not None:
+                    yield self.current, start + inline, end
+            else:
+                yield self.current, start, end
+
+
+def segment_sections(text: str):
+    """
+    Single pass over the text. Returns {section: [(start, end), ...]} with
+    the character span of every body line, so callers can slice the
+    original text instead of building concatenated copies.
+    """
+    spans = {}
+    for section, start, end in SectionSegmenter().scan(text):
+        if start is None:
+            spans[section] = []
+        elif section:
+            spans[section].append((start, end))
+    return spans
+
+
+def section_text(text: str, spans) -> str:
+    # Body lines separated (and terminated) by a single space
+    return "".join(text[a:b] + " " for a, b in spans)
@@ -0,0 +1,141 @@
+# app/utils/section_store.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+SECTION_STORE_DB = os.getenv("SECTION_STORE_DB", "resume_sections.db")
+# Lineages not re-uploaded for this long are dropped at startup
+SECTION_STORE_TTL = float(os.getenv("SECTION_STORE_TTL_DAYS", "30")) * 86400
+
+
+def chunk_key(section: str, content: str) -> str:
+    """Content hash of one section; the name is part of it since scoring rules depend on it."""
+    return hashlib.sha256(f"{section}\0{content}".encode("utf-8")).hexdigest()
+
+
+class SectionStore:
+    """
+    Per-section analysis results of the latest upload of each resume lineage
+    (a client-chosen resume_id): {chunk_key: {"section", "score"}}
+    plus the revision number. A re-upload only re-scores the sections whose
+    content hash is not in its previous revision. Recently used lineages are
+    also kept in a bounded in-memory LRU, so an edit-and-re-upload loop
+    reads nothing from disk.
+
+    Uploads of one lineage are serialised with lineage_lock() within a
+    process; put() only succeeds on top of the revision that was read, so
+    a writer in another process can't be silently overwritten.
+    """
+
+    def __init__(self, db_path, ttl=SECTION_STORE_TTL, max_memory_entries=256):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self._ready = False
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._lineage_locks = weakref.WeakValueDictionary()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS resume_sections (
+                        resume_id TEXT PRIMARY KEY,
+                        revision INTEGER NOT NULL,
+                        chunks TEXT NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                """)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lineage_lock(self, resume_id) -> asyncio.Lock:
+        """Held from reading a lineage's revision until the next one is written."""
+        lock = self._lineage_locks.get(resume_id)
+        if lock is None:
+            lock = self._lineage_locks[resume_id] = asyncio.Lock()
+        return lock
+
+    def get(self, resume_id, fresh=False):
+        """
+        (revision, chunks) of the last upload, or (0, {}) for a new lineage.
+        Treat as read-only. fresh=True skips the memory tier.
+        """
+        with self._lock:
+            if resume_id in self._mem and not fresh:
+                self._mem.move_to_end(resume_id)
+                return self._mem[resume_id]
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT revision, chunks FROM resume_sections WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+        if row is None:
+            return 0, {}
+        entry = (row[0], json.loads(row[1]))
+        self._mem_put(resume_id, entry)
+        return entry
+
+    def put(self, resume_id, base_revision, chunks) -> bool:
+        """
+        Store chunks as revision base_revision + 1. False if the lineage is no
+        longer at base_revision (written meanwhile by another process).
+        """
+        now = time.time()
+        with self._connect() as conn:
+            if base_revision == 0:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO resume_sections (resume_id, revision, chunks, updated_at) VALUES (?, 1, ?, ?)",
+                    (resume_id, json.dumps(chunks), now),
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE resume_sections SET revision = ?, chunks = ?, updated_at = ? "
+                    "WHERE resume_id = ? AND revision = ?",
+                    (base_revision + 1, json.dumps(chunks), now, resume_id, base_revision),
+                )
+        if cursor.rowcount != 1:
+            with self._lock:
+                self._mem.pop(resume_id, None)
+            return False
+        self._mem_put(resume_id, (base_revision + 1, chunks))
+        return True
+
+    def _mem_put(self, resume_id, entry):
+        with self._lock:
+            self._mem[resume_id] = entry
+            self._mem.move_to_end(resume_id)
+            while len(self._mem) > self.max_memory_entries:
+                self._mem.popitem(last=False)
+
+    def delete(self, resume_id):
+        with self._lock:
+            self._mem.pop(resume_id, None)
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM resume_sections WHERE resume_id = ?", (resume_id,)).rowcount
+
+    def prune(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM resume_sections WHERE updated_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+
+
+section_store = SectionStore(
+    SECTION_STORE_DB,
+    max_memory_entries=int(os.getenv("SECTION_STORE_MEMORY_SIZE", "256")),
+)
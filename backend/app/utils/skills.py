@@ -0,0 +1,113 @@
+# app/utils/skills.py
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+# Taxonomy file: {"canonical skill": ["alias", ...], ...}
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skills.json"
+
+# A token is a run of letters/digits, optionally dot-joined ("node.js") or
+# followed by "+"/"#" ("c++", "c#"). It never ends in a dot, so "python." at
+# the end of a sentence still reads as "python".
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*", re.IGNORECASE)
+
+# Words too common to carry meaning in search terms and embedding features
+STOPWORDS = set("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to was
+were will with we you your i me my he she they them using used use also etc per via over
+""".split())
+
+
+_END = object()  # trie key marking "a skill ends here"
+
+
+@dataclass(frozen=True)
+class SkillMatch:
+    skill: str   # canonical name from the taxonomy
+    text: str    # text as it appears in the document
+    start: int   # character offsets into the original text
+    end: int
+
+
+def tokenize(text: str):
+    """Yield (token, start, end) for every word token in text."""
+    for m in TOKEN_RE.finditer(text):
+        yield m.group().lower(), m.start(), m.end()
+
+
+class SkillMatcher:
+    """
+    Token trie over every skill and alias. Matching walks the document once,
+    taking the longest skill phrase starting at each token, so the cost does
+    not depend on the size of the taxonomy and "java" never fires inside
+    "javascript".
+    """
+
+    def __init__(self, taxonomy: dict):
+        self.root = {}
+        self.size = 0
+        self.max_depth = 0
+        for skill, aliases in taxonomy.items():
+            for phrase in [skill, *aliases]:
+                self._add(phrase, skill)
+
+    def _add(self, phrase: str, skill: str):
+        tokens = [tok for tok, _, _ in tokenize(phrase)]
+        if not tokens:
+            return
+        node = self.root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = skill
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def find(self, text: str) -> list[SkillMatch]:
+        tokens = list(tokenize(text))
+        matches = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self.root
+            best = None
+            j = i
+            while j < n:
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    best = (node[_END], j)
+            if best:
+                skill, j = best
+                start, end = tokens[i][1], tokens[j - 1][2]
+                matches.append(SkillMatch(skill, text[start:end], start, end))
+                i = j
+            else:
+                i += 1
+        return matches
+
+    def extract(self, text: str) -> list[str]:
+        """Unique canonical skills in order of first appearance."""
+        return list(dict.fromkeys(m.skill for m in self.find(text)))
+
+
+def load_taxonomy(path=None) -> dict:
+    path = Path(path or os.getenv("SKILLS_TAXONOMY_PATH") or DEFAULT_TAXONOMY_PATH)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    # Plain lists are allowed too: ["python", "react", ...]
+    if isinstance(data, list):
+        data = {s: [] for s in data}
+    return {s.lower(): [a.lower() for a in aliases] for s, aliases in data.items()}
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Build the matcher once per process (warmed at app startup)."""
+    return SkillMatcher(load_taxonomy())
@@ -0,0 +1,170 @@
+# app/utils/text_cache.py
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class TextCache:
+    """
+    Parsed-text cache keyed by the SHA-256 of the uploaded file bytes.
+
+    Two tiers:
+    - memory: bounded LRU (entry count)
+    - disk (optional): SQLite file, evicted least-recently-used once the
+      stored text exceeds max_disk_bytes
+    """
+
+    def __init__(self, max_entries=256, db_path=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_bytes = max_disk_bytes
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        if db_path:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS parsed_text (
+                        key TEXT PRIMARY KEY,
+                        text TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_parsed_text_last_used ON parsed_text(last_used)")
+                # Running total of parsed_text.size, so puts don't re-sum the table
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS parsed_text_size (
+                        id INTEGER PRIMARY KEY CHECK (id = 0),
+                        total INTEGER NOT NULL
+                    )
+                """)
+                conn.execute(
+                    "INSERT OR IGNORE INTO parsed_text_size (id, total) "
+                    "SELECT 0, COALESCE(SUM(size), 0) FROM parsed_text"
+                )
+
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return self._mem[key]
+
+        text = self._disk_get(key) if self.db_path else None
+        with self._lock:
+            if text is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["disk_hits"] += 1
+            self._mem_put(key, text)
+        return text
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self._mem_put(key, text)
+        if self.db_path:
+            self._disk_put(key, text)
+
+    # Async callers use these: with the disk tier, get/put wait on SQLite
+    async def aget(self, key: str):
+        if not self.db_path:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, text: str):
+        if not self.db_path:
+            self.put(key, text)
+        else:
+            await asyncio.to_thread(self.put, key, text)
+
+    def _mem_put(self, key, text):
+        self._mem[key] = text
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def _disk_get(self, key):
+        with self._connect() as conn:
+            row = conn.execute("SELECT text FROM parsed_text WHERE key = ?", (key,)).fetchone()
+            if row:
+                conn.execute("UPDATE parsed_text SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row[0] if row else None
+
+    def _disk_put(self, key, text):
+        size = len(text.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE parsed_text_size SET total = total + ? - "
+                "COALESCE((SELECT size FROM parsed_text WHERE key = ?), 0)",
+                (size, key),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed_text (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time()),
+            )
+            total = conn.execute("SELECT total FROM parsed_text_size").fetchone()[0]
+            evicted, freed = 0, 0
+            while total - freed > self.max_disk_bytes:
+                row = conn.execute(
+                    "SELECT key, size FROM parsed_text WHERE key != ? ORDER BY last_used ASC LIMIT 1", (key,)
+                ).fetchone()
+                if not row:
+                    break
+                conn.execute("DELETE FROM parsed_text WHERE key = ?", (row[0],))
+                freed += row[1]
+                evicted += 1
+            if freed:
+                conn.execute("UPDATE parsed_text_size SET total = total - ?", (freed,))
+        if evicted:
+            with self._lock:
+                self.stats["disk_evictions"] += evicted
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM parsed_text")
+                conn.execute("UPDATE parsed_text_size SET total = 0")
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, "memory_entries": len(self._mem), "disk_enabled": bool(self.db_path)}
+
+
+# Shared by every upload endpoint. TEXT_CACHE_DB enables the disk tier.
+text_cache = TextCache(
+    max_entries=int(os.getenv("TEXT_CACHE_SIZE", "256")),
+    db_path=os.getenv("TEXT_CACHE_DB") or None,
+    max_disk_bytes=int(os.getenv("TEXT_CACHE_DB_MAX_MB", "256")) * 1024 * 1024,
+)
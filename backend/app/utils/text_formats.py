@@ -0,0 +1,177 @@
+# app/utils/text_formats.py
+
+import re
+import shutil
+import subprocess
+import tempfile
+from html.parser import HTMLParser
+
+# ---------- Plain text ----------
+
+def decode_text(data: bytes) -> str:
+    """Decode a text upload: BOM first, then UTF-8, then Windows-1252."""
+    for bom, encoding in [(b"\xef\xbb\xbf", "utf-8-sig"), (b"\xff\xfe", "utf-16"), (b"\xfe\xff", "utf-16")]:
+        if data.startswith(bom):
+            return data.decode(encoding, errors="replace")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+# ---------- HTML ----------
+
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article", "header",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "title", "dt", "dd", "hr",
+}
+SKIP_TAGS = {"script", "style", "head", "noscript", "template", "svg"}
+
+
+class _HTMLText(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(self.skip - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.parts.append(data)
+
+
+def html_to_text(data: bytes) -> str:
+    parser = _HTMLText()
+    parser.feed(decode_text(data))
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+# ---------- RTF ----------
+
+RTF_TOKEN_RE = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.I)
+# Groups whose content is not document text
+RTF_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "header", "footer",
+    "headerl", "headerr", "footerl", "footerr", "listtable", "listoverridetable",
+    "rsidtbl", "generator", "xmlnstbl", "themedata", "colorschememapping", "datastore",
+    "latentstyles", "fldinst", "filetbl", "revtbl",
+}
+RTF_SPECIAL = {"par": "\n", "line": "\n", "sect": "\n", "page": "\n", "row": "\n",
+               "tab": "\t", "cell": " ", "emdash": "—", "endash": "–", "bullet": "•",
+               "lquote": "‘", "rquote": "’", "ldblquote": "“", "rdblquote": "”"}
+
+
+def rtf_to_text(data: bytes) -> str:
+    """Text of an RTF document: paragraphs, escapes and \\u characters; tables/fonts/images skipped."""
+    stack = []            # (skipping, unicode skip count) per enclosing group
+    skipping = False
+    uc = 1                # characters to skip after a \u escape
+    pending_skip = 0
+    out = []
+    text = data.decode("latin-1")
+    for m in RTF_TOKEN_RE.finditer(text):
+        word, arg, hex_code, symbol, brace, plain = m.groups()
+        if brace == "{":
+            stack.append((skipping, uc))
+            continue
+        if brace == "}":
+            skipping, uc = stack.pop() if stack else (False, 1)
+            continue
+        if pending_skip and (plain or hex_code):
+            # Skip the ANSI fallback that follows a \u character
+            if plain:
+                n = min(pending_skip, len(plain))
+                pending_skip -= n
+                plain = plain[n:]
+                if not plain:
+                    continue
+            else:
+                pending_skip -= 1
+                continue
+        if word:
+            if word in RTF_DESTINATIONS:
+                skipping = True
+            elif word == "uc" and arg:
+                uc = int(arg)
+            elif word == "u" and arg and not skipping:
+                code = int(arg)
+                out.append(chr(code + 65536 if code < 0 else code))
+                pending_skip = uc
+            elif word in RTF_SPECIAL and not skipping:
+                out.append(RTF_SPECIAL[word])
+        elif symbol:
+            if symbol == "*":
+                skipping = True   # {\* ...} ignorable destination
+            elif not skipping and symbol in "\\{}":
+                out.append(symbol)
+            elif not skipping and symbol == "~":
+                out.append(" ")
+        elif hex_code and not skipping:
+            out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif plain and not skipping:
+            out.append(plain)
+    lines = (line.strip() for line in "".join(out).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+# ---------- Legacy Word (.doc) ----------
+
+# Runs of readable text in the binary: UTF-16LE (Word's "unicode" pieces)
+# and 8-bit (its "compressed" cp1252 pieces)
+UTF16_RUN_RE = re.compile(rb"(?:[\x20-\x7e\xa0-\xff\r\t][\x00]){8,}")
+ANSI_RUN_RE = re.compile(rb"[\x20-\x7e\x91-\x97\xa0-\xff\r\t]{16,}")
+# Text runs that are Word internals rather than document content
+DOC_NOISE_RE = re.compile(r"^(Times New Roman|Calibri|Arial|Symbol|Normal|Default Paragraph Font|Microsoft)", re.I)
+
+
+def doc_to_text(path_or_data) -> str:
+    """
+    Text of a Word 97-2003 .doc. Uses antiword when it is installed;
+    otherwise pulls the readable text runs out of the binary, which keeps
+    the body text but may carry some style/font names along.
+    """
+    antiword = shutil.which("antiword")
+    if antiword:
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".doc") as tmp:
+                if isinstance(path_or_data, bytes):
+                    tmp.write(path_or_data)
+                    tmp.flush()
+                path = tmp.name if isinstance(path_or_data, bytes) else path_or_data
+                res = subprocess.run([antiword, path], capture_output=True, timeout=30, check=True)
+            return decode_text(res.stdout)
+        except (subprocess.SubprocessError, OSError) as e:
+            print("antiword failed, falling back to text scan:", repr(e))
+
+    if isinstance(path_or_data, bytes):
+        data = path_or_data
+    else:
+        with open(path_or_data, "rb") as f:
+            data = f.read()
+    runs = [(m.start(), m.group().decode("utf-16-le", errors="ignore")) for m in UTF16_RUN_RE.finditer(data)]
+    if sum(len(t) for _, t in runs) < 200:
+        runs += [(m.start(), m.group().decode("cp1252", errors="replace")) for m in ANSI_RUN_RE.finditer(data)]
+    runs.sort()
+    lines = []
+    for _, run in runs:
+        for line in run.replace("\t", " ").split("\r"):
+            line = " ".join(line.split())
+            # Word internals: symbol soup, font/style names
+            letters = sum(ch.isalpha() for ch in line)
+            if letters < 3 or letters + line.count(" ") < 0.7 * len(line) or DOC_NOISE_RE.match(line):
+                continue
+            lines.append(line)
+    return "\n".join(lines)
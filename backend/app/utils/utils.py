@@ -1,19 +1,11 @@
-from io import BytesIO
+from app.utils.extract import iter_document_pages
+from app.utils.ingest import receive_upload
 
-async def extract_text_from_file(file):
-    content = await file.read()
-
-    if file.filename.lower().endswith(".pdf"):
-        import pdfplumber
-        text = ""
-        with pdfplumber.open(BytesIO(content)) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
+async def iter_text_from_file(file):
+    """Yield the upload's text page by page (one chunk for non-PDFs or cached text)."""
+    async with receive_upload(file) as upload:
+        async for page in iter_document_pages(upload.kind, upload.source, upload.key):
+            yield page
 
-    elif file.filename.lower().endswith(".docx"):
-        from docx import Document
-        doc = Document(BytesIO(content))
-        return "\n".join(p.text for p in doc.paragraphs)
-
-    return ""
+async def extract_text_from_file(file):
+    return "\n".join([page async for page in iter_text_from_file(file)])
@@ -0,0 +1,119 @@
+"""
+Activity logging: ingestion rate and dashboard read latency, before/after.
+
+Run from backend/:  python -m benchmarks.bench_activity [--events 5000] [--rows 50000]
+
+before = each event waits for its commit (log_activity(wait=True), the old
+         POST /api/activity/ behaviour) and every dashboard read runs
+         SELECT ... ORDER BY id DESC LIMIT 10 against SQLite
+after  = events are queued for the batching writer without waiting, POST
+         /api/activity/bulk takes many per request, and reads are served from
+         the per-user in-memory buffer
+
+The activities table is pre-filled with --rows rows over 100 users so the
+database reads are realistic.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.suite import setup_env
+
+# Databases and index of the in-process app go to a temp dir
+setup_env(tempfile.mkdtemp(prefix="bench-activity-"))
+
+
+def event(i, user="default"):
+    return {"type": "score", "tag": "ATS", "title": f"Scored resume {i}", "detail": "Overall 72",
+            "route": "/dashboard", "user_id": user}
+
+
+def rate(n, seconds):
+    return f"{n / seconds:9.0f} events/s"
+
+
+def latency(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return f"median {statistics.median(samples):8.1f} µs  p95 {samples[int(len(samples) * 0.95)]:8.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=500, help="dashboard reads per case")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from app import database
+    from app.main import app
+
+    n = args.events
+    with TestClient(app) as client:
+        conn = database.get_db_connection()
+        with conn:
+            conn.executemany(database.ACTIVITY_INSERT, [
+                (e["type"], e["tag"], e["title"], e["detail"], e["route"], "2024-01-01T00:00:00Z", e["user_id"])
+                for e in (event(i, f"user{i % 100}") for i in range(args.rows))
+            ])
+
+        print(f"Ingestion, {n} events:")
+        fields = {k: v for k, v in event(0).items() if k != "user_id"}
+        start = time.perf_counter()
+        for _ in range(n):
+            database.log_activity(**fields, wait=True)
+        print(f"  before  sequential, wait for commit      {rate(n, time.perf_counter() - start)}")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: database.log_activity(**fields, wait=True), range(n)))
+        print(f"  before  8 threads, wait for commit       {rate(n, time.perf_counter() - start)}")
+
+        start = time.perf_counter()
+        for _ in range(n):
+            database.log_activity(**fields, wait=False)
+        database.write_queue.flush()
+        print(f"  after   queued (incl. final flush)       {rate(n, time.perf_counter() - start)}")
+
+        http_n = min(n, 1000)
+        start = time.perf_counter()
+        for i in range(http_n):
+            client.post("/api/activity/", json=event(i)).raise_for_status()
+        database.write_queue.flush()
+        print(f"  after   POST /api/activity/ per event    {rate(http_n, time.perf_counter() - start)}")
+
+        batch = [event(i) for i in range(100)]
+        start = time.perf_counter()
+        for _ in range(n // 100):
+            client.post("/api/activity/bulk", json=batch).raise_for_status()
+        database.write_queue.flush()
+        print(f"  after   POST /api/activity/bulk x100     {rate(n // 100 * 100, time.perf_counter() - start)}")
+
+        total = conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
+        print(f"\nDashboard read (10 newest of {total} rows):")
+        user = "user7"
+        print(f"  before  SQLite query        {latency(lambda: database._select_activities(user, 10), args.repeat)}")
+        database.recent_activities.get(user, 10)
+        print(f"  after   in-memory buffer    {latency(lambda: database.recent_activities.get(user, 10), args.repeat)}")
+        http_repeat = min(args.repeat, 200)
+        print(f"  after   GET /api/activity/  "
+              f"{latency(lambda: client.get('/api/activity/', params={'user_id': user}), http_repeat)}")
+
+        database.recent_activities.clear()
+        coherent = all(database.recent_activities.get(f"user{u}", 10) == database._select_activities(f"user{u}", 10)
+                       for u in range(100))
+        database.log_activity(**fields, user_id=user, wait=True)
+        coherent &= database.recent_activities.get(user, 10) == database._select_activities(user, 10)
+        print(f"\nbuffer matches the database: {coherent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+ATS rule engine: golden-output check and bulk throughput.
+
+Run from backend/:  python -m benchmarks.bench_ats_engine [--resumes 10000] [--update-golden]
+
+The golden file (benchmarks/data/ats_golden.json) holds section inputs
+around every rule threshold (empty sections, digits or not, comma counts,
+unknown section names) with the calculate_ats_score output recorded before
+the rules moved into a table. The check fails loudly on any difference.
+Throughput compares scoring resumes one by one with score_resumes(), which
+scores every section of every resume in one vectorized pass.
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from app.utils.ats_score import calculate_ats_score, score_resumes
+from app.utils.extract import extract_resume_sections
+from benchmarks.corpus import WORDS, resume_text
+
+GOLDEN = Path(__file__).parent / "data" / "ats_golden.json"
+SECTIONS = ["summary", "skills", "experience", "education", "projects", "certifications", "achievements"]
+# Word counts just below / at / above each threshold (20, 40, 60, 80)
+WORD_COUNTS = [0, 1, 19, 20, 21, 39, 40, 41, 59, 60, 61, 79, 80, 81, 120]
+
+
+def golden_cases(n=80, seed=15):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        sections = {}
+        for name in rng.sample(SECTIONS, rng.randint(1, len(SECTIONS))):
+            if name == "skills":
+                items = rng.choice([1, 7, 8, 9, 15])
+                content = ", ".join(rng.choice(WORDS) for _ in range(items))
+            else:
+                words = rng.choices(WORDS, k=rng.choice(WORD_COUNTS))
+                if words and rng.random() < 0.5:
+                    words[rng.randrange(len(words))] = f"{rng.randint(1, 99)}%"
+                content = " ".join(words)
+            if rng.random() < 0.2:
+                content = "\n  " + content.replace(" ", "\n") + "  \n"
+            sections[name] = content
+        cases.append(sections)
+    cases.append({})
+    return cases
+
+
+def check_golden():
+    golden = json.loads(GOLDEN.read_text())
+    inputs = [case["sections"] for case in golden]
+    bulk = score_resumes(inputs)
+    for i, case in enumerate(golden):
+        single = calculate_ats_score(case["sections"])
+        assert single == case["expected"], f"case {i}: {single} != {case['expected']}"
+        assert bulk[i] == case["expected"], f"case {i} (bulk): {bulk[i]} != {case['expected']}"
+    print(f"golden: {len(golden)} cases identical (single and bulk)")
+
+
+def update_golden():
+    GOLDEN.parent.mkdir(exist_ok=True)
+    golden = [{"sections": s, "expected": calculate_ats_score(s)} for s in golden_cases()]
+    GOLDEN.write_text(json.dumps(golden, indent=1) + "\n")
+    print(f"wrote {len(golden)} golden cases to {GOLDEN}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10_000)
+    parser.add_argument("--update-golden", action="store_true")
+    args = parser.parse_args()
+
+    if args.update_golden:
+        update_golden()
+        return
+    check_golden()
+
+    templates = [extract_resume_sections(resume_text(1, seed=i)) for i in range(100)]
+    resumes = [templates[i % len(templates)] for i in range(args.resumes)]
+
+    t0 = time.perf_counter()
+    one_by_one = [calculate_ats_score(s) for s in resumes]
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bulk = score_resumes(resumes)
+    vectorized = time.perf_counter() - t0
+
+    assert bulk == one_by_one
+    print(f"{args.resumes} resumes: one by one {single:.2f}s ({args.resumes / single:,.0f}/s), "
+          f"score_resumes {vectorized:.2f}s ({args.resumes / vectorized:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Chat history page latency as the chats table grows to one million rows.
+
+Run from backend/:  python -m benchmarks.bench_chat_history [--max-rows 1000000]
+
+Rows are spread over 100 sessions. At each table size the script times a
+50-row page (latest, deep before_id, after_id) for one session and the
+first 50 rows of an NDJSON-style stream. Latency should stay flat; the old
+unpaginated full-table read is shown for comparison.
+"""
+import argparse
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+from app import database
+
+SESSIONS = 100
+
+
+def fill(conn, start, stop):
+    rows = ((f"s{i % SESSIONS}", "user" if i % 2 else "ai", f"message number {i}") for i in range(start, stop))
+    with conn:
+        conn.executemany("INSERT INTO chats (session_id, role, message) VALUES (?, ?, ?)", rows)
+
+
+def timed(fn, repeat=20):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    sizes = [n for n in [10_000, 100_000, 1_000_000] if n <= args.max_rows]
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = Path(tmp) / "history.db"
+        database.init_db()
+        conn = database.get_db_connection()
+
+        print(f"{'rows':>10} {'latest':>9} {'before_id':>10} {'after_id':>9} {'stream 50':>10} {'full dump':>10}")
+        filled = 0
+        for size in sizes:
+            fill(conn, filled, size)
+            filled = size
+            mid = size // 2
+
+            latest = timed(lambda: database.get_history("s7", limit=50))
+            before = timed(lambda: database.get_history("s7", before_id=mid, limit=50))
+            after = timed(lambda: database.get_history("s7", after_id=mid, limit=50))
+            stream = timed(lambda: list(islice(database.iter_history("s7"), 50)))
+            full = timed(lambda: conn.execute("SELECT role, message, timestamp FROM chats ORDER BY id ASC").fetchall(),
+                         repeat=1)
+            print(f"{size:>10,} {latest:>6.2f} ms {before:>7.2f} ms {after:>6.2f} ms "
+                  f"{stream:>7.2f} ms {full:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Time-to-first-token for /api/ai/chat/stream vs total latency of /api/ai/chat.
+
+Run from backend/:  python -m benchmarks.bench_chat_stream [--delay 0.3] [--token-interval 0.05]
+
+Uses the local stub model (benchmarks/stub_llm.py), which waits `delay`
+seconds and then emits one word every `token-interval` seconds. Also
+disconnects mid-stream once to check that the partial reply is saved and
+the upstream stream is closed.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import httpx
+
+from app import database
+from app.ai.llm import llm
+from app.main import app
+from benchmarks.stub_llm import run_server, run_stub_server
+
+
+async def main(app_url, rounds):
+    # A real server (not ASGITransport, which buffers whole responses) so
+    # tokens and disconnects travel over the socket as in production
+    async with httpx.AsyncClient(base_url=app_url, timeout=60) as client:
+        full, first, total = [], [], []
+        for i in range(rounds):
+            t0 = time.perf_counter()
+            (await client.post("/api/ai/chat", json={"message": f"plain {i}"})).raise_for_status()
+            full.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            ttft = None
+            async with client.stream("POST", "/api/ai/chat/stream", json={"message": f"stream {i}"}) as res:
+                async for line in res.aiter_lines():
+                    if line.startswith("event: token") and ttft is None:
+                        ttft = time.perf_counter() - t0
+            first.append(ttft)
+            total.append(time.perf_counter() - t0)
+
+        avg = lambda xs: sum(xs) / len(xs) * 1000
+        print(f"/chat          full reply after {avg(full):7.0f} ms")
+        print(f"/chat/stream   first token after {avg(first):6.0f} ms, done after {avg(total):6.0f} ms")
+
+        # Disconnect after the first few tokens
+        async with client.stream("POST", "/api/ai/chat/stream",
+                                 json={"message": "disconnect me", "session_id": "cancel"}) as res:
+            seen = 0
+            async for line in res.aiter_lines():
+                if line.startswith("event: token"):
+                    seen += 1
+                    if seen == 3:
+                        break
+        await asyncio.sleep(0.5)
+        database.write_queue.flush()
+        saved = database.get_history("cancel")
+        print(f"disconnect: {len(saved)} messages saved, partial reply = {saved[-1]['message']!r}")
+    print("gateway stats:", llm.snapshot())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.3)
+    parser.add_argument("--token-interval", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, run_stub_server(args.delay, args.token_interval) as stub_url:
+        database.DB_PATH = Path(tmp) / "chat.db"
+        llm.configure(base_url=stub_url)
+        with run_server(app) as app_url:
+            asyncio.run(main(app_url, args.rounds))
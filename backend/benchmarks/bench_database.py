@@ -0,0 +1,102 @@
+"""
+Chat/activity persistence: inserts per second and read latency under
+concurrent writers.
+
+Run from backend/:  python -m benchmarks.bench_database [--writers 16]
+
+Compares the previous pattern (new connection + commit per insert, rollback
+journal) with the WAL + per-thread connection + group-commit write queue.
+Uses a throwaway database file in a temp directory.
+"""
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app import database
+
+
+def legacy_save_message(path, role, message):
+    conn = sqlite3.connect(str(path))
+    conn.execute("INSERT INTO chats (role, message) VALUES (?, ?)", (role, message))
+    conn.commit()
+    conn.close()
+
+
+def legacy_get_recent_activities(path):
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM activities ORDER BY id DESC LIMIT 10").fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def run(label, write, read, writers, per_writer):
+    errors = []
+    read_latencies = []
+    stop = threading.Event()
+
+    def writer(n):
+        for i in range(per_writer):
+            try:
+                write("user", f"writer {n} message {i}")
+            except Exception as e:
+                errors.append(e)
+
+    def reader():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            read()
+            read_latencies.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.001)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in readers:
+        t.start()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    for t in readers:
+        t.join()
+
+    total = writers * per_writer
+    read_latencies.sort()
+    p99 = read_latencies[int(len(read_latencies) * 0.99)] if read_latencies else 0
+    print(f"{label:<10} {total / elapsed:>10,.0f} inserts/s  errors {len(errors):>4}  "
+          f"read p50 {statistics.median(read_latencies or [0]):6.2f} ms  p99 {p99:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--per-writer", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.db"
+        database.DB_PATH = legacy_path
+        database.init_db()
+        database.close_db_connection()
+        with sqlite3.connect(str(legacy_path)) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+        run("legacy",
+            lambda role, msg: legacy_save_message(legacy_path, role, msg),
+            lambda: legacy_get_recent_activities(legacy_path),
+            args.writers, args.per_writer)
+
+        database.DB_PATH = Path(tmp) / "pooled.db"
+        database.init_db()
+        run("wal+queue", database.save_message, database.get_recent_activities,
+            args.writers, args.per_writer)
+
+
+if __name__ == "__main__":
+    main()
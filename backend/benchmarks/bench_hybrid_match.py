@@ -0,0 +1,109 @@
+"""
+Hybrid job matching: LLM calls avoided and latency per tier.
+
+Run from backend/:  python -m benchmarks.bench_hybrid_match [--pairs 90] [--delay 0.3]
+
+Synthetic job descriptions (8 skills each) are paired with resumes holding a
+known fraction of those skills, from none to all of them. Every pair goes
+through /api/job/match twice against the stub LLM (response cache off):
+
+- mode "llm":    every request calls the model
+- mode "hybrid": the local pre-score settles clear rejects and clear fits,
+                 only the borderline band calls the model
+
+Reported: upstream calls per mode (the fraction hybrid avoids), p50/p95
+latency per tier, and the mean true skill overlap of each local tier, so a
+threshold change that lets weak or strong resumes through can be seen.
+Tune the band with HYBRID_REJECT_BELOW / HYBRID_ACCEPT_ABOVE.
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.suite import setup_env
+
+# Databases and index of the in-process app go to a temp dir
+setup_env(tempfile.mkdtemp(prefix="bench-hybrid-"))
+
+from benchmarks.corpus import SKILLS, WORDS
+
+JD_SKILLS = 8
+
+
+def make_pairs(n, seed=0):
+    """(job_description, resume_text, true overlap 0–1), overlaps spread evenly."""
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(n):
+        wanted = rng.sample(SKILLS, JD_SKILLS)
+        have = i % (JD_SKILLS + 1)
+        others = [s for s in SKILLS if s not in wanted]
+        resume_skills = wanted[:have] + rng.sample(others, 3)
+        jd = (f"We are hiring a software engineer. Required: {', '.join(wanted)}. "
+              "You will own services end to end and work closely with product.")
+        bullets = [" ".join(rng.choices(WORDS, k=10)).capitalize() for _ in range(6)]
+        resume = "\n".join(["Alex Doe", "SKILLS", ", ".join(resume_skills), "EXPERIENCE"]
+                           + [f"- {line}" for line in bullets])
+        pairs.append((jd, resume, have / JD_SKILLS))
+    return pairs
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def run_mode(client, pairs, mode, stub_state):
+    stub_state["calls"] = 0
+    by_tier = {}
+    start = time.perf_counter()
+    for jd, resume, overlap in pairs:
+        t = time.perf_counter()
+        res = client.post("/api/job/match", json={
+            "job_description": jd, "resume_text": resume, "mode": mode, "use_cache": False})
+        res.raise_for_status()
+        tier = res.json()["tier"]
+        entry = by_tier.setdefault(tier, {"ms": [], "overlap": []})
+        entry["ms"].append((time.perf_counter() - t) * 1000)
+        entry["overlap"].append(overlap)
+    return stub_state["calls"], time.perf_counter() - start, by_tier
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=90)
+    parser.add_argument("--delay", type=float, default=0.3, help="stub model latency per call")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from app.ai.llm import llm
+    from app.main import app
+    from app.routers.job import HYBRID_ACCEPT_ABOVE, HYBRID_REJECT_BELOW
+    from benchmarks.stub_llm import run_stub_server, stub_state
+
+    pairs = make_pairs(args.pairs)
+    with run_stub_server(delay=args.delay, token_interval=0) as url, TestClient(app) as client:
+        llm.configure(base_url=url)
+        runs = {mode: run_mode(client, pairs, mode, stub_state) for mode in ("llm", "hybrid")}
+
+    print(f"{len(pairs)} pairs, stub model {args.delay:.2f}s per call, "
+          f"band {HYBRID_REJECT_BELOW}–{HYBRID_ACCEPT_ABOVE}\n")
+    for mode, (calls, seconds, _) in runs.items():
+        print(f"mode {mode:<7} {calls:4d} LLM calls  {seconds:6.1f}s total")
+    llm_calls, hybrid_calls = runs["llm"][0], runs["hybrid"][0]
+    if llm_calls:
+        print(f"hybrid avoided {llm_calls - hybrid_calls} of {llm_calls} calls ({1 - hybrid_calls / llm_calls:.0%})")
+
+    print(f"\n{'tier':<14}{'requests':>9}{'p50 ms':>10}{'p95 ms':>10}{'true overlap':>14}")
+    for mode, (_, _, by_tier) in runs.items():
+        for tier, entry in sorted(by_tier.items()):
+            ms, overlap = entry["ms"], entry["overlap"]
+            print(f"{tier:<14}{len(ms):>9}{statistics.median(ms):>10.1f}{percentile(ms, 0.95):>10.1f}"
+                  f"{statistics.mean(overlap):>13.0%}")
+
+
+if __name__ == "__main__":
+    main()
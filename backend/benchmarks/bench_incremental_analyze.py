@@ -0,0 +1,128 @@
+"""
+Incremental re-analysis: re-uploads of an edited resume with a resume_id.
+
+Run from backend/:  python -m benchmarks.bench_incremental_analyze [--pages 3] [--repeat 30]
+
+A synthetic resume is uploaded once with a resume_id, then again with one
+bullet edited each time (new bytes, so the text cache never answers). The
+same edited files go through /api/resume/analyze without a resume_id for
+comparison. Reported per format: median latency of both, sections
+re-scored vs reused (resume_sections_total), and a check that the
+incremental responses equal the full ones apart from the "changes" block.
+The same check runs on EDGE_LINES, which has skills in the preamble and in
+heading lines and a repeated heading; any difference exits non-zero.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import setup_env
+
+# Databases and index of the in-process app go to a temp dir
+setup_env(tempfile.mkdtemp(prefix="bench-incremental-"))
+
+from benchmarks.corpus import make_pdf, resume_lines
+
+FORMATS = {
+    "txt": ("r.txt", "text/plain", lambda lines: "\n".join(lines).encode("utf-8")),
+    "pdf": ("r.pdf", "application/pdf", make_pdf),
+}
+
+
+# Skills the section bodies alone would miss or misplace
+EDGE_LINES = [
+    "Jane Doe, Python developer",
+    "SKILLS",
+    "Java",
+    "Docker Projects",
+    "- Built a Kubernetes operator",
+    "Skills",
+    "SQL, React",
+    "EXPERIENCE",
+    "- Shipped Node.js services",
+]
+
+
+def edited(lines, i):
+    """The resume with one bullet line rewritten (a different one per i)."""
+    bullets = [n for n, line in enumerate(lines) if line.startswith("- ")]
+    lines = list(lines)
+    n = bullets[(i * 7) % len(bullets)]
+    lines[n] = f"{lines[n]} Cut costs by {i + 10}%"
+    return lines
+
+
+def sections_counter(registry):
+    return {dict(labels)["outcome"]: n for (name, labels), n in registry.counters.items()
+            if name == "resume_sections_total"}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.utils.metrics import registry
+    from app.utils.text_cache import text_cache
+
+    lines = resume_lines(args.pages, seed=args.pages)
+    mismatches = 0
+    with TestClient(app) as client:
+        for fmt, (filename, mime, make) in FORMATS.items():
+            resume_id = f"bench-{fmt}"
+            files = [make(edited(lines, i)) for i in range(args.repeat)]
+
+            def analyze(data, **form):
+                res = client.post("/api/resume/analyze", files={"file": (filename, data, mime)}, data=form)
+                res.raise_for_status()
+                return res.json()
+
+            analyze(make(lines), resume_id=resume_id)
+            for edge in [EDGE_LINES, edited(EDGE_LINES, 0)]:
+                data = make(edge)
+                incremental = analyze(data, resume_id=f"{resume_id}-edge")
+                incremental.pop("changes")
+                text_cache.clear()
+                if analyze(data) != incremental:
+                    mismatches += 1
+            before = sections_counter(registry)
+            timings = {"full": [], "incremental": []}
+            changed = []
+            for data in files:
+                # The text cache holds the file after the first upload: time
+                # both paths on their first sight of the bytes, alternating
+                start = time.perf_counter()
+                incremental = analyze(data, resume_id=resume_id)
+                timings["incremental"].append((time.perf_counter() - start) * 1000)
+                changed.append(len(incremental.pop("changes")["changed_sections"]))
+                client.post("/api/resume/analyze", files={"file": (filename, make(lines), mime)},
+                            data={"resume_id": resume_id}).raise_for_status()
+                text_cache.clear()
+                start = time.perf_counter()
+                full = analyze(data)
+                timings["full"].append((time.perf_counter() - start) * 1000)
+                if full != incremental:
+                    mismatches += 1
+            after = sections_counter(registry)
+
+            rescored = after.get("rescored", 0) - before.get("rescored", 0)
+            reused = after.get("reused", 0) - before.get("reused", 0)
+            print(f"{fmt} [{args.pages}p], {args.repeat} edited re-uploads:")
+            for mode, samples in timings.items():
+                print(f"  {mode:<12} median {statistics.median(samples):7.2f} ms  min {min(samples):7.2f} ms")
+            print(f"  sections re-scored {rescored}, reused {reused} "
+                  f"(incl. the reverts to the base version); changed per edit: {statistics.mean(changed):.1f}")
+
+    if mismatches:
+        sys.exit(f"\n{mismatches} incremental response(s) differ from the full analysis")
+    print("\nincremental responses match the full analysis")
+
+
+if __name__ == "__main__":
+    main()
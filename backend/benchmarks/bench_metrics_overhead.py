@@ -0,0 +1,108 @@
+"""
+Cost of the stage timers with metrics on and off.
+
+Run from backend/:  python -m benchmarks.bench_metrics_overhead [--calls 200000] [--requests 2000]
+
+Runs itself once with METRICS_ENABLED=1 and once with METRICS_ENABLED=0
+(the switch is read at import) and reports, per mode:
+- a bare function call vs the same function under @timed and inside span()
+- the analyze pipeline without upload (sections, ATS score, skills) per resume
+- /api/health and /api/match requests per second through the app
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def per_call_ns(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def measure(calls, requests):
+    os.environ.setdefault("PARSE_EXECUTOR", "inline")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.utils import metrics
+    from app.utils.ats_score import calculate_ats_score
+    from app.utils.extract import extract_resume_sections, extract_skills
+    from benchmarks.corpus import resume_text
+
+    def bare():
+        return None
+
+    timed_fn = metrics.timed("bench")(bare)
+
+    def in_span():
+        with metrics.span("bench"):
+            return None
+
+    texts = [resume_text(seed=i) for i in range(200)]
+
+    def pipeline():
+        for text in texts:
+            calculate_ats_score(extract_resume_sections(text))
+            extract_skills(text)
+
+    pipeline()
+    start = time.perf_counter()
+    for _ in range(5):
+        pipeline()
+    pipeline_us = (time.perf_counter() - start) / (5 * len(texts)) * 1e6
+
+    out = {
+        "enabled": metrics.ENABLED,
+        "bare_ns": per_call_ns(bare, calls),
+        "timed_ns": per_call_ns(timed_fn, calls),
+        "span_ns": per_call_ns(in_span, calls),
+        "pipeline_us_per_resume": pipeline_us,
+    }
+    body = {"resume_text": texts[0], "job_text": "Python, FastAPI, Docker, AWS, PostgreSQL"}
+    with TestClient(app) as client:
+        for label, send in [("health_rps", lambda: client.get("/api/health")),
+                            ("match_rps", lambda: client.post("/api/match", json=body))]:
+            for _ in range(50):
+                send()
+            start = time.perf_counter()
+            for _ in range(requests):
+                send()
+            out[label] = requests / (time.perf_counter() - start)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.calls, args.requests)))
+        return
+
+    results = {}
+    for flag in ("0", "1"):
+        env = {**os.environ, "METRICS_ENABLED": flag, "GROQ_API_KEY": "benchmark"}
+        cmd = [sys.executable, "-m", "benchmarks.bench_metrics_overhead", "--child",
+               "--calls", str(args.calls), "--requests", str(args.requests)]
+        res = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        if res.returncode:
+            sys.exit(res.stderr)
+        results[flag] = json.loads(res.stdout.strip().splitlines()[-1])
+
+    on, off = results["1"], results["0"]
+    print(f"{'':26}{'enabled':>12}{'disabled':>12}")
+    for key, unit in [("bare_ns", "ns"), ("timed_ns", "ns"), ("span_ns", "ns"),
+                      ("pipeline_us_per_resume", "µs"), ("health_rps", "req/s"), ("match_rps", "req/s")]:
+        print(f"{key:<26}{on[key]:>10.1f} {unit:<5}{off[key]:>8.1f} {unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Resume corpus index: build, compaction, startup load and query latency.
+
+Run from backend/:  python -m benchmarks.bench_resume_index [--docs 10000 100000]
+
+Indexes synthetic one-page resumes into a temporary RESUME_INDEX_DIR,
+compacts them into the memory-mapped segment, reloads it the way the app
+does at startup and times top-10 searches for a handful of job descriptions
+(plus searches with a pending delta and deletions on top of the segment).
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from app.utils.resume_index import ResumeIndex
+from benchmarks.corpus import SKILLS, resume_text
+
+QUERIES = 50
+BATCH = 2_000
+
+
+def job_description(rng):
+    skills = rng.sample(SKILLS, 6)
+    return (
+        "We are hiring a backend engineer to build and scale our analytics platform.\n"
+        f"Requirements: {', '.join(skills)}. Experience with deployment pipelines "
+        "and reducing latency for customers is a plus."
+    )
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def time_queries(index, rng):
+    samples = []
+    for _ in range(QUERIES):
+        jd = job_description(rng)
+        t0 = time.perf_counter()
+        _, results = index.search(jd, top_k=10)
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert results
+    return f"p50 {statistics.median(samples):.1f}ms  p99 {percentile(samples, 0.99):.1f}ms"
+
+
+def run(n_docs):
+    rng = random.Random(n_docs)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ResumeIndex(tmp).load()
+        t0 = time.perf_counter()
+        for start in range(0, n_docs, BATCH):
+            index.add_many(
+                (resume_text(1, seed=i), f"r{i}", f"Candidate {i}")
+                for i in range(start, min(start + BATCH, n_docs))
+            )
+        build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        index.compact()
+        compact = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        index = ResumeIndex(tmp).load()
+        load = time.perf_counter() - t0
+
+        print(f"{n_docs:>7} docs: build {build:.1f}s ({n_docs / build:.0f} docs/s), "
+              f"compact {compact:.2f}s, load {load * 1000:.0f}ms")
+        print(f"         search (mmap segment):        {time_queries(index, rng)}")
+
+        for i in range(100):
+            index.add(resume_text(1, seed=n_docs + i), f"new{i}")
+        for i in range(0, 1000, 10):
+            index.remove(f"r{i}")
+        print(f"         search (+100 delta, -100 del): {time_queries(index, rng)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, nargs="+", default=[10_000])
+    args = parser.parse_args()
+    for n in args.docs:
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
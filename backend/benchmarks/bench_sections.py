@@ -0,0 +1,99 @@
+"""
+Section splitter throughput (lines/sec) on large multi-page resumes.
+
+Run from backend/:  python -m benchmarks.bench_sections
+
+Compares the precompiled single-pass segmenter against the previous
+splitter (per-line scan over every synonym plus += concatenation), which
+is reproduced here for reference. Before timing, every line in HEADINGS
+must be detected as its section and every line in NOT_HEADINGS ignored;
+any miss exits non-zero.
+"""
+import sys
+import time
+
+from app.utils.extract import extract_resume_sections
+from app.utils.resume_sections import SECTION_SYNONYMS, match_heading
+from benchmarks.corpus import resume_text
+
+
+# Real-world headings the layout cues must keep detecting
+HEADINGS = {
+    "Relevant Experience": "experience",
+    "RELEVANT EXPERIENCE": "experience",
+    "Skills & Interests": "skills",
+    "Work Experience (2019-2023)": "experience",
+    "Education and Certifications": "education",
+    "Key Projects": "projects",
+    "Skills Summary": "skills",
+    "WORK EXPERIENCE:": "experience",
+    "Skills: Python, SQL": "skills",
+    "Core Skills: Python, SQL": "skills",
+    "PROJECTS & AWARDS": "projects",
+    "- Skills": "skills",
+}
+# Body lines that merely mention a section word
+NOT_HEADINGS = [
+    "- Built internal tools",
+    "Built tools for the team, saving 20% of review time.",
+    "Python, SQL, Docker, Tools",
+    "Led training for new hires across three offices and two teams",
+]
+
+
+def check_headings():
+    misses = [line for line, section in HEADINGS.items() if (match_heading(line) or (None,))[0] != section]
+    misses += [line for line in NOT_HEADINGS if match_heading(line)]
+    for line in misses:
+        print(f"heading detection wrong for {line!r}: {match_heading(line)}")
+    return not misses
+
+
+def legacy_normalize(heading):
+    heading = heading.lower().strip()
+    for standard, variants in SECTION_SYNONYMS.items():
+        for variant in variants:
+            if variant in heading:
+                return standard
+    return None
+
+
+def legacy_sections(text):
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        line_clean = line.strip()
+        if not line_clean:
+            continue
+        normalized = legacy_normalize(line_clean)
+        if normalized:
+            current = normalized
+            sections[current] = ""
+        elif current:
+            sections[current] += line_clean + " "
+    return sections
+
+
+def bench(fn, text, repeat):
+    fn(text)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    if not check_headings():
+        sys.exit(1)
+    print(f"{'pages':>6} {'lines':>7} {'legacy lines/s':>15} {'segmenter lines/s':>18} {'speedup':>8}")
+    for pages in [1, 10, 100, 500]:
+        text = resume_text(pages, seed=pages)
+        lines = text.count("\n") + 1
+        repeat = max(1, 2000 // pages)
+        old = bench(legacy_sections, text, repeat)
+        new = bench(extract_resume_sections, text, repeat)
+        print(f"{pages:>6} {lines:>7} {lines / old:>15,.0f} {lines / new:>18,.0f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Local semantic scorer vs the keyword scorer: latency and agreement.
+
+Run from backend/:  python -m benchmarks.bench_semantic_match [--resumes 2000]
+
+- latency of compute_match, semantic_score (cold and cached embeddings)
+- Spearman rank agreement between the two scores over resumes × JDs
+- brute-force vector search over 10k / 100k stored embeddings
+For comparison, the LLM route (analyze_match_with_ai) takes seconds per call.
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from app.utils.embeddings import EMBED_DIM, cached_embedding, embed, semantic_score
+from app.utils.match import compute_match
+from benchmarks.corpus import SKILLS, resume_text
+
+JOBS = 5
+
+
+def job_description(rng):
+    return (
+        "We are hiring an engineer to build and scale our analytics platform. "
+        f"Must have: {', '.join(rng.sample(SKILLS, 6))}. Experience improving reliability "
+        "and reducing latency for customers."
+    )
+
+
+def ranks(values):
+    order = np.argsort(values, kind="stable")
+    r = np.empty(len(values))
+    r[order] = np.arange(len(values))
+    return r
+
+
+def spearman(a, b):
+    return float(np.corrcoef(ranks(np.asarray(a)), ranks(np.asarray(b)))[0, 1])
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(14)
+    resumes = [resume_text(1, seed=i) for i in range(args.resumes)]
+    jobs = [job_description(rng) for _ in range(JOBS)]
+
+    keyword_ms, cold_ms, warm_ms, rhos = [], [], [], []
+    for jd in jobs:
+        keyword, semantic = [], []
+        for text in resumes:
+            (score, *_), ms = timed(compute_match, text, jd)
+            keyword_ms.append(ms)
+            keyword.append(score)
+            cached_embedding.cache_clear()
+            value, ms = timed(semantic_score, text, jd)
+            cold_ms.append(ms)
+            semantic.append(value)
+            _, ms = timed(semantic_score, text, jd)
+            warm_ms.append(ms)
+        rhos.append(spearman(keyword, semantic))
+
+    print(f"keyword compute_match:   p50 {statistics.median(keyword_ms):.2f}ms")
+    print(f"semantic_score (cold):   p50 {statistics.median(cold_ms):.2f}ms")
+    print(f"semantic_score (cached): p50 {statistics.median(warm_ms):.2f}ms "
+          "(resume and JD vectors already embedded)")
+    print(f"rank agreement with keyword score (Spearman): "
+          f"mean {statistics.mean(rhos):.2f}, min {min(rhos):.2f}")
+
+    base = np.stack([embed(t) for t in resumes[:1000]])
+    query = embed(jobs[0])
+    for n in (10_000, 100_000):
+        vectors = np.tile(base, (n // len(base) + 1, 1))[:n]
+        samples = []
+        for _ in range(50):
+            t0 = time.perf_counter()
+            scores = vectors @ query
+            top = np.argpartition(-scores, 9)[:10]
+            top[np.argsort(-scores[top])]
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(f"vector search {n:>7} × {EMBED_DIM}: p50 {statistics.median(samples):.2f}ms "
+              f"({vectors.nbytes / 1e6:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Cold start: import time of app.main and time to the first /api/health.
+
+Run from backend/:  python -m benchmarks.bench_startup [--runs 5] [--json startup.json]
+
+- `import app.main` wall time in a fresh interpreter (median of --runs)
+- a `python -X importtime` breakdown: self time summed per top-level
+  package, and whether the heavy optional modules (document parsers, HTTP
+  client) were imported at all — they should load on first use
+- time from launching uvicorn to the first 200 from /api/health (includes
+  interpreter start, imports and the lifespan hook)
+Each run uses a fresh temp directory, so no databases or index exist yet.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.stub_llm import free_port
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Must not be imported by `import app.main`
+LAZY_MODULES = ["pdfplumber", "docx", "httpx", "pdfminer"]
+
+
+def child_env(tmp):
+    return {
+        **os.environ,
+        "PYTHONPATH": BACKEND,
+        "GROQ_API_KEY": "benchmark",
+        "CHAT_DB_PATH": os.path.join(tmp, "chat.db"),
+        "LLM_CACHE_DB": os.path.join(tmp, "llm_cache.db"),
+        "JOBS_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "RESUME_INDEX_DIR": os.path.join(tmp, "resume_index"),
+    }
+
+
+def import_seconds(tmp):
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    res = subprocess.run([sys.executable, "-c", code], cwd=tmp, env=child_env(tmp),
+                         capture_output=True, text=True, check=True)
+    return float(res.stdout.strip().splitlines()[-1])
+
+
+def importtime_breakdown(tmp):
+    """{top-level package: self µs} and the set of imported module names."""
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=tmp,
+                         env=child_env(tmp), capture_output=True, text=True, check=True)
+    per_package, modules = {}, set()
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.add(name)
+        root = name.split(".")[0]
+        per_package[root] = per_package.get(root, 0) + int(self_us)
+    return per_package, modules
+
+
+def health_seconds(tmp):
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=tmp, env=child_env(tmp), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() - start < 30:
+                try:
+                    if client.get("/api/health").status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.HTTPError:
+                    time.sleep(0.005)
+        raise RuntimeError("server did not come up within 30s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--json", type=str, help="also write the numbers here for tracking")
+    args = parser.parse_args()
+
+    imports, healths = [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+            imports.append(import_seconds(tmp))
+        with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+            healths.append(health_seconds(tmp))
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+        per_package, modules = importtime_breakdown(tmp)
+
+    total_us = sum(per_package.values())
+    print(f"import app.main          median {statistics.median(imports) * 1000:7.0f} ms "
+          f"(min {min(imports) * 1000:.0f}, max {max(imports) * 1000:.0f})")
+    print(f"first /api/health        median {statistics.median(healths) * 1000:7.0f} ms "
+          f"(min {min(healths) * 1000:.0f}, max {max(healths) * 1000:.0f})")
+    print(f"\n-X importtime self time by package (total {total_us / 1000:.0f} ms):")
+    ranked = sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)
+    for name, us in ranked[:args.top]:
+        print(f"  {name:<24}{us / 1000:8.1f} ms  {us / total_us:6.1%}")
+    eager = [m for m in LAZY_MODULES if m in modules]
+    print("\nlazy modules imported at startup:", ", ".join(eager) if eager else "none")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "import_ms": round(statistics.median(imports) * 1000, 1),
+                "first_health_ms": round(statistics.median(healths) * 1000, 1),
+                "importtime_ms_by_package": {k: round(v / 1000, 1) for k, v in ranked},
+                "eager_lazy_modules": eager,
+            }, f, indent=2)
+        print(f"wrote {args.json}")
+    if eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
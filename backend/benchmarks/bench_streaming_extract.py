@@ -0,0 +1,72 @@
+"""
+Streaming, page-parallel PDF extraction: time-to-first-section and peak memory.
+
+Run from backend/:  python -m benchmarks.bench_streaming_extract [--mode process]
+
+For 1, 10 and 100 page resumes compares:
+- whole:  parse every page, join, then split sections (previous behaviour)
+- stream: iter_document_pages feeding SectionSplitter as pages arrive
+Peak memory is the Python-heap peak in the server process (tracemalloc).
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.utils.extract import SectionSplitter, extract_resume_sections, iter_document_pages, parse_document
+from app.utils.parse_pool import parse_executor
+from app.utils.text_cache import text_cache
+from benchmarks.corpus import make_pdf, resume_lines
+
+
+async def whole(data):
+    t0 = time.perf_counter()
+    text = await parse_executor.run(parse_document, "pdf", data, parse_executor.max_pages)
+    sections = extract_resume_sections(text)
+    first = total = time.perf_counter() - t0
+    return first, total, len(sections)
+
+
+async def stream(data):
+    t0 = time.perf_counter()
+    first = None
+    splitter = SectionSplitter()
+    async for page in iter_document_pages("pdf", data):
+        for _ in splitter.feed(page):
+            if first is None:
+                first = time.perf_counter() - t0
+    list(splitter.close())
+    total = time.perf_counter() - t0
+    return first if first is not None else total, total, len(splitter.sections)
+
+
+async def measure(fn, data):
+    text_cache.clear()
+    tracemalloc.start()
+    first, total, n_sections = await fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, n_sections, peak
+
+
+async def main(mode, workers):
+    parse_executor.configure(mode=mode, workers=workers, max_pending=64, timeout=600, max_pages=1000)
+    # Warm the pool so process start-up is not billed to the first document
+    await parse_executor.run(parse_document, "pdf", make_pdf(resume_lines(1)), 1)
+
+    print(f"{'pages':>5} {'method':<7} {'first section':>14} {'total':>9} {'sections':>9} {'peak heap':>10}")
+    for pages in [1, 10, 100]:
+        data = make_pdf(resume_lines(pages, seed=pages))
+        for name, fn in [("whole", whole), ("stream", stream)]:
+            first, total, n_sections, peak = await measure(fn, data)
+            print(f"{pages:>5} {name:<7} {first * 1000:>11.0f} ms {total * 1000:>6.0f} ms "
+                  f"{n_sections:>9} {peak / 1024:>7.0f} KB")
+    parse_executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", default="process", choices=["process", "thread", "inline"])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.mode, args.workers))
@@ -0,0 +1,116 @@
+"""
+Structured LLM output: malformed-reply corpus check and retries saved.
+
+Run from backend/:  python -m benchmarks.bench_structured_output [--delay 1.0]
+
+1. Every reply in benchmarks/data/malformed_llm_outputs.json (fenced JSON,
+   prose around it, trailing commas, Python literals, curly quotes, string
+   scores, truncation, ...) goes through parse_json_object + validate_output
+   and must give the expected fields, or fail when `expected` is null. The
+   check exits non-zero on any difference and shows how many of the
+   replies a bare json.loads would have accepted.
+2. /api/job/match against the stub LLM answering with each reply: upstream
+   calls per request (1 = repaired locally, 2 = targeted retry) and the
+   latency a repair saves compared with retrying.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.suite import setup_env
+
+# Databases and index of the in-process app go to a temp dir
+setup_env(tempfile.mkdtemp(prefix="bench-structured-"))
+
+from app.ai.chat import ScoreInsightsResponse
+from app.ai.structured import StructuredOutputError, parse_json_object, validate_output
+from app.routers.job import JobMatchResponse
+
+CORPUS = Path(__file__).parent / "data" / "malformed_llm_outputs.json"
+MODELS = {"job-match": JobMatchResponse, "score-insights": ScoreInsightsResponse}
+
+
+def check_corpus(cases):
+    failures, strict_ok, timings = [], 0, []
+    for case in cases:
+        model = MODELS[case["kind"]]
+        try:
+            data = json.loads(case["raw"])
+            strict_ok += isinstance(data, dict) and set(data) >= {
+                name for name, f in model.model_fields.items() if f.is_required()}
+        except ValueError:
+            pass
+        start = time.perf_counter()
+        try:
+            data, _ = parse_json_object(case["raw"])
+            got = validate_output(data, model).model_dump(include=set(case["expected"] or {}))
+        except StructuredOutputError as e:
+            got = None
+            error = str(e)
+        timings.append((time.perf_counter() - start) * 1e6)
+        if got != case["expected"]:
+            failures.append(case["name"])
+            print(f"  MISMATCH {case['name']}: expected {case['expected']}, got {got}")
+        elif got is None:
+            print(f"  {case['name']:<28} rejected ({error}) → retry")
+    usable = sum(case["expected"] is not None for case in cases)
+    print(f"\n{len(cases)} replies: {usable} usable after repair, {strict_ok} usable with a bare json.loads")
+    print(f"parse + validate: median {statistics.median(timings):.0f} µs, max {max(timings):.0f} µs")
+    return failures
+
+
+def retries_saved(cases, delay):
+    from fastapi.testclient import TestClient
+
+    from app.ai.llm import llm
+    from app.main import app
+    from benchmarks.stub_llm import run_stub_server, stub_state
+
+    body = {"job_description": "Python, React, Docker", "resume_text": "Python and React developer.",
+            "use_cache": False}
+    calls, seconds = {1: 0, 2: 0}, {1: [], 2: []}
+    with run_stub_server(delay=delay, token_interval=0) as url, TestClient(app) as client:
+        llm.configure(base_url=url)
+        for case in cases:
+            if case["kind"] != "job-match":
+                continue
+            stub_state.update(reply=case["raw"], calls=0)
+            start = time.perf_counter()
+            client.post("/api/job/match", json=body).raise_for_status()
+            n = stub_state["calls"]
+            calls[n] = calls.get(n, 0) + 1
+            seconds.setdefault(n, []).append(time.perf_counter() - start)
+        stub_state["reply"] = None
+
+    print(f"\n/api/job/match with a {delay:.1f}s stub model:")
+    for n in sorted(calls):
+        if calls[n]:
+            avg = statistics.mean(seconds[n]) * 1000
+            print(f"  {calls[n]:3d} requests with {n} upstream call(s), avg {avg:6.0f} ms")
+    from app.utils.metrics import registry
+    outcomes = {dict(labels)["outcome"]: n for (name, labels), n in registry.counters.items()
+                if name == "llm_structured_total" and dict(labels)["kind"] == "job-match"}
+    saved = registry.histogram("llm_repair_saved_seconds", kind="job-match")
+    print(f"  outcomes (llm_structured_total): {outcomes}")
+    print(f"  repairs saved {saved.count} retries ≈ {saved.sum:.1f}s of model time (llm_repair_saved_seconds)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=1.0, help="stub model latency per call")
+    args = parser.parse_args()
+
+    cases = json.loads(CORPUS.read_text())
+    failures = check_corpus(cases)
+    retries_saved(cases, args.delay)
+    if failures:
+        sys.exit(f"\n{len(failures)} corpus case(s) differ: {', '.join(failures)}")
+    print("\ncorpus OK")
+
+
+if __name__ == "__main__":
+    main()
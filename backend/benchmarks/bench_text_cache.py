@@ -0,0 +1,60 @@
+"""
+Cold vs warm /api/resume/analyze latency with the parsed-text cache.
+
+Run from backend/:  python -m benchmarks.bench_text_cache [--corpus DIR]
+
+Without --corpus a synthetic set of 1–20 page PDFs is generated. Each file
+is uploaded twice: the first (cold) upload parses it, the second (warm) one
+should be served from the cache.
+"""
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.text_cache import text_cache
+from benchmarks.corpus import make_pdf, resume_lines
+
+
+def load_corpus(directory):
+    if directory:
+        return [(p.name, p.read_bytes()) for p in sorted(Path(directory).glob("*.pdf"))]
+    return [(f"resume_{i}.pdf", make_pdf(resume_lines(pages, seed=i)))
+            for i, pages in enumerate([1, 1, 2, 2, 5, 5, 10, 20])]
+
+
+def upload(client, name, data):
+    t0 = time.perf_counter()
+    res = client.post("/api/resume/analyze", files={"file": (name, data, "application/pdf")})
+    res.raise_for_status()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="directory of sample PDFs")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    text_cache.clear()
+    cold, warm = [], []
+    with TestClient(app) as client:
+        for name, data in corpus:
+            c = upload(client, name, data)
+            w = upload(client, name, data)
+            cold.append(c)
+            warm.append(w)
+            print(f"{name:<24} {len(data) / 1024:>8.1f} KB  cold {c:>8.1f} ms  warm {w:>7.1f} ms")
+
+    print(f"\nmedian cold {statistics.median(cold):.1f} ms, median warm {statistics.median(warm):.1f} ms")
+    print("cache:", text_cache.snapshot())
+
+
+if __name__ == "__main__":
+    main()
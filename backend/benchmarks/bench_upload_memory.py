@@ -0,0 +1,90 @@
+"""
+Peak server RSS under concurrent large uploads.
+
+Run from backend/:  python -m benchmarks.bench_upload_memory [--uploads 8] [--mb 4] [--oversize-mb 50]
+
+Starts the app in a separate uvicorn process (thread parse mode, so all
+parsing happens in that one process), sends `uploads` concurrent resume
+PDFs of `mb` MB each to /api/match/file, then the same number of
+`oversize-mb` uploads, and reads the server's peak RSS (VmHWM, Linux) after
+each round. Uploads over MAX_UPLOAD_MB should come back as 413 without the
+peak moving.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.corpus import make_pdf, resume_lines
+from benchmarks.stub_llm import free_port
+
+JOB_TEXT = "Backend engineer: Python, FastAPI, Docker, AWS, PostgreSQL."
+
+
+def peak_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+async def send(base_url, payloads):
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        async def one(i, data):
+            files = {"file": (f"resume_{i}.pdf", data, "application/pdf")}
+            return (await client.post("/api/match/file", data={"job_text": JOB_TEXT}, files=files)).status_code
+        return await asyncio.gather(*(one(i, d) for i, d in enumerate(payloads)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--mb", type=float, default=4)
+    parser.add_argument("--oversize-mb", type=float, default=50)
+    args = parser.parse_args()
+
+    port = free_port()
+    env = {**os.environ, "PARSE_EXECUTOR": "thread", "GROQ_API_KEY": "benchmark"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(200):
+            try:
+                httpx.get(base_url + "/api/health")
+                break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+
+        lines = resume_lines(2)
+        asyncio.run(send(base_url, [make_pdf(lines)]))  # warm up parsers and caches
+        baseline = peak_rss_mb(server.pid)
+        print(f"baseline peak RSS: {baseline:.0f} MB")
+
+        for label, mb in [("large", args.mb), ("oversize", args.oversize_mb)]:
+            # Distinct bytes per upload so the text cache can't short-circuit
+            payloads = [make_pdf(lines + [f"upload {label} {i}"], pad_bytes=int(mb * 1024 * 1024))
+                        for i in range(args.uploads)]
+            before = peak_rss_mb(server.pid)
+            t0 = time.perf_counter()
+            codes = asyncio.run(send(base_url, payloads))
+            elapsed = time.perf_counter() - t0
+            peak = peak_rss_mb(server.pid)
+            print(f"{args.uploads} × {mb:.0f} MB ({label}): statuses {sorted(set(codes))} in {elapsed:.1f}s, "
+                  f"peak RSS {peak:.0f} MB (+{peak - before:.0f} MB, "
+                  f"{(peak - before) / args.uploads:.1f} MB per upload)")
+            del payloads
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
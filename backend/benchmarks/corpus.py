@@ -0,0 +1,110 @@
+"""
+Synthetic resume corpus for the benchmarks.
+
+Generates resume text plus matching PDF and DOCX bytes without any extra
+dependencies (the PDF writer emits a plain Helvetica text document that
+pdfplumber reads back line by line).
+"""
+import random
+from io import BytesIO
+
+HEADINGS = ["SUMMARY", "SKILLS", "EXPERIENCE", "PROJECTS", "EDUCATION", "CERTIFICATIONS"]
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "React", "Node.js", "FastAPI", "Django",
+    "Flask", "SQL", "PostgreSQL", "MongoDB", "Docker", "Kubernetes", "AWS",
+    "Machine Learning", "PyTorch", "TensorFlow", "Pandas", "Git", "CI/CD",
+]
+
+WORDS = (
+    "built designed led shipped improved reduced latency by scaled service "
+    "pipeline team customers dashboards platform users reporting analytics "
+    "automated testing deployment migrated architecture reliability cost"
+).split()
+
+
+def resume_lines(pages=1, seed=0, lines_per_page=45):
+    """Plausible resume lines: headings, bullet points, numbers and skills."""
+    rng = random.Random(seed)
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 0100"]
+    target = pages * lines_per_page
+    while len(lines) < target:
+        for heading in HEADINGS:
+            lines.append(heading)
+            if heading == "SKILLS":
+                lines.append(", ".join(rng.sample(SKILLS, 10)))
+                continue
+            for _ in range(rng.randint(3, 8)):
+                words = rng.choices(WORDS, k=rng.randint(8, 14))
+                words.insert(rng.randrange(len(words)), rng.choice(SKILLS))
+                if rng.random() < 0.5:
+                    words.append(f"{rng.randint(5, 90)}%")
+                lines.append("- " + " ".join(words).capitalize())
+    return lines[:target]
+
+
+def resume_text(pages=1, seed=0):
+    return "\n".join(resume_lines(pages, seed))
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines, lines_per_page=45, pad_bytes=0):
+    """
+    Minimal multi-page PDF, one text line per row. pad_bytes adds an
+    unreferenced binary stream (like an embedded image) to inflate the file
+    without adding pages to parse.
+    """
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(None)  # filled in once the kids are known
+    kids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, content)
+        ))
+    objects[pages_id - 1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) + b"] /Count %d >>" % len(kids)
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    if pad_bytes:
+        add(b"<< /Length %d >>\nstream\n" % pad_bytes + bytes(pad_bytes) + b"\nendstream")
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def make_docx(lines):
+    from docx import Document
+
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
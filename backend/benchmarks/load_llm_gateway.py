@@ -0,0 +1,66 @@
+"""
+Concurrent /api/ai/chat requests through the async LLM gateway.
+
+Run from backend/:  python -m benchmarks.load_llm_gateway [--chats 50] [--delay 0.5]
+
+Points the gateway at a local stub model that takes `delay` seconds per
+completion, then fires many chats at once. With the old blocking client the
+wall time was chats × delay; with the gateway the calls overlap (bounded by
+LLM_MAX_CONCURRENCY). A second round sends identical prompts to show
+request coalescing.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import httpx
+
+from app import database
+from app.ai.llm import llm
+from app.main import app
+from benchmarks.stub_llm import run_stub_server, stub_state
+
+
+async def fire(messages):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(
+            client.post("/api/ai/chat", json={"message": m, "session_id": "load"}) for m in messages
+        ))
+        elapsed = time.perf_counter() - t0
+    assert all(r.status_code == 200 for r in results)
+    await llm.aclose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, run_stub_server(delay=args.delay, token_interval=0) as base_url:
+        database.DB_PATH = Path(tmp) / "chat.db"
+        database.init_db()
+        llm.configure(base_url=base_url, max_concurrency=args.concurrency)
+
+        serial = args.chats * args.delay
+        elapsed = asyncio.run(fire([f"question {i}" for i in range(args.chats)]))
+        print(f"distinct prompts: {args.chats} chats in {elapsed:.2f}s "
+              f"(serial would be {serial:.1f}s), upstream calls {stub_state['calls']}")
+
+        stub_state["calls"] = 0
+        elapsed = asyncio.run(fire(["same question"] * args.chats))
+        print(f"identical prompts: {args.chats} chats in {elapsed:.2f}s, upstream calls {stub_state['calls']}")
+        print("gateway stats:", llm.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Health-check latency while large PDFs are being parsed.
+
+Run from backend/:  python -m benchmarks.load_parse_pool [--pages 30] [--uploads 4]
+
+For each parse mode (inline = old behaviour, thread, process) the script
+uploads a few large PDFs to /api/resume/analyze and, at the same time, keeps
+firing small /api/health requests. With parsing on the event loop the
+health p99 grows to the parse time; with the executor it should stay flat.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import httpx
+
+from app.main import app
+from app.utils.parse_pool import parse_executor
+from app.utils.text_cache import text_cache
+from benchmarks.corpus import make_pdf, resume_lines
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run(mode, pdfs, workers):
+    parse_executor.configure(mode=mode, workers=workers, max_pending=64, timeout=120, max_pages=500)
+    text_cache.clear()
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        async def upload(i, data):
+            files = {"file": (f"big_{mode}_{i}.pdf", data, "application/pdf")}
+            (await client.post("/api/resume/analyze", files=files)).raise_for_status()
+
+        async def health(stop):
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                await client.get("/api/health")
+                latencies.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0.005)
+
+        stop = asyncio.Event()
+        t0 = time.perf_counter()
+        pingers = [asyncio.create_task(health(stop)) for _ in range(8)]
+        await asyncio.gather(*(upload(i, data) for i, data in enumerate(pdfs)))
+        stop.set()
+        await asyncio.gather(*pingers)
+        wall = time.perf_counter() - t0
+
+    parse_executor.shutdown()
+    print(
+        f"{mode:<8} uploads done in {wall:6.2f}s | health n={len(latencies):>5} "
+        f"p50 {statistics.median(latencies):8.1f} ms  p99 {percentile(latencies, 99):8.1f} ms  "
+        f"max {max(latencies):8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--uploads", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--modes", default="inline,thread,process")
+    args = parser.parse_args()
+
+    # Distinct seeds so the text cache can't short-circuit any upload
+    pdfs = [make_pdf(resume_lines(args.pages, seed=i)) for i in range(args.uploads)]
+    for mode in args.modes.split(","):
+        asyncio.run(run(mode, pdfs, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Local OpenAI-compatible stub for exercising the LLM gateway.
+
+    with run_stub_server(delay=0.5) as base_url:
+        llm.configure(base_url=base_url)
+
+The stub answers POST /chat/completions after `delay` seconds. JSON prompts
+(the ATS / job-match analyses) get a canned JSON object, everything else a
+short text reply. With "stream": true the reply is sent as SSE chunks, one
+word every `token_interval` seconds. `stub_state["calls"]` counts upstream
+requests.
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+stub_state = {"calls": 0, "delay": 0.5, "token_interval": 0.05, "reply": None}
+
+JOB_MATCH_JSON = (
+    '{"match_score": 72, "matched_skills": ["Python", "React"], "missing_skills": ["Docker"], '
+    '"recommendations": ["Add a project that uses Docker."]}'
+)
+INSIGHTS_JSON = (
+    '{"ats_score": 68, "strengths": ["Clear skills section."], '
+    '"drawbacks": ["Few quantified results."], "improvements": ["Add metrics to experience bullets."]}'
+)
+
+
+def canned_reply(messages):
+    prompt = messages[-1]["content"]
+    if '"match_score"' in prompt:
+        return JOB_MATCH_JSON
+    if '"ats_score"' in prompt:
+        return INSIGHTS_JSON
+    return (
+        "Here is a stub answer from the local model. Focus on one role, compare your "
+        "skills with real job descriptions and build two or three matching projects."
+    )
+
+
+async def stream_tokens(content):
+    words = content.split(" ")
+    for i, word in enumerate(words):
+        delta = word if i == 0 else " " + word
+        chunk = {"choices": [{"index": 0, "delta": {"content": delta}}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(stub_state["token_interval"])
+    yield "data: [DONE]\n\n"
+
+
+def make_stub_app():
+    app = FastAPI(title="Stub LLM")
+
+    @app.post("/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        stub_state["calls"] += 1
+        await asyncio.sleep(stub_state["delay"])
+        content = stub_state["reply"] or canned_reply(body["messages"])
+        if body.get("stream"):
+            return StreamingResponse(stream_tokens(content), media_type="text/event-stream")
+        # Non-streaming callers wait for the whole generation
+        await asyncio.sleep(stub_state["token_interval"] * len(content.split(" ")))
+        return {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]}
+
+    return app
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def run_stub_server(delay=0.5, token_interval=0.05):
+    """Run the stub in a background thread; yields its base URL."""
+    stub_state.update(calls=0, delay=delay, token_interval=token_interval)
+    with run_server(make_stub_app()) as base_url:
+        yield base_url
+
+
+@contextmanager
+def run_server(app):
+    """Serve any ASGI app with uvicorn in a background thread; yields its base URL."""
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
@@ -0,0 +1,254 @@
+"""
+Benchmark suite for the analysis and matching hot paths, with a stored baseline.
+
+Run from backend/:
+
+    python -m benchmarks.suite [--quick] [--only micro|e2e] [-o results.json]
+    python -m benchmarks.suite --save-baseline      # after an intentional change
+
+Synthetic resumes of 1, 3 and 10 pages (text, PDF, DOCX; benchmarks/corpus.py)
+go through:
+- micro: each stage on its own (file extractors without the text cache,
+  extract_resume_sections, calculate_ats_score, extract_skills,
+  compute_match, embed, semantic_score with warm embedding caches)
+- e2e: the FastAPI app in-process (TestClient, inline parsing) against the
+  local stub LLM answering instantly, so LLM routes measure our own overhead
+
+Every case reports the median, p95 and min in ms. Results are written as
+JSON (benchmarks/data/bench_results.json unless -o is given, ignored by
+git) and compared with benchmarks/data/bench_baseline.json when it exists:
+a case whose median is more than --threshold slower (and at least
+--min-delta-ms) is flagged and the exit status is 1. Baselines are machine
+specific; regenerate it on the machine that does the comparing.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASELINE = Path(__file__).parent / "data" / "bench_baseline.json"
+RESULTS = Path(__file__).parent / "data" / "bench_results.json"
+SIZES = [1, 3, 10]   # pages
+JOB_TEXT = (
+    "Senior backend engineer. Must have Python, FastAPI, PostgreSQL, Docker and AWS; "
+    "Kubernetes and CI/CD a plus. You will improve reliability and reduce latency."
+)
+
+
+def setup_env(tmp):
+    """Isolated databases/index and the inline parser, set before the app is imported."""
+    os.environ.update(
+        GROQ_API_KEY="benchmark",
+        CHAT_DB_PATH=os.path.join(tmp, "chat.db"),
+        LLM_CACHE_DB=os.path.join(tmp, "llm_cache.db"),
+        JOBS_DB_PATH=os.path.join(tmp, "jobs.db"),
+        SECTION_STORE_DB=os.path.join(tmp, "resume_sections.db"),
+        RESUME_INDEX_DIR=os.path.join(tmp, "resume_index"),
+        PARSE_EXECUTOR="inline",
+    )
+    os.environ.pop("TEXT_CACHE_DB", None)
+
+
+def measure(fn, repeat, warmup=2):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "n": repeat,
+    }
+
+
+def ignore_index(fn):
+    return lambda i=0: fn()
+
+
+# ---------- Micro ----------
+
+def run_micro(repeat, results):
+    from app.utils.ats_score import calculate_ats_score
+    from app.utils.embeddings import embed, semantic_score
+    from app.utils.extract import extract_resume_sections, extract_skills, parse_document
+    from app.utils.match import compute_match
+    from benchmarks.corpus import make_docx, make_pdf, resume_lines
+
+    for pages in SIZES:
+        lines = resume_lines(pages, seed=pages)
+        text = "\n".join(lines)
+        files = {"txt": text.encode("utf-8"), "pdf": make_pdf(lines), "docx": make_docx(lines)}
+        for kind, data in files.items():
+            # parse_document directly: no text cache, no executor hop
+            results[f"extract.{kind}[{pages}p]"] = measure(ignore_index(lambda: parse_document(kind, data)), repeat)
+
+        sections = extract_resume_sections(text)
+        cases = {
+            "sections": lambda: extract_resume_sections(text),
+            "ats_score": lambda: calculate_ats_score(sections),
+            "skills": lambda: extract_skills(text),
+            "compute_match": lambda: compute_match(text, JOB_TEXT),
+            "embed": lambda: embed(text),
+            "semantic_score_cached": lambda: semantic_score(text, JOB_TEXT),
+        }
+        for name, fn in cases.items():
+            results[f"stage.{name}[{pages}p]"] = measure(ignore_index(fn), repeat)
+
+
+# ---------- End to end ----------
+
+def run_e2e(repeat, results):
+    from fastapi.testclient import TestClient
+
+    from app.ai.llm import llm
+    from app.main import app
+    from benchmarks.corpus import make_docx, make_pdf, resume_lines
+    from benchmarks.stub_llm import run_stub_server
+
+    def variants(pages, make):
+        # Distinct bytes per request so the parsed-text cache never answers
+        lines = resume_lines(pages, seed=pages)
+        return [make(lines + [f"Reference {i}"]) for i in range(repeat + 2)]
+
+    with run_stub_server(delay=0, token_interval=0) as stub_url, TestClient(app) as client:
+        llm.configure(base_url=stub_url)
+
+        def post(path, ok=200, **kwargs):
+            res = client.post(path, **kwargs)
+            if res.status_code != ok:
+                raise RuntimeError(f"{path}: {res.status_code} {res.text[:200]}")
+            return res
+
+        for pages in SIZES:
+            pdfs = variants(pages, make_pdf)
+            results[f"e2e.resume_analyze.pdf[{pages}p]"] = measure(
+                lambda i=0: post("/api/resume/analyze", files={"file": ("r.pdf", pdfs[i], "application/pdf")}),
+                repeat,
+            )
+
+        pages = 3
+        text = "\n".join(resume_lines(pages, seed=pages))
+        docxs = variants(pages, make_docx)
+        docx_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        cases = {
+            "e2e.resume_analyze.docx[3p]": lambda i=0: post(
+                "/api/resume/analyze", files={"file": ("r.docx", docxs[i], docx_type)}),
+            "e2e.match_file.docx[3p]": lambda i=0: post(
+                "/api/match/file", data={"job_text": JOB_TEXT}, files={"file": ("r.docx", docxs[i], docx_type)}),
+            "e2e.match.text[3p]": lambda i=0: post(
+                "/api/match", json={"resume_text": text, "job_text": JOB_TEXT}),
+            "e2e.job_match.local[3p]": lambda i=0: post(
+                "/api/job/match", json={"job_description": JOB_TEXT, "resume_text": text, "use_llm": False}),
+            # Stub LLM answers instantly; the response cache is skipped so every call goes upstream
+            "e2e.job_match.llm_stub[3p]": lambda i=0: post(
+                "/api/job/match", json={"job_description": JOB_TEXT, "resume_text": text, "use_cache": False}),
+            "e2e.score_insights.llm_stub[3p]": lambda i=0: post(
+                "/api/ai/score-insights", json={"resume_text": text, "use_cache": False}),
+            "e2e.chat.llm_stub": lambda i=0: post(
+                "/api/ai/chat", json={"message": f"How do I improve my resume? {i}", "session_id": "bench"}),
+        }
+        for name, fn in cases.items():
+            results[name] = measure(fn, repeat)
+
+
+# ---------- Baseline comparison ----------
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """Print per-case change against the baseline; returns the regressed case names."""
+    regressions = []
+    print(f"\n{'case':<38}{'baseline':>11}{'current':>11}{'change':>9}")
+    for name, res in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<38}{'-':>11}{res['median_ms']:>9.3f}ms{'new':>9}")
+            continue
+        before, after = base["median_ms"], res["median_ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold and after - before >= min_delta_ms:
+            regressions.append(name)
+            flag = "  << REGRESSION"
+        print(f"{name:<38}{before:>9.3f}ms{after:>9.3f}ms{change:>+8.0%}{flag}")
+    for name in baseline:
+        if name not in current:
+            print(f"{name:<38}  (missing from this run)")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume analysis / matching benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions (smoke run)")
+    parser.add_argument("--repeat", type=int, help="samples per case (default 30, 5 with --quick)")
+    parser.add_argument("--only", choices=["micro", "e2e"])
+    parser.add_argument("-o", "--output", type=Path, default=RESULTS)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore smaller absolute changes")
+    args = parser.parse_args()
+    repeat = args.repeat or (5 if args.quick else 30)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench-suite-") as tmp:
+        setup_env(tmp)
+        if args.only in (None, "micro"):
+            run_micro(repeat, results)
+        if args.only in (None, "e2e"):
+            run_e2e(repeat, results)
+
+    for name, res in results.items():
+        print(f"{name:<38} median {res['median_ms']:9.3f} ms  p95 {res['p95_ms']:9.3f} ms")
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nwrote {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"saved baseline {args.baseline}")
+        return
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        print(f"comparing with {args.baseline} ({baseline['meta'].get('commit')}, {baseline['meta'].get('machine')})")
+        expected = baseline["results"]
+        if args.only:
+            # Only cases of the part that ran count as missing
+            is_e2e = args.only == "e2e"
+            expected = {k: v for k, v in expected.items() if k.startswith("e2e.") == is_e2e}
+        regressions = compare(results, expected, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
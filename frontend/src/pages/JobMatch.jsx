@@ -191,12 +191,12 @@ export default function JobMatch() {
                   <span className="text-purple-300 font-medium">{resumeFile.name}</span>
                 ) : (
                   <span className="text-sm text-zinc-400">
-                    Click to upload (PDF/DOCX)
+                    Click to upload (PDF/DOCX/DOC/RTF/TXT)
                   </span>
                 )}
                 <input
                   type="file"
-                  accept=".pdf,.docx"
+                  accept=".pdf,.docx,.doc,.rtf,.txt,.html,.htm"
                   className="hidden"
                   onChange={(e) => setResumeFile(e.target.files[0])}
                 />
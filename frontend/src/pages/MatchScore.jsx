@@ -173,7 +173,7 @@ export default function MatchScore() {
               )}
             </p>
             <p className="text-sm text-zinc-500 mt-2">
-              PDF / DOCX · Max 5 MB
+              PDF / DOCX / DOC / RTF / TXT · Max 5 MB
             </p>
             <input
               type="file"